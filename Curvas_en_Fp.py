@@ -1,137 +1,86 @@
 # app_elliptic_fp.py
 import streamlit as st
-import numpy as np
 import plotly.graph_objects as go
-from math import gcd
 from PIL import Image
+import io
 import os
-import random
+from enumeracion_fp import points_as_tuples, write_points_csv
+from conteo_fp import count_points_fp, hasse_interval, hasse_check, UMBRAL_SCHOOF
+from curvas_estandar import CURVAS_ESTANDAR
+from curva_eliptica import CurvaEliptica, discriminant_mod_p
+from base_fija import fixed_base_table, fixed_base_cache_info
+from factorizacion import factorize
+from grupo_fp import group_structure, point_order, point_orders_fp, order_distribution
+from primalidad import is_probable_prime
+from paralelo_fp import enumerate_points_parallel, default_workers
+from graficas_fp import (MODOS_2D, UMBRAL_WEBGL, UMBRAL_HISTOGRAMA, MAX_PUNTOS_TORO,
+                         choose_mode, downsample_indices, points_trace_2d, payload_stats)
+from cache_fp import CACHE_CURVAS, PRESUPUESTO_CACHE, memoize_curve
+from toro import map_to_torus_modular, reference_mesh
+from ecdsa_fp import (ecdsa_domain, generate_keypair, sign_stream, verify_stream,
+                      signature_to_bytes, signature_from_bytes)
 
 st.set_page_config(page_title="Curvas Elípticas sobre F_p", layout="wide")
 
 # ---------------------------
-# Helpers: primalidad (Miller-Rabin)
+# Cálculos de curva en F_p
 # ---------------------------
-def is_probable_prime(n, k=7):
-    if n < 2:
-        return False
-    small_primes = [2,3,5,7,11,13,17,19,23,29]
-    for p in small_primes:
-        if n % p == 0:
-            return n == p
-    # write n-1 as d*2^s
-    s = 0
-    d = n - 1
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    # witnesses
-    for _ in range(k):
-        a = random.randrange(2, n-1)
-        x = pow(a, d, n)
-        if x == 1 or x == n-1:
-            continue
-        composite = True
-        for _ in range(s-1):
-            x = (x*x) % n
-            if x == n-1:
-                composite = False
-                break
-        if composite:
-            return False
-    return True
+# Por encima de este p sólo se cuenta |E(F_p)|; no se listan ni grafican los puntos.
+P_MAX_ENUMERACION = 2_000_000
 
-# ---------------------------
-# Tonelli-Shanks para sqrt modular en primos
-# ---------------------------
-def tonelli_shanks(n, p):
-    """Resuelve x^2 ≡ n (mod p). Devuelve None si no tiene solución,
-       o una raíz r tal que r^2 % p == n%p.
-       p debe ser primo."""
-    n %= p
-    if n == 0:
-        return 0
-    if p == 2:
-        return n
-    # Legendre
-    if pow(n, (p-1)//2, p) != 1:
-        return None
-    # caso p % 4 == 3 (fácil)
-    if p % 4 == 3:
-        r = pow(n, (p+1)//4, p)
-        return r
-    # factor p-1 = q * 2^s con q odd
-    s = 0
-    q = p-1
-    while q % 2 == 0:
-        q //= 2
-        s += 1
-    # find z a non-cuadratico
-    z = 2
-    while pow(z, (p-1)//2, p) != p-1:
-        z += 1
-    m = s
-    c = pow(z, q, p)
-    t = pow(n, q, p)
-    r = pow(n, (q+1)//2, p)
-    while True:
-        if t == 0:
-            return 0
-        if t == 1:
-            return r
-        # find smallest i (0<i<m) tal que t^(2^i) = 1
-        i = 1
-        t2i = (t * t) % p
-        while i < m:
-            if t2i == 1:
-                break
-            t2i = (t2i * t2i) % p
-            i += 1
-        # update
-        b = pow(c, 1 << (m - i - 1), p)
-        m = i
-        c = (b * b) % p
-        t = (t * c) % p
-        r = (r * b) % p
+# st.download_button guarda el archivo completo en memoria para servirlo, así que la
+# exportación desde la página se limita a p <= P_MAX_EXPORTACION (~2·10^6 puntos,
+# unos 30 MB de CSV). Para p mayores, enumeracion_fp.write_points_csv escribe por
+# bloques a un archivo desde un script, con memoria acotada.
+P_MAX_EXPORTACION = 2_000_000
 
-# ---------------------------
-# Cálculos de curva en F_p
-# ---------------------------
-def discriminant_mod_p(a, b, p):
-    # Δ = -16(4a^3 + 27 b^2)
-    val = (-16 * (4 * pow(a, 3, p) + 27 * pow(b, 2, p))) % p
-    return val
+# Bits máximos del p de una curva propia. Por encima de UMBRAL_SCHOOF (2^64) |E| se
+# cuenta con Schoof (unos segundos con 96 bits) y el dominio ECDSA factoriza |E| con
+# Pollard-rho, que con cientos de bits puede no terminar.
+BITS_MAX_PERSONALIZADA = 96
 
+# Resultados por curva guardados en CACHE_CURVAS con clave (a mod p, b mod p, p):
+# cambiar un widget que no toca la curva no repite los cálculos O(p).
+# enumerate_points_parallel reparte range(p) entre procesos; workers (y la barra de
+# progreso del conteo) no forman parte de la clave porque el resultado no depende de ellos.
+cached_enumerate = memoize_curve(enumerate_points_parallel, ignore=("workers",))
+cached_count = memoize_curve(count_points_fp, ignore=("progress",))
+
+@memoize_curve
 def points_on_curve_fp(a, b, p):
-    pts = []
-    for x in range(p):
-        rhs = (pow(x, 3, p) + (a % p) * x + (b % p)) % p
-        y0 = tonelli_shanks(rhs, p)
-        if y0 is None:
-            continue
-        y1 = y0 % p
-        y2 = (-y0) % p
-        pts.append((x, y1))
-        if y2 != y1:
-            pts.append((x, y2))
-    # ordenar para presentación
-    pts = sorted(pts)
-    return pts
+    # Envoltura de compatibilidad: lista de tuplas (x, y) ordenada.
+    # El cálculo se hace en bloque con enumerate_points_fp (NumPy).
+    xs, ys = cached_enumerate(a, b, p)
+    return points_as_tuples(xs, ys)
+
+@memoize_curve
+def points_csv_bytes(a, b, p):
+    # CSV completo en bytes (p <= P_MAX_EXPORTACION): el caché cuenta su tamaño real
+    # y lo libera al expulsarlo; no quedan archivos temporales en disco
+    buffer = io.StringIO()
+    write_points_csv(a, b, p, buffer)
+    return buffer.getvalue().encode()
+
+@memoize_curve
+def cached_group_structure(a, b, p, n_points):
+    return group_structure(CurvaEliptica(a, b, p), n_points, factorize(n_points))
+
+@memoize_curve
+def cached_point_orders(a, b, p, n_points):
+    return point_orders_fp(a, b, p, cached_group_structure(a, b, p, n_points))
+
+# Dominio ECDSA (G de orden primo n) de la curva; factoriza |E| y busca G una sola vez
+cached_ecdsa_domain = memoize_curve(ecdsa_domain)
 
 # ---------------------------
-# Mapeo a toro para 3D (visual)
+# Puntos en el toro para 3D (visual)
 # ---------------------------
-def map_to_torus_modular(xs, ys, p, R=2.2, r=0.7):
-    if len(xs) == 0:
-        return np.array([]), np.array([]), np.array([])
-    xs = np.array(xs)
-    ys = np.array(ys)
-    u = 2*np.pi * xs / p
-    v = 2*np.pi * ys / p
-    X = (R + r * np.cos(v)) * np.cos(u)
-    Y = (R + r * np.cos(v)) * np.sin(u)
-    Z = r * np.sin(v)
-    return X, Y, Z
+@memoize_curve
+def torus_points_fp(a, b, p, max_points=MAX_PUNTOS_TORO):
+    # Sólo se mapean (y se envían al navegador) a lo más max_points marcadores
+    xs, ys = cached_enumerate(a, b, p)
+    idx = downsample_indices(len(xs), max_points)
+    return map_to_torus_modular(xs[idx], ys[idx], p)
 
 # ---------------------------
 # Interfaz Streamlit
@@ -142,11 +91,44 @@ col1, col2 = st.columns([1, 2])
 
 with col1:
     st.subheader("Parámetros (F_p)")
-    a = st.number_input("a (entero)", value=-1, step=1)
-    b = st.number_input("b (entero)", value=1, step=1)
-    p = st.number_input("p (primo)", value=43, step=1, min_value=3)
+    curve_name = st.selectbox("Curva", ["Personalizada"] + list(CURVAS_ESTANDAR))
+    if curve_name == "Personalizada":
+        # text_input y no number_input: number_input no guarda enteros de más de 53 bits
+        a_text = st.text_input("a (entero)", value="-1")
+        b_text = st.text_input("b (entero)", value="1")
+        p_text = st.text_input("p (primo)", value="43",
+                               help=f"Decimal o hexadecimal (0x...), hasta {BITS_MAX_PERSONALIZADA} bits; "
+                                    "con p > 2^64 |E(F_p)| se cuenta con Schoof.")
+        try:
+            a, b, p = int(a_text, 0), int(b_text, 0), int(p_text, 0)
+        except ValueError:
+            st.error("Usa enteros en decimal o hexadecimal (0x...).")
+            st.stop()
+        if not 3 <= p < 1 << BITS_MAX_PERSONALIZADA:
+            st.error(f"p debe estar entre 3 y 2^{BITS_MAX_PERSONALIZADA}.")
+            st.stop()
+    else:
+        # p de 256 bits no cabe en number_input: se muestran en hexadecimal
+        curve = CURVAS_ESTANDAR[curve_name]
+        a, b, p = curve["a"], curve["b"], curve["p"]
+        st.code(f"p = {hex(p)}\na = {hex(a)}\nb = {hex(b)}")
     show_list = st.checkbox("Mostrar lista de puntos (tabular)", value=True)
     compute_group_info = st.checkbox("Mostrar número de puntos (orden de E(F_p))", value=True)
+    analyze_group = st.checkbox("Analizar estructura del grupo (Z/n1 × Z/n2, generadores, órdenes)", value=False)
+    with st.expander("Rendimiento de las gráficas"):
+        mode_2d = st.selectbox("Modo del gráfico 2D", MODOS_2D,
+                               help="auto: Scatter, Scattergl o histograma 2D según el número de puntos")
+        umbral_webgl = st.number_input("Puntos a partir de los cuales usar WebGL", value=UMBRAL_WEBGL,
+                                       min_value=1, step=1000)
+        umbral_hist = st.number_input("Puntos a partir de los cuales agrupar en histograma",
+                                      value=UMBRAL_HISTOGRAMA, min_value=1, step=10000)
+        max_torus = st.number_input("Marcadores máximos en el toro", value=MAX_PUNTOS_TORO,
+                                    min_value=100, step=1000)
+    workers = st.number_input("Procesos para enumerar E(F_p)", min_value=1,
+                              max_value=default_workers(), value=default_workers(), step=1)
+    budget_mib = st.number_input("Memoria del caché de curvas (MiB)", value=PRESUPUESTO_CACHE >> 20,
+                                 min_value=16, step=16)
+    CACHE_CURVAS.set_budget(int(budget_mib) << 20)
 
     # Cargar imagen de referencia si existe
     img_path = "/mnt/data/6e632cd2-bba9-93a3-532578144221.png"
@@ -166,58 +148,191 @@ with col2:
         else:
             st.success(f"p={p} es probablemente primo y la curva es no singular (Δ mod p = {disc}).")
 
-            pts = points_on_curve_fp(a, b, p)
-            n_points = len(pts) + 1  # +1 por el punto en el infinito
-            st.metric("Número de puntos |E(F_p)| (incluye infinito)", n_points)
-
-            if show_list:
-                # Mostrar tabla simple
-                import pandas as pd
-                df = pd.DataFrame(pts, columns=["x","y"])
-                st.dataframe(df)
-
-            # Plot 2D: scatter x vs y
-            xs = [x for (x,y) in pts]
-            ys = [y for (x,y) in pts]
-            fig2 = go.Figure()
-            if xs:
-                fig2.add_trace(go.Scatter(x=xs, y=ys, mode='markers', marker=dict(size=6),
-                                          name=f'Puntos en F_{p}'))
-            fig2.update_layout(title=f"Puntos de la curva en F_{p}: y^2 = x^3 + {a}x + {b} (mod {p})",
-                               xaxis=dict(title="x (mod p)"), yaxis=dict(title="y (mod p)"),
-                               height=450)
-            st.plotly_chart(fig2, use_container_width=True)
-
-            # Plot 3D: torus mapping
-            X3, Y3, Z3 = map_to_torus_modular(xs, ys, p, R=2.2, r=0.7)
-            # torus surface for reference
-            u = np.linspace(0, 2*np.pi, 60)
-            v = np.linspace(0, 2*np.pi, 30)
-            U, V = np.meshgrid(u, v)
-            RT = 2.2; rt = 0.7
-            XT = (RT + rt * np.cos(V)) * np.cos(U)
-            YT = (RT + rt * np.cos(V)) * np.sin(U)
-            ZT = rt * np.sin(V)
-
-            fig3 = go.Figure()
-            fig3.add_trace(go.Surface(x=XT, y=YT, z=ZT, opacity=0.22, showscale=False, name='Torus'))
-            if len(X3) > 0:
-                fig3.add_trace(go.Scatter3d(x=X3, y=Y3, z=Z3, mode='markers',
-                                           marker=dict(size=4, color='red'), name='Puntos F_p'))
-            fig3.update_layout(scene=dict(xaxis=dict(visible=False),
-                                          yaxis=dict(visible=False),
-                                          zaxis=dict(visible=False)),
-                               height=650, title=f"Puntos en F_{p} mapeados al toro (visualización)")
-            st.plotly_chart(fig3, use_container_width=True)
+            # Conteo sin construir la lista (Legendre por bloques, BSGS o Schoof según p)
+            n_points = None
+            if p > UMBRAL_SCHOOF and not compute_group_info:
+                st.info("p de tamaño criptográfico: activa «Mostrar número de puntos» para ver |E(F_p)| "
+                        "(el orden publicado en las curvas estándar; Schoof en una curva propia).")
+            else:
+                status = st.empty()
+                def show_progress(l, M):
+                    status.text(f"Schoof: t mod {l} listo (t conocido módulo un entero de {M.bit_length()} bits)")
+                with st.spinner("Calculando |E(F_p)|..."):
+                    n_points = cached_count(a, b, p, progress=show_progress)  # incluye el punto en el infinito
+                status.empty()
+                st.metric("Número de puntos |E(F_p)| (incluye infinito)", n_points)
+                if p > UMBRAL_SCHOOF:
+                    st.caption(f"Orden publicado de {curve_name} (comprobado con la cota de Hasse y N·P = O)."
+                               if curve_name in CURVAS_ESTANDAR else "Contado con el algoritmo de Schoof.")
+
+            # Exportación a CSV (en memoria: ver P_MAX_EXPORTACION)
+            if p > P_MAX_EXPORTACION:
+                st.caption(f"Exportar a CSV está disponible para p ≤ {P_MAX_EXPORTACION}; para p mayores usa "
+                           "enumeracion_fp.write_points_csv desde un script.")
+            elif st.button("Exportar puntos a CSV"):
+                with st.spinner("Generando el CSV..."):
+                    csv_data = points_csv_bytes(a, b, p)
+                st.download_button("Descargar CSV", csv_data, file_name=f"puntos_F{p}_a{a % p}_b{b % p}.csv",
+                                   mime="text/csv")
+
+            if p > P_MAX_ENUMERACION:
+                st.info(f"p > {P_MAX_ENUMERACION}: se muestra sólo |E(F_p)|, sin lista de puntos ni gráficas.")
+            else:
+                xs, ys = cached_enumerate(a, b, p, workers=int(workers))
+
+                if show_list:
+                    # Mostrar tabla simple
+                    import pandas as pd
+                    df = pd.DataFrame({"x": xs, "y": ys})
+                    st.dataframe(df)
+
+                # Plot 2D: scatter x vs y (Scatter, Scattergl o histograma según el número de puntos)
+                mode = mode_2d if mode_2d != "auto" else choose_mode(len(xs), umbral_webgl, umbral_hist)
+                fig2 = go.Figure()
+                if len(xs) > 0:
+                    fig2.add_trace(points_trace_2d(xs, ys, p, mode, name=f'Puntos en F_{p}'))
+                fig2.update_layout(title=f"Puntos de la curva en F_{p}: y^2 = x^3 + {a}x + {b} (mod {p})",
+                                   xaxis=dict(title="x (mod p)"), yaxis=dict(title="y (mod p)"),
+                                   height=450)
+                st.plotly_chart(fig2, use_container_width=True)
+                payload = payload_stats(fig2)
+                st.caption(f"Gráfico 2D en modo «{mode}»: {len(xs)} puntos, "
+                           f"{payload['bytes'] / 1024:.1f} KiB de JSON, {payload['seconds'] * 1000:.0f} ms en serializar")
+
+                # Plot 3D: torus mapping (marcadores diezmados)
+                X3, Y3, Z3 = torus_points_fp(a, b, p, int(max_torus))
+                # torus surface for reference
+                XT, YT, ZT = reference_mesh()
+
+                fig3 = go.Figure()
+                fig3.add_trace(go.Surface(x=XT, y=YT, z=ZT, opacity=0.22, showscale=False, name='Torus'))
+                if len(X3) > 0:
+                    fig3.add_trace(go.Scatter3d(x=X3, y=Y3, z=Z3, mode='markers',
+                                               marker=dict(size=4, color='red'), name='Puntos F_p'))
+                fig3.update_layout(scene=dict(xaxis=dict(visible=False),
+                                              yaxis=dict(visible=False),
+                                              zaxis=dict(visible=False)),
+                                   height=650, title=f"Puntos en F_{p} mapeados al toro (visualización)")
+                st.plotly_chart(fig3, use_container_width=True)
+                if len(X3) < len(xs):
+                    st.caption(f"Toro: {len(X3)} de {len(xs)} puntos (muestra uniforme en x).")
 
             # Opcional: detalles del grupo
-            if compute_group_info:
+            if compute_group_info and n_points is not None:
                 st.markdown("#### Información rápida del grupo E(F_p)")
                 st.write(f"Total de puntos (incluye infinito): **{n_points}**")
                 # Podemos dar la cota de Hasse
-                bound_low = p + 1 - 2 * int(np.sqrt(p))
-                bound_high = p + 1 + 2 * int(np.sqrt(p))
+                bound_low, bound_high = hasse_interval(p)
                 st.write(f"Cota de Hasse: {bound_low} ≤ |E(F_p)| ≤ {bound_high}")
-                st.info("Si quieres operaciones sobre puntos (suma, multiplicación por escalar), dímelo y las añado.")
+                if hasse_check(n_points, p):
+                    st.write(f"Traza de Frobenius t = p + 1 - |E| = {p + 1 - n_points} (cumple |t| ≤ 2√p)")
+                else:
+                    st.error("El conteo no cumple la cota de Hasse.")
+
+            # Estructura del grupo: factorización de |E|, Z/n1 × Z/n2 y generadores
+            group = None
+            if analyze_group and n_points is not None:
+                st.markdown("#### Estructura del grupo E(F_p)")
+                with st.spinner("Factorizando |E(F_p)| y buscando generadores..."):
+                    group = cached_group_structure(a, b, p, n_points)
+                fmt_pt = lambda R: "O" if R is None else f"({R[0]}, {R[1]})"
+                st.write("|E(F_p)| = " + " · ".join(f"{q}^{e}" if e > 1 else f"{q}"
+                                                    for q, e in group["factors"].items()))
+                if group["n2"] == 1:
+                    st.write(f"E(F_p) ≅ Z/{group['n1']} (cíclico), generador P1 = {fmt_pt(group['P1'])}")
+                else:
+                    st.write(f"E(F_p) ≅ Z/{group['n1']} × Z/{group['n2']}")
+                    st.write(f"Generadores: P1 = {fmt_pt(group['P1'])} (orden {group['n1']}), "
+                             f"P2 = {fmt_pt(group['P2'])} (orden {group['n2']})")
+                if p <= P_MAX_ENUMERACION:
+                    _, _, orders = cached_point_orders(a, b, p, n_points)
+                    dist = order_distribution(orders)
+                    import pandas as pd
+                    st.write("Número de puntos de cada orden:")
+                    st.dataframe(pd.DataFrame({"orden": list(dist), "puntos": list(dist.values())}))
+
+            # Operaciones sobre puntos (suma, doble, multiplicación por escalar)
+            st.markdown("#### Operaciones sobre puntos")
+            E = CurvaEliptica(a, b, p)
+            default_x = str(CURVAS_ESTANDAR[curve_name]["gx"]) if curve_name in CURVAS_ESTANDAR else "0"
+            # text_input y no number_input: las coordenadas pueden tener 256 bits
+            op1, op2, op3 = st.columns(3)
+            x_P = op1.text_input("x de P", value=default_x)
+            x_Q = op2.text_input("x de Q", value=default_x)
+            k_text = op3.text_input("Escalar k", value="2")
+            try:
+                P = E.lift_x(int(x_P, 0))
+                Q = E.lift_x(int(x_Q, 0))
+                k = int(k_text, 0)
+            except ValueError:
+                st.error("Usa enteros en decimal o hexadecimal (0x...).")
+            else:
+                if P is None or Q is None:
+                    st.warning("Ese x no corresponde a un punto de la curva (x^3 + ax + b no es cuadrado mod p).")
+                else:
+                    fmt = lambda R: "O (punto al infinito)" if R is None else f"({R[0]}, {R[1]})"
+                    st.write(f"P = {fmt(P)}")
+                    st.write(f"Q = {fmt(Q)}")
+                    st.write(f"P + Q = {fmt(E.add(P, Q))}")
+                    st.write(f"2P = {fmt(E.double(P))}")
+                    st.write(f"{k}·P = {fmt(E.mul(k, P))}")
+                    if group is not None:
+                        st.write(f"Orden de P = {point_order(E, P, n_points, group['factors'])}")
+
+                    # k·P con tabla de base fija para P (se reutiliza entre ejecuciones)
+                    w_fixed = st.slider("Ventana de la tabla de base fija", 1, 8, 4)
+                    table = fixed_base_table(a, b, p, P, w_fixed)
+                    info = table.stats()
+                    st.write(f"{k}·P (tabla de base fija) = {fmt(table.mul(k))}")
+                    st.caption(f"Tabla: {info['windows']} ventanas × {2**w_fixed - 1} puntos = {info['points']} puntos, "
+                               f"{info['bytes'] / 1024:.1f} KiB · caché: {fixed_base_cache_info().hits} aciertos, "
+                               f"{fixed_base_cache_info().misses} fallos")
+
+            # Firma ECDSA sobre esta misma curva (ecdsa_fp, educativa: no es de tiempo constante)
+            if n_points is not None:
+                st.markdown("#### Firma ECDSA con esta curva")
+                try:
+                    dom = cached_ecdsa_domain(a, b, p, n_points)
+                except (ValueError, ArithmeticError) as e:
+                    st.warning(f"No se puede firmar con esta curva: {e}")
+                else:
+                    st.write(f"G = ({dom.G[0]}, {dom.G[1]}), orden n = {dom.n} ({dom.qlen} bits), cofactor h = {dom.h}")
+                    if dom.qlen < 128:
+                        st.caption("n tiene menos de 128 bits: sirve para experimentar, no para proteger archivos.")
+                    # un par de claves por curva y por sesión
+                    ecdsa_keys = st.session_state.setdefault("ecdsa_keys", {})
+                    if (a % p, b % p, p) not in ecdsa_keys:
+                        ecdsa_keys[(a % p, b % p, p)] = generate_keypair(dom)
+                    d_key, Q_key = ecdsa_keys[(a % p, b % p, p)]
+                    st.write(f"Clave pública Q = d·G = ({Q_key[0]}, {Q_key[1]})")
+                    sign_col, verify_col = st.columns(2)
+                    with sign_col:
+                        to_sign = st.file_uploader("Archivo a firmar", key="ecdsa_sign_file")
+                        if to_sign is not None:
+                            try:
+                                digest, (r_sig, s_sig) = sign_stream(dom, d_key, to_sign)
+                            except ArithmeticError as e:
+                                st.warning(str(e))
+                            else:
+                                st.code(f"SHA-256 = {digest.hex()}\nr = {r_sig}\ns = {s_sig}")
+                                st.download_button("Descargar firma (.sig)", signature_to_bytes(dom, (r_sig, s_sig)),
+                                                   file_name=f"{to_sign.name}.sig", mime="application/octet-stream")
+                    with verify_col:
+                        to_verify = st.file_uploader("Archivo a verificar", key="ecdsa_verify_file")
+                        sig_file = st.file_uploader("Firma (.sig)", type=["sig"], key="ecdsa_verify_sig")
+                        if to_verify is not None and sig_file is not None:
+                            try:
+                                signature = signature_from_bytes(dom, sig_file.getvalue())
+                            except ValueError as e:
+                                st.error(str(e))
+                            else:
+                                if verify_stream(dom, Q_key, to_verify, signature):
+                                    st.success("Firma válida para Q.")
+                                else:
+                                    st.error("La firma no es válida para Q.")
 
+cache_info = CACHE_CURVAS.stats()
+st.caption(f"Caché de curvas: {cache_info['hits']} aciertos, {cache_info['misses']} fallos, "
+           f"{cache_info['evictions']} expulsiones · {cache_info['entries']} entradas, "
+           f"{cache_info['bytes'] / 2**20:.1f} / {cache_info['max_bytes'] / 2**20:.0f} MiB")
 st.caption("Nota: Tonelli–Shanks se usa aquí para obtener raíces cuadradas mod p para cualquier primo p. Este app trabaja sólo con representación y visualización de E(F_p).")
@@ -5,8 +5,11 @@ import plotly.graph_objects as go
 from math import gcd
 from PIL import Image
 import os
-import random
 import pandas as pd
+from aritmetica_fp import sqrt_context
+from primalidad import is_probable_prime
+from cache_fp import CACHE_CURVAS, PRESUPUESTO_CACHE, memoize_curve
+from toro import map_to_torus_modular, reference_mesh
 
 st.set_page_config(page_title="Curvas Elípticas sobre F_p", layout="wide")
 
@@ -47,111 +50,40 @@ div.stButton button {
 """
 st.markdown(custom_css, unsafe_allow_html=True)
 
-# ---------------------------
-# Helpers: primalidad (Miller-Rabin)
-# ---------------------------
-def is_probable_prime(n, k=7):
-    if n < 2:
-        return False
-    small_primes = [2,3,5,7,11,13,17,19,23,29]
-    for p in small_primes:
-        if n % p == 0:
-            return n == p
-    s = 0
-    d = n - 1
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    for _ in range(k):
-        a = random.randrange(2, n-1)
-        x = pow(a, d, n)
-        if x == 1 or x == n-1:
-            continue
-        composite = True
-        for _ in range(s-1):
-            x = (x*x) % n
-            if x == n-1:
-                composite = False
-                break
-        if composite:
-            return False
-    return True
-
-# ---------------------------
-# Tonelli-Shanks para sqrt modular en primos
-# ---------------------------
-def tonelli_shanks(n, p):
-    n %= p
-    if n == 0:
-        return 0
-    if p == 2:
-        return n
-    if pow(n, (p-1)//2, p) != 1:
-        return None
-    if p % 4 == 3:
-        return pow(n, (p+1)//4, p)
-    s = 0
-    q = p-1
-    while q % 2 == 0:
-        q //= 2
-        s += 1
-    z = 2
-    while pow(z, (p-1)//2, p) != p-1:
-        z += 1
-    m = s
-    c = pow(z, q, p)
-    t = pow(n, q, p)
-    r = pow(n, (q+1)//2, p)
-    while True:
-        if t == 0:
-            return 0
-        if t == 1:
-            return r
-        i = 1
-        t2i = (t * t) % p
-        while i < m:
-            if t2i == 1:
-                break
-            t2i = (t2i * t2i) % p
-            i += 1
-        b = pow(c, 1 << (m - i - 1), p)
-        m = i
-        c = (b * b) % p
-        t = (t * c) % p
-        r = (r * b) % p
-
 # ---------------------------
 # Cálculos de curva en F_p
 # ---------------------------
 def discriminant_mod_p(a, b, p):
     return (-16 * (4 * pow(a, 3, p) + 27 * pow(b, 2, p))) % p
 
+# Los resultados por curva se guardan en CACHE_CURVAS con clave (a mod p, b mod p, p)
+@memoize_curve
 def points_on_curve_fp(a, b, p):
+    # Raíces de todos los x^3 + ax + b con las constantes de p calculadas una vez
+    rhs = [(pow(x, 3, p) + (a % p) * x + (b % p)) % p for x in range(p)]
+    roots = sqrt_context(p).sqrt_many(rhs)
     pts = []
-    for x in range(p):
-        rhs = (pow(x, 3, p) + (a % p) * x + (b % p)) % p
-        y0 = tonelli_shanks(rhs, p)
+    # x ya sale en orden creciente: basta emitir primero la raíz menor, sin ordenar
+    for x, y0 in enumerate(roots):
         if y0 is None:
             continue
-        y1, y2 = y0 % p, (-y0) % p
+        y1 = min(y0 % p, (-y0) % p)
         pts.append((x, y1))
-        if y2 != y1:
-            pts.append((x, y2))
-    return sorted(pts)
+        if y1 != 0:
+            pts.append((x, p - y1))
+    return pts
 
 # ---------------------------
-# Mapeo a toro para 3D (visual)
+# Puntos en el toro para 3D (visual)
 # ---------------------------
-def map_to_torus_modular(xs, ys, p, R=2.2, r=0.7):
-    if len(xs) == 0:
-        return np.array([]), np.array([]), np.array([])
-    xs, ys = np.array(xs), np.array(ys)
-    u = 2*np.pi * xs / p
-    v = 2*np.pi * ys / p
-    X = (R + r * np.cos(v)) * np.cos(u)
-    Y = (R + r * np.cos(v)) * np.sin(u)
-    Z = r * np.sin(v)
-    return X, Y, Z
+@memoize_curve
+def points_xy(a, b, p):
+    pts = points_on_curve_fp(a, b, p)
+    return [x for x,y in pts], [y for x,y in pts]
+
+@memoize_curve
+def torus_points_fp(a, b, p):
+    return map_to_torus_modular(*points_xy(a, b, p), p)
 
 # ---------------------------
 # Interfaz Streamlit
@@ -167,6 +99,9 @@ with col1:
     p = st.number_input("Primo p", value=43, step=1, min_value=3)
     show_list = st.checkbox("Mostrar tabla de puntos", value=True)
     compute_group_info = st.checkbox("Mostrar información del grupo", value=True)
+    budget_mib = st.number_input("Memoria del caché (MiB)", value=PRESUPUESTO_CACHE >> 20,
+                                 min_value=16, step=16)
+    CACHE_CURVAS.set_budget(int(budget_mib) << 20)
 
     img_path = "/mnt/data/6e632cd2-bba9-4239-93a3-532578144221.png"
     if os.path.exists(img_path):
@@ -192,7 +127,7 @@ with col2:
                 st.dataframe(df, height=250)
 
             # 🔹 Gráfico 2D
-            xs, ys = [x for x,y in pts], [y for x,y in pts]
+            xs, ys = points_xy(a, b, p)
             fig2 = go.Figure()
             if xs:
                 fig2.add_trace(go.Scatter(x=xs, y=ys, mode='markers',
@@ -208,14 +143,8 @@ with col2:
             st.plotly_chart(fig2, use_container_width=True)
 
             # 🔹 Gráfico 3D
-            X3, Y3, Z3 = map_to_torus_modular(xs, ys, p)
-            u = np.linspace(0, 2*np.pi, 60)
-            v = np.linspace(0, 2*np.pi, 30)
-            U, V = np.meshgrid(u, v)
-            RT, rt = 2.2, 0.7
-            XT = (RT + rt*np.cos(V)) * np.cos(U)
-            YT = (RT + rt*np.cos(V)) * np.sin(U)
-            ZT = rt*np.sin(V)
+            X3, Y3, Z3 = torus_points_fp(a, b, p)
+            XT, YT, ZT = reference_mesh()
 
             fig3 = go.Figure()
             fig3.add_trace(go.Surface(x=XT, y=YT, z=ZT, opacity=0.18, showscale=False))
@@ -232,4 +161,8 @@ with col2:
                 bound_high = p + 1 + 2 * int(np.sqrt(p))
                 st.write(f"Cota de Hasse: {bound_low} ≤ |E(F_p)| ≤ {bound_high}")
 
+cache_info = CACHE_CURVAS.stats()
+st.caption(f"Caché: {cache_info['hits']} aciertos, {cache_info['misses']} fallos, "
+           f"{cache_info['evictions']} expulsiones · {cache_info['bytes'] / 2**20:.1f} / "
+           f"{cache_info['max_bytes'] / 2**20:.0f} MiB")
 st.caption("🔎 Usa Tonelli–Shanks para raíces cuadradas mod p. Solo representación y visualización.")
@@ -3,23 +3,51 @@ from streamlit.components.v1 import html
 import pandas as pd
 import hashlib
 import io
+import uuid
 import zipfile
-import boto3
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import hashes
-
-# Configurar boto3 para usar S3
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id='PRIVADO',
-    aws_secret_access_key="PRIVADO",
-    region_name='us-west-2'
-)
+from botocore.exceptions import ClientError
+from firma import (ESQUEMAS, NOMBRES_ESQUEMAS, generate_private_key, private_pem, public_pem,
+                   sign_stream, verify_stream)
+from firma_lote import sign_batch, verify_batch, iter_batch_inputs, default_workers
+from claves_s3 import CacheClaves
+from usuarios_s3 import AlmacenUsuarios
+from almacen_s3 import AlmacenS3
+from reserva_claves import ReservaClaves
 
 # Datos del bucket de S3
 BUCKET_NAME = 'firmadigitalalejandro'
 
+# Streamlit vuelve a ejecutar esta página en cada interacción: el almacén y los
+# cachés se crean una sola vez por proceso con st.cache_resource.
+
+# Configurar boto3 para usar S3: el cliente se crea en el primer uso (ver almacen_s3)
+@st.cache_resource
+def get_storage():
+    return AlmacenS3(
+        BUCKET_NAME,
+        aws_access_key_id='PRIVADO',
+        aws_secret_access_key="PRIVADO",
+        region_name='us-west-2'
+    )
+
+STORAGE = get_storage()
+
+# Claves ya cargadas, revalidadas contra S3 por ETag (ver claves_s3)
+@st.cache_resource
+def get_key_cache():
+    return CacheClaves(lambda: STORAGE.client, BUCKET_NAME)
+
+CACHE_CLAVES = get_key_cache()
+
+# Claves RSA generadas de antemano para las cuentas nuevas (las de curva elíptica
+# se generan en menos de un milisegundo y no necesitan reserva)
+@st.cache_resource
+def get_key_pool():
+    pool = ReservaClaves()
+    pool.start()
+    return pool
+
+KEY_POOL = get_key_pool()
 
 # Nombre del archivo CSV en S3
 USERS_CSV_S3_KEY = 'credentials/users.csv'
@@ -28,107 +56,96 @@ USERS_CSV_S3_KEY = 'credentials/users.csv'
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
-# Cargar usuarios desde S3
+# Usuarios indexados por nombre (ver usuarios_s3): el CSV se carga una vez y se
+# revalida por ETag; las cuentas nuevas no reescriben el CSV completo
+@st.cache_resource
+def get_user_store():
+    return AlmacenUsuarios(lambda: STORAGE.client, BUCKET_NAME, USERS_CSV_S3_KEY)
+
+USERS = get_user_store()
+
+# Cargar usuarios desde S3 (tabla completa, para listas y selección)
 def load_users():
-    try:
-        obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=USERS_CSV_S3_KEY)
-        return pd.read_csv(io.BytesIO(obj['Body'].read()))
-    except s3_client.exceptions.NoSuchKey:
-        # Si el archivo no existe, crear un DataFrame vacío
-        df = pd.DataFrame(columns=['username', 'password_hash', 'private_key_path', 'public_key_path'])
-        save_users(df)
-        return df
-
-# Guardar usuarios en S3
-def save_users(users):
-    csv_buffer = io.StringIO()
-    users.to_csv(csv_buffer, index=False)
-    s3_client.put_object(Bucket=BUCKET_NAME, Key=USERS_CSV_S3_KEY, Body=csv_buffer.getvalue())
+    return USERS.dataframe()
 
 # Verificar credenciales
 def verify_user(username, password):
-    users = load_users()
-    hashed_password = hash_password(password)
-    user_row = users[(users['username'] == username) & (users['password_hash'] == hashed_password)]
-    if not user_row.empty:
-        return user_row.iloc[0]['private_key_path'], user_row.iloc[0]['public_key_path']
-    return None, None
-
-# Crear una nueva cuenta de usuario
-def create_user(username, password):
-    users = load_users()
-    if username in users['username'].values:
+    user = USERS.get(username)
+    if user is not None and user['password_hash'] == hash_password(password):
+        return user['private_key_path'], user['public_key_path'], user['scheme']
+    return None, None, None
+
+# Crear una nueva cuenta de usuario con el esquema de firma elegido
+def create_user(username, password, scheme=ESQUEMAS[0]):
+    if username in USERS:
+        st.error("El usuario ya existe. Elige un nombre de usuario diferente.")
+        return False, None, None, None, None
+    private_key_path, public_key_path, private_key, public_key = generate_keys(username, scheme)
+    if not USERS.add(username, hash_password(password), private_key_path, public_key_path, scheme):
+        # Otra alta del mismo nombre ganó la reserva: sus claves están en otras rutas,
+        # así que sólo se borran las de este intento
+        STORAGE.client.delete_objects(Bucket=BUCKET_NAME, Delete={"Objects": [
+            {"Key": private_key_path}, {"Key": public_key_path}], "Quiet": True})
         st.error("El usuario ya existe. Elige un nombre de usuario diferente.")
         return False, None, None, None, None
-    private_key_path, public_key_path, private_key, public_key = generate_keys(username)
-    new_user = pd.DataFrame([[username, hash_password(password), private_key_path, public_key_path]], 
-                            columns=['username', 'password_hash', 'private_key_path', 'public_key_path'])
-    users = pd.concat([users, new_user], ignore_index=True)
-    save_users(users)
     return True, private_key_path, public_key_path, private_key, public_key
 
-# Generar claves RSA y guardar en S3
-def generate_keys(username):
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-    )
+# Generar claves del esquema elegido y guardar en S3
+def generate_keys(username, scheme=ESQUEMAS[0]):
+    if scheme == "rsa-pss":
+        # Par de claves ya generado en segundo plano (ver reserva_claves)
+        private_key = KEY_POOL.take()
+    else:
+        private_key = generate_private_key(scheme)
     public_key = private_key.public_key()
 
-    private_key_path = f"keys/private_key_{username}.pem"
-    public_key_path = f"keys/public_key_{username}.pem"
+    # Rutas únicas por cuenta: dos altas simultáneas del mismo nombre no se pisan las
+    # claves (sólo una gana la reserva del nombre en USERS.add)
+    suffix = uuid.uuid4().hex[:12]
+    private_key_path = f"keys/private_key_{username}_{suffix}.pem"
+    public_key_path = f"keys/public_key_{username}_{suffix}.pem"
 
-    private_key_pem = private_key.private_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.TraditionalOpenSSL,
-        encryption_algorithm=serialization.NoEncryption()
-    )
-    public_key_pem = public_key.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo
-    )
-
-    s3_client.put_object(Bucket=BUCKET_NAME, Key=private_key_path, Body=private_key_pem)
-    s3_client.put_object(Bucket=BUCKET_NAME, Key=public_key_path, Body=public_key_pem)
+    # Las dos claves se suben a la vez
+    STORAGE.put_many([(private_key_path, private_pem(private_key)), (public_key_path, public_pem(public_key))])
+    # Las claves de esta ruta cambiaron (cuenta nueva o rotación)
+    CACHE_CLAVES.invalidate(private_key_path)
+    CACHE_CLAVES.invalidate(public_key_path)
 
     st.write(f"Private key saved to: s3://{BUCKET_NAME}/{private_key_path}")
     st.write(f"Public key saved to: s3://{BUCKET_NAME}/{public_key_path}")
 
     return private_key_path, public_key_path, private_key, public_key
 
-# Firmar un archivo
-def sign_file(file_data, private_key):
-    signature = private_key.sign(
-        file_data,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
-    return signature
-
-# Verificar la firma de un archivo
-def verify_file(file_path, signature_data, public_key_path):
-    public_key_obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=public_key_path)
-    public_key = serialization.load_pem_public_key(public_key_obj['Body'].read())
-
-    with open(file_path, "rb") as f:
-        file_data = f.read()
-
+# Firmar un archivo (por bloques: no se carga completo en memoria) con el esquema
+# de la clave del usuario; las firmas RSA-PSS anteriores siguen verificando
+def sign_file(file, private_key):
+    return sign_stream(private_key, file)[1]
+
+# Cargar la clave pública de un usuario desde S3 (con caché)
+def load_public_key(public_key_path):
+    return CACHE_CLAVES.get_public_key(public_key_path)
+
+# Clave pública de un firmante del lote: None si el usuario no existe o su clave ya
+# no está en S3; los demás errores de S3 (permisos, red) se propagan
+def load_signer_key(signer):
+    user = USERS.get(signer)
+    if user is None:
+        return None
     try:
-        public_key.verify(
-            signature_data,
-            file_data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        st.success(f"Firma del archivo '{file_path}' verificada exitosamente.")
-    except Exception as e:
-        st.error(f"La verificación de la firma del archivo '{file_path}' falló: {e}")
+        return load_public_key(user['public_key_path'])
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "NoSuchKey":
+            return None
+        raise
+
+# Verificar la firma de un archivo (se lee por bloques directamente de la subida)
+def verify_file(file, signature_data, public_key_path):
+    public_key = load_public_key(public_key_path)
+
+    if verify_stream(public_key, file, signature_data):
+        st.success(f"Firma del archivo '{file.name}' verificada exitosamente.")
+    else:
+        st.error(f"La verificación de la firma del archivo '{file.name}' falló: firma inválida.")
 
 # Función principal
 def main():
@@ -235,12 +252,13 @@ def main():
             username = st.text_input("Nombre de Usuario", key="login_username")
             password = st.text_input("Contraseña", type='password', key="login_password")
             if st.button("Iniciar Sesión", key="login_button"):
-                private_key_path, public_key_path = verify_user(username, password)
+                private_key_path, public_key_path, scheme = verify_user(username, password)
                 if private_key_path and public_key_path:
                     st.session_state.authenticated = True
                     st.session_state.username = username
                     st.session_state.private_key_path = private_key_path
                     st.session_state.public_key_path = public_key_path
+                    st.session_state.scheme = scheme
                     st.success("Inicio de sesión exitoso")
                     #st.experimental_rerun()
                 else:
@@ -250,22 +268,21 @@ def main():
             st.write("No olvides/pierdas tu contraseña. Todavía no hay forma de recuperarla.")
             username = st.text_input("Elige un Nombre de Usuario", key="create_username")
             password = st.text_input("Elige una Contraseña", type='password', key="create_password")
+            scheme = st.selectbox("Esquema de firma", ESQUEMAS, format_func=NOMBRES_ESQUEMAS.get,
+                                  key="create_scheme")
             if st.button("Crear Cuenta", key="create_button"):
-                success, private_key_path, public_key_path, private_key, public_key = create_user(username, password)
+                success, private_key_path, public_key_path, private_key, public_key = create_user(username, password, scheme)
                 if success:
                     st.success("Cuenta creada exitosamente. Ahora puedes iniciar sesión.")
                     st.session_state.authenticated = True
                     st.session_state.username = username
                     st.session_state.private_key_path = private_key_path
                     st.session_state.public_key_path = public_key_path
+                    st.session_state.scheme = scheme
                     #st.experimental_rerun()
 
                     # Claves en formato PEM para la descarga
-                    private_key_pem = private_key.private_bytes(
-                        encoding=serialization.Encoding.PEM,
-                        format=serialization.PrivateFormat.TraditionalOpenSSL,
-                        encryption_algorithm=serialization.NoEncryption()
-                    )
+                    private_key_pem = private_pem(private_key)
 
                     # Crear un archivo ZIP en memoria
                     zip_buffer = io.BytesIO()
@@ -290,39 +307,85 @@ def main():
         with tab1:
             st.subheader("Firmar Archivo")
             st.write("Una vez firmado el archivo, no olvides descargar el ARCHIVO DE FIRMA .sig")
-            file = st.file_uploader("Selecciona un archivo", key="sign_file_uploader")
-            if st.button("Firmar Archivo", key="sign_button") and file:
-                file_data = file.read()
-                private_key_obj = s3_client.get_object(Bucket=BUCKET_NAME, Key=st.session_state.private_key_path)
-                private_key = serialization.load_pem_private_key(
-                    private_key_obj['Body'].read(),
-                    password=None,
-                )
-                signature = sign_file(file_data, private_key)
-                st.success("Archivo firmado exitosamente.")
+            st.caption(f"Esquema de firma: {NOMBRES_ESQUEMAS.get(st.session_state.get('scheme'), 'RSA-PSS')}")
+            batch_mode = st.checkbox("Firmar varios archivos (o un ZIP) a la vez", key="batch_mode")
+            if batch_mode:
+                files = st.file_uploader("Selecciona los archivos", accept_multiple_files=True,
+                                         key="batch_file_uploader")
+                workers = st.number_input("Procesos", min_value=1, max_value=64,
+                                          value=default_workers(), key="batch_workers")
+                upload = st.checkbox("Guardar también las firmas en S3", key="batch_upload")
+                if st.button("Firmar Archivos", key="batch_sign_button") and files:
+                    # La clave se pide una sola vez para todo el lote; los procesos reciben el PEM
+                    private_key = CACHE_CLAVES.get_private_key(st.session_state.private_key_path)
+                    private_key_pem = private_pem(private_key)
+                    try:
+                        batch = sign_batch(private_key_pem, iter_batch_inputs(files),
+                                           workers=int(workers), signer=st.session_state.username)
+                    except ValueError as e:
+                        st.error(f"No se pudo firmar el lote: {e}")
+                        st.stop()
+                    st.success(f"{batch['archivos']} archivos firmados en {batch['segundos']:.2f} s "
+                               f"({batch['archivos_s']:.1f} archivos/s, {batch['mb_s']:.1f} MB/s).")
+                    if upload:
+                        # Todas las firmas y el manifiesto se suben a la vez
+                        prefix = f"firmas/{st.session_state.username}/"
+                        with zipfile.ZipFile(io.BytesIO(batch['zip'])) as zf:
+                            STORAGE.put_many((prefix + name, zf.read(name)) for name in zf.namelist())
+                        st.write(f"Firmas guardadas en: s3://{BUCKET_NAME}/{prefix}")
+                    st.download_button(
+                        label="Descargar firmas (.zip)",
+                        data=batch['zip'],
+                        file_name=f"firmas_{st.session_state.username}.zip",
+                        mime="application/zip",
+                        key="download_batch_signatures"
+                    )
+            else:
+                file = st.file_uploader("Selecciona un archivo", key="sign_file_uploader")
+                if st.button("Firmar Archivo", key="sign_button") and file:
+                    private_key = CACHE_CLAVES.get_private_key(st.session_state.private_key_path)
+                    signature = sign_file(file, private_key)
+                    st.success("Archivo firmado exitosamente.")
                 
-                # Botón de descarga para el archivo .sig
-                st.download_button(
-                    label="Descargar archivo de firma",
-                    data=signature,
-                    file_name=f"{file.name}.sig",
-                    mime="application/octet-stream",
-                    key="download_signature"
-                )
+                    # Botón de descarga para el archivo .sig
+                    st.download_button(
+                        label="Descargar archivo de firma",
+                        data=signature,
+                        file_name=f"{file.name}.sig",
+                        mime="application/octet-stream",
+                        key="download_signature"
+                    )
 
         with tab2:
             st.subheader("Verificar Firma de Archivo")
-            file = st.file_uploader("Selecciona un archivo", key="verify_file_uploader")
-            signature_file = st.file_uploader("Selecciona el archivo de firma", type=['sig'], key="verify_signature_file_uploader")
             users = load_users()
-            username = st.selectbox("Selecciona el usuario que firmó el archivo", users['username'].tolist(), key="verify_username")
-            if st.button("Verificar Firma", key="verify_button") and file and signature_file and username:
-                file_path = f"/tmp/{file.name}"
-                signature_data = signature_file.read()
-                with open(file_path, "wb") as f:
-                    f.write(file.read())
-                public_key_path = users[users['username'] == username]['public_key_path'].values[0]
-                verify_file(file_path, signature_data, public_key_path)
+            if st.checkbox("Verificar un lote (ZIP de firmas con manifest.csv)", key="batch_verify_mode"):
+                signatures_zip = st.file_uploader("Selecciona el ZIP de firmas", type=['zip'], key="batch_signatures_uploader")
+                files = st.file_uploader("Selecciona los archivos originales (o un ZIP)", accept_multiple_files=True,
+                                         key="batch_verify_uploader")
+                workers = st.number_input("Hilos", min_value=1, max_value=64, value=8, key="batch_verify_workers")
+                if st.button("Verificar Lote", key="batch_verify_button") and signatures_zip:
+                    try:
+                        batch = verify_batch(signatures_zip, iter_batch_inputs(files or []),
+                                             load_signer_key,
+                                             workers=int(workers))
+                    except ValueError as e:
+                        st.error(f"No se pudo verificar el lote: {e}")
+                        st.stop()
+                    results = pd.DataFrame(batch['resultados'])
+                    n_valid = int(results['valida'].sum()) if len(results) else 0
+                    (st.success if n_valid == len(results) else st.error)(
+                        f"{n_valid} de {len(results)} firmas válidas en {batch['segundos']:.2f} s "
+                        f"(latencia media {batch['latencia_ms']:.1f} ms, p95 {batch['p95_ms']:.1f} ms).")
+                    st.dataframe(results)
+            else:
+                file = st.file_uploader("Selecciona un archivo", key="verify_file_uploader")
+                signature_file = st.file_uploader("Selecciona el archivo de firma", type=['sig'], key="verify_signature_file_uploader")
+                username = st.selectbox("Selecciona el usuario que firmó el archivo", users['username'].tolist(), key="verify_username")
+                if st.button("Verificar Firma", key="verify_button") and file and signature_file and username:
+                    signature_data = signature_file.read()
+                    public_key_path = USERS.get(username)['public_key_path']
+                    verify_file(file, signature_data, public_key_path)
 
         with tab3:
             if st.button("Cerrar Sesión", key="logout_button"):
@@ -330,6 +393,7 @@ def main():
                 st.session_state.username = None
                 st.session_state.private_key_path = None
                 st.session_state.public_key_path = None
+                st.session_state.scheme = None
                 st.success("Has cerrado sesión exitosamente")
                 #st.experimental_rerun()
 
@@ -337,6 +401,14 @@ def main():
             st.subheader("Lista de Usuarios Registrados")
             users = load_users()
             st.dataframe(users.drop(columns=['password_hash']))
+            stats = CACHE_CLAVES.stats()
+            st.caption(f"Caché de claves: {stats['entries']} claves, {stats['round_trips_saved']} consultas a S3 "
+                       f"evitadas, {stats['revalidations']} revalidaciones por ETag, {stats['loads']} descargas.")
+            pool = KEY_POOL.stats()
+            st.caption(f"Reserva de claves RSA: {pool['depth']} listas (marcas {pool['low']}-{pool['high']}), "
+                       f"{pool['hits']} entregadas al instante, {pool['misses']} generadas en el momento; "
+                       f"generación media {pool['gen_mean_ms']:.0f} ms, p95 {pool['gen_p95_ms']:.0f} ms, "
+                       f"máx {pool['gen_max_ms']:.0f} ms.")
             # Botón para descargar el archivo CSV de usuarios
             #st.download_button(
             #    label="Descargar CSV de Usuarios",
@@ -9,16 +9,17 @@ import streamlit as st
 from streamlit.components.v1 import html
 from PIL import Image
 import pandas as pd
-import hashlib
 import io
 import zipfile
 import boto3
 import os
+import shutil
 import time
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from cryptography.hazmat.primitives import hashes
 from cryptography.fernet import Fernet
+from firma import (BLOQUE_HASH, ESQUEMAS, NOMBRES_ESQUEMAS, generate_private_key, hash_stream,
+                   sign_digest, verify_stream)
+from reserva_claves import ReservaClaves
 import smtplib
 from email.mime.text import MIMEText
 
@@ -26,12 +27,21 @@ from email.mime.text import MIMEText
 st.set_page_config(page_title="Firma Digital y Simulador de Ransomware", layout="wide")
 
 
-# Generar claves RSA
-def generate_keys():
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048
-    )
+# Claves RSA generadas de antemano: cada sesión nueva toma una de la reserva
+@st.cache_resource
+def get_key_pool():
+    pool = ReservaClaves()
+    pool.start()
+    return pool
+
+
+# Generar claves del esquema elegido
+def generate_keys(esquema="rsa-pss"):
+    if esquema == "rsa-pss":
+        # Par de claves ya generado en segundo plano (ver reserva_claves)
+        private_key = get_key_pool().take()
+    else:
+        private_key = generate_private_key(esquema)
     public_key = private_key.public_key()
 
     # Serializar las claves
@@ -49,42 +59,27 @@ def generate_keys():
     return private_pem, public_pem
 
 
-# Función para firmar un archivo
-def sign_file(private_key_pem, file_data):
+# Función para firmar un archivo a partir de su digest SHA-256 (ver calculate_hash);
+# el esquema (RSA-PSS, ECDSA P-256 o Ed25519) es el de la clave
+def sign_file(private_key_pem, digest):
     private_key = serialization.load_pem_private_key(private_key_pem, password=None)
-    signature = private_key.sign(
-        file_data,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
-    return signature
+    return sign_digest(private_key, digest)
 
 
-# Función para verificar firma
-def verify_signature(public_key_pem, file_data, signature):
+# Función para verificar firma (el archivo se lee por bloques)
+def verify_signature(public_key_pem, file, signature):
     public_key = serialization.load_pem_public_key(public_key_pem)
-    try:
-        public_key.verify(
-            signature,
-            file_data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        return True
-    except:
-        return False
-
-
-# Función para calcular hash
-def calculate_hash(file_data):
-    sha256_hash = hashlib.sha256(file_data).hexdigest()
-    return sha256_hash
+    return verify_stream(public_key, file, signature)
+
+
+# Función para calcular hash: una sola lectura por bloques por archivo subido;
+# el digest se guarda en la sesión y lo reutilizan el hash mostrado y la firma
+def calculate_hash(uploaded_file):
+    cache = st.session_state.setdefault("digests", {})
+    if uploaded_file.file_id not in cache:
+        cache.clear()
+        cache[uploaded_file.file_id] = hash_stream(uploaded_file)
+    return cache[uploaded_file.file_id]
 
 
 # Simulador de ransomware (solo para demostración, no ejecuta acciones reales)
@@ -205,37 +200,34 @@ def main():
     with tab1:
         st.header("🔏 Firma Digital de Documentos")
 
-        # Generar o cargar claves
-        if 'private_key' not in st.session_state or 'public_key' not in st.session_state:
-            private_key, public_key = generate_keys()
-            st.session_state.private_key = private_key
-            st.session_state.public_key = public_key
-        else:
-            private_key = st.session_state.private_key
-            public_key = st.session_state.public_key
+        # Generar o cargar claves: un par por esquema y por sesión, así que al volver a
+        # un esquema se pueden verificar las firmas hechas antes con él
+        esquema = st.selectbox("Esquema de firma", ESQUEMAS, format_func=NOMBRES_ESQUEMAS.get)
+        keys = st.session_state.setdefault("keys", {})
+        if esquema not in keys:
+            keys[esquema] = generate_keys(esquema)
+        private_key, public_key = keys[esquema]
 
         # Subir archivo para firmar
         uploaded_file = st.file_uploader("Sube un archivo para firmar", type=None)
 
         if uploaded_file is not None:
-            file_data = uploaded_file.getvalue()
-
             # Mostrar información del archivo
             st.subheader("Información del archivo")
             col1, col2 = st.columns(2)
 
             with col1:
                 st.write(f"Nombre: {uploaded_file.name}")
-                st.write(f"Tamaño: {len(file_data)} bytes")
+                st.write(f"Tamaño: {uploaded_file.size} bytes")
 
             with col2:
-                file_hash = calculate_hash(file_data)
+                file_digest = calculate_hash(uploaded_file)
                 st.write(f"SHA-256 Hash:")
-                st.code(file_hash)
+                st.code(file_digest.hex())
 
             # Firmar archivo
             if st.button("Firmar archivo"):
-                signature = sign_file(private_key, file_data)
+                signature = sign_file(private_key, file_digest)
                 st.session_state.signature = signature
                 st.success("Archivo firmado correctamente!")
                 st.write("Firma digital:")
@@ -243,8 +235,11 @@ def main():
 
                 # Crear archivo zip con el original y la firma
                 zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_DEFLATED, False) as zip_file:
-                    zip_file.writestr(uploaded_file.name, file_data)
+                with zipfile.ZipFile(zip_buffer, 'a', zipfile.ZIP_DEFLATED) as zip_file:
+                    with zip_file.open(uploaded_file.name, "w",
+                                       force_zip64=uploaded_file.size > zipfile.ZIP64_LIMIT) as dest:
+                        shutil.copyfileobj(uploaded_file, dest, BLOQUE_HASH)
+                    uploaded_file.seek(0)
                     zip_file.writestr(uploaded_file.name + ".sig", signature)
 
                 # Descargar archivo firmado
@@ -261,11 +256,10 @@ def main():
         verify_sig = st.file_uploader("Sube el archivo de firma (.sig)", key="verify_sig")
 
         if verify_file and verify_sig:
-            file_data = verify_file.getvalue()
             signature = verify_sig.read()
 
             if st.button("Verificar firma"):
-                is_valid = verify_signature(public_key, file_data, signature)
+                is_valid = verify_signature(public_key, verify_file, signature)
                 if is_valid:
                     st.success("✅ La firma es válida!")
                 else:
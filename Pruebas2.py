@@ -4,9 +4,18 @@ import numpy as np
 import plotly.graph_objects as go
 from PIL import Image
 import os
+from toro import map_to_torus, map_to_torus_modular, reference_mesh
+from enumeracion_fp import enumerate_points_fp
+from graficas_fp import MAX_PUNTOS_TORO, downsample_indices
+from primalidad import is_probable_prime
+from curva_eliptica import discriminant_mod_p
+from cache_fp import memoize_curve
 
 st.set_page_config(page_title="Curvas Elípticas - Visualizador", layout="wide")
 
+# Mayor p para el que se enumeran los puntos de la superposición sobre F_p
+P_MAX_OVERLAY = 2_000_000
+
 # -----------------------------------------
 # Utilidades matemáticas
 # -----------------------------------------
@@ -14,44 +23,51 @@ def rhs(x, a, b):
     return x**3 + a*x + b
 
 def real_points_on_curve(x_vals, a, b):
-    ys_pos = []
-    ys_neg = []
-    xs_pos = []
-    xs_neg = []
-    for x in x_vals:
-        val = rhs(x, a, b)
-        if val >= 0:
-            y = np.sqrt(val)
-            xs_pos.append(x); ys_pos.append(y)
-            xs_neg.append(x); ys_neg.append(-y)
-    return (np.array(xs_pos), np.array(ys_pos)), (np.array(xs_neg), np.array(ys_neg))
-
-# Solo para p primos con p % 4 == 3 (simplificación): calcular sqrt modular
-def modular_sqrt_simple(a, p):
-    # Devuelve una raíz cuadrada de a módulo p si existe, o None.
-    # Solo fiable cuando p % 4 == 3 (fórmula rápida).
-    if a % p == 0:
-        return 0
-    if pow(a, (p-1)//2, p) != 1:
-        return None
-    if p % 4 == 3:
-        return pow(a, (p+1)//4, p)
-    # Si p % 4 != 3 no implementamos Tonelli-Shanks aquí (simplificamos).
-    return None
-
-# Mapeo simple a toro para visualización 3D
-def map_to_torus(x_vals, y_vals, R=2.0, r=0.7):
-    # Normalizamos x,y a [0, 2pi]
-    if len(x_vals) == 0:
-        return np.array([]), np.array([]), np.array([])
-    xs = np.array(x_vals)
-    ys = np.array(y_vals)
-    u = 2*np.pi * (xs - xs.min()) / max(xs.ptp(), 1e-9)
-    v = 2*np.pi * (ys - ys.min()) / max(ys.ptp(), 1e-9)
-    X = (R + r*np.cos(v)) * np.cos(u)
-    Y = (R + r*np.cos(v)) * np.sin(u)
-    Z = r * np.sin(v)
-    return X, Y, Z
+    # Ramas +y y -y en una sola pasada: se descartan (con una máscara) las x con rhs < 0.
+    # La tolerancia conserva las raíces, donde rhs puede salir -1e-16 por redondeo.
+    xs = np.asarray(x_vals, dtype=float)
+    val = rhs(xs, a, b)
+    mask = val >= -1e-9
+    xs = xs[mask]
+    ys = np.sqrt(np.maximum(val[mask], 0.0))
+    return (xs, ys), (xs, -ys)
+
+def real_roots(a, b):
+    # Raíces reales de x^3 + a x + b, ordenadas y pulidas con un paso de Newton
+    roots = np.roots([1.0, 0.0, a, b])
+    roots = np.sort(roots.real[np.abs(roots.imag) <= 1e-6 * (1 + np.abs(roots.real))])
+    d = 3*roots**2 + a
+    safe = np.abs(d) > 1e-12
+    roots[safe] -= rhs(roots[safe], a, b) / d[safe]
+    return roots
+
+def adaptive_samples(a, b, xmin, xmax, n):
+    # ~n valores de x sólo donde rhs >= 0, más densos cerca de las raíces: ahí la curva
+    # es vertical (y ~ sqrt(x - raíz)), así que x = raíz + L·t^2 con t uniforme
+    # reparte los puntos de manera uniforme a lo largo de y.
+    roots = [r for r in real_roots(a, b) if xmin < r < xmax]
+    cuts = [xmin] + roots + [xmax]
+    segments = [(x0, x1) for x0, x1 in zip(cuts, cuts[1:])
+                if x1 > x0 and rhs((x0 + x1) / 2, a, b) >= 0]
+    if not segments:
+        return np.array([])
+    total = sum(x1 - x0 for x0, x1 in segments)
+    parts = []
+    for x0, x1 in segments:
+        t = np.linspace(0.0, 1.0, max(16, round(n * (x1 - x0) / total)))
+        left, right = x0 in roots, x1 in roots
+        if left and right:      # óvalo acotado: vertical en ambos extremos
+            t = (1 - np.cos(np.pi * t)) / 2
+        elif left:
+            t = t * t
+        elif right:
+            t = 1 - (1 - t) ** 2
+        parts.append(x0 + (x1 - x0) * t)
+    return np.concatenate(parts)
+
+# Puntos sobre F_p: motor vectorizado compartido con Curvas_en_Fp (cualquier primo impar).
+# La caché guarda los arreglos por curva, así que mover los parámetros reales no los recalcula.
+cached_enumerate = memoize_curve(enumerate_points_fp)
 
 # -----------------------------------------
 # Interfaz
@@ -72,19 +88,19 @@ with col1:
     b = st.slider("b", min_value=-10.0, max_value=10.0, value=1.0, step=0.1)
     xmin = st.number_input("x mínimo", value=-5.0, step=0.5)
     xmax = st.number_input("x máximo", value=5.0, step=0.5)
-    samples = st.slider("Resolución (puntos en x)", 200, 5000, 800)
+    samples = st.slider("Resolución (puntos en x)", 50, 5000, 300)
 
     st.markdown("**Opciones de puntos discretos**")
     show_real_pts = st.checkbox("Mostrar puntos reales (muestras)", value=True)
     show_finite_field = st.checkbox("Mostrar puntos sobre F_p (campo finito)", value=False)
     p_field = None
     if show_finite_field:
-        p_field = st.number_input("p primo (solo p%4==3 soportado aquí)", min_value=3, value=43, step=2)
+        p_field = st.number_input("p primo impar", min_value=3, max_value=P_MAX_OVERLAY, value=43, step=2)
 
 with col2:
     st.subheader("Gráficas")
-    # Prepare x range
-    xs = np.linspace(xmin, xmax, samples)
+    # x adaptativas: más densas junto a las raíces, donde la curva se vuelve vertical
+    xs = adaptive_samples(a, b, xmin, xmax, samples)
     # Real curve points
     (xr_pos, yr_pos), (xr_neg, yr_neg) = real_points_on_curve(xs, a, b)
 
@@ -99,16 +115,8 @@ with col2:
     # Optionally show samples as scatter
     if show_real_pts:
         # sample some x and compute real y when possible
-        sample_xs = np.linspace(xmin, xmax, 200)
-        px_pos_x, px_pos_y = [], []
-        px_neg_x, px_neg_y = [], []
-        for x0 in sample_xs:
-            val = rhs(x0, a, b)
-            if val >= 0:
-                y0 = np.sqrt(val)
-                px_pos_x.append(x0); px_pos_y.append(y0)
-                px_neg_x.append(x0); px_neg_y.append(-y0)
-        if px_pos_x:
+        (px_pos_x, px_pos_y), (px_neg_x, px_neg_y) = real_points_on_curve(np.linspace(xmin, xmax, 200), a, b)
+        if len(px_pos_x) > 0:
             fig2d.add_trace(go.Scatter(x=px_pos_x, y=px_pos_y, mode='markers', marker=dict(size=4), name='Muestra +y'))
             fig2d.add_trace(go.Scatter(x=px_neg_x, y=px_neg_y, mode='markers', marker=dict(size=4), name='Muestra -y'))
 
@@ -124,13 +132,7 @@ with col2:
 
     fig3d = go.Figure()
     # Torus surface (light mesh), parametrize for visualization
-    u = np.linspace(0, 2*np.pi, 60)
-    v = np.linspace(0, 2*np.pi, 30)
-    U, V = np.meshgrid(u, v)
-    R_t = 2.2; r_t = 0.7
-    XT = (R_t + r_t * np.cos(V)) * np.cos(U)
-    YT = (R_t + r_t * np.cos(V)) * np.sin(U)
-    ZT = r_t * np.sin(V)
+    XT, YT, ZT = reference_mesh(2.2, 0.7, 60, 30)
     fig3d.add_trace(go.Surface(x=XT, y=YT, z=ZT, opacity=0.25, showscale=False, name='Torus'))
 
     if len(X3) > 0:
@@ -153,33 +155,25 @@ with col2:
 if show_finite_field:
     st.markdown("### Puntos sobre el campo finito \(\\mathbb{{F}}_p\\) (visualización discreta)")
     p = int(p_field)
-    if p <= 2:
-        st.error("El primer primo aceptable es p >= 3")
+    # En F_p los coeficientes son enteros: se redondean los valores de los deslizadores
+    a_p, b_p = int(round(a)), int(round(b))
+    if not is_probable_prime(p):
+        st.error("p debe ser un primo impar.")
+    elif discriminant_mod_p(a_p, b_p, p) == 0:
+        st.error(f"La curva con a = {a_p}, b = {b_p} es singular módulo p (discriminante ≡ 0).")
     else:
-        if p % 4 != 3:
-            st.warning("Solo se realiza sqrt modular con la fórmula rápida (p % 4 == 3). Si p % 4 != 3, puede que no se muestre correctamente.")
-        xs_mod = np.arange(0, p, 1)
-        pts_x = []
-        pts_y = []
-        for xm in xs_mod:
-            rhs_m = (xm**3 + a * xm + b) % p
-            y_root = modular_sqrt_simple(rhs_m, p)
-            if y_root is not None:
-                y1 = y_root % p
-                y2 = (-y_root) % p
-                pts_x.append(xm); pts_y.append(y1)
-                if y2 != y1:
-                    pts_x.append(xm); pts_y.append(y2)
+        if (a_p, b_p) != (a, b):
+            st.info(f"En F_{p} se usan los coeficientes redondeados a = {a_p}, b = {b_p}.")
+        pts_x, pts_y = cached_enumerate(a_p, b_p, p)
         if len(pts_x) == 0:
-            st.info("No se encontraron raíces cuadradas en F_p con los parámetros dados (o p no compatible).")
+            st.info("La curva no tiene puntos afines en F_p con los parámetros dados.")
         else:
-            # Map modular points into torus for visualization: normalizamos según 0..p-1
-            u = 2*np.pi * np.array(pts_x) / p
-            v = 2*np.pi * np.array(pts_y) / p
-            R_t = 2.2; r_t = 0.7
-            Xf = (R_t + r_t * np.cos(v)) * np.cos(u)
-            Yf = (R_t + r_t * np.cos(v)) * np.sin(u)
-            Zf = r_t * np.sin(v)
+            # Sólo se envían al navegador a lo más MAX_PUNTOS_TORO marcadores
+            idx = downsample_indices(len(pts_x), MAX_PUNTOS_TORO)
+            if len(idx) < len(pts_x):
+                st.caption(f"{len(pts_x)} puntos afines; se dibujan {len(idx)}.")
+            Xf, Yf, Zf = map_to_torus_modular(pts_x[idx], pts_y[idx], p, R=2.2, r=0.7)
+            XT, YT, ZT = reference_mesh(2.2, 0.7, 60, 30)
             figm = go.Figure()
             figm.add_trace(go.Surface(x=XT, y=YT, z=ZT, opacity=0.2, showscale=False, name='Torus'))
             figm.add_trace(go.Scatter3d(x=Xf, y=Yf, z=Zf, mode='markers',
@@ -0,0 +1,68 @@
+# almacen_s3.py
+# Acceso a S3 para la página de firma digital.
+#  - El cliente de boto3 se crea la primera vez que se usa, no al importar la página
+#    (crearlo carga el modelo del servicio y las credenciales), con un grupo de
+#    conexiones de MAX_CONEXIONES para que las operaciones concurrentes no esperen
+#    una conexión libre (boto3 usa 10 por defecto).
+#  - get_many / put_many hacen muchas lecturas/escrituras a la vez en un grupo de
+#    hilos (cada llamada espera la red, así que los hilos sí se solapan).
+# El cliente y el grupo de hilos viven en el objeto, que se crea a nivel de módulo y
+# se conserva entre ejecuciones de Streamlit.
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import boto3
+from botocore.config import Config
+
+# Conexiones HTTP abiertas como máximo con S3 (y hilos de las operaciones en lote)
+MAX_CONEXIONES = 32
+
+
+class AlmacenS3:
+    """Bucket de S3 con cliente perezoso y operaciones en lote.
+       client_kwargs se pasan a boto3.client('s3', ...) (credenciales, región, endpoint)."""
+
+    def __init__(self, bucket, max_connections=MAX_CONEXIONES, **client_kwargs):
+        self.bucket = bucket
+        self.max_connections = max_connections
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Cliente de boto3 (se crea en el primer uso; es seguro entre hilos)."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    config = Config(max_pool_connections=self.max_connections,
+                                    retries=dict(max_attempts=5, mode="standard"))
+                    self._client = boto3.client('s3', config=config, **self.client_kwargs)
+        return self._client
+
+    def _executor(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_connections)
+        return self._pool
+
+    def get(self, key):
+        """Contenido (bytes) del objeto key."""
+        return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+
+    def put(self, key, body):
+        return self.client.put_object(Bucket=self.bucket, Key=key, Body=body)
+
+    def get_many(self, keys):
+        """{clave: bytes} de todas las claves, leídas a la vez."""
+        keys = list(keys)
+        return dict(zip(keys, self._executor().map(self.get, keys)))
+
+    def put_many(self, items):
+        """Escribe cada (clave, contenido) de items a la vez; respuestas en el mismo orden.
+           Si alguna escritura falla se lanza su excepción después de esperar a las demás."""
+        futures = [self._executor().submit(self.put, key, body) for key, body in items]
+        wait(futures)
+        return [f.result() for f in futures]
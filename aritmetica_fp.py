@@ -0,0 +1,150 @@
+# aritmetica_fp.py
+# Aritmética en el campo finito F_p compartida por las apps de curvas.
+# Este módulo no importa streamlit, así que puede usarse desde otros módulos
+# y desde los benchmarks sin levantar la interfaz.
+
+from functools import lru_cache
+
+# Con p ≡ 1 (mod 8), Tonelli-Shanks hace O(s^2) productos además de una
+# exponenciación (p - 1 = q·2^s); Cipolla hace unas 4 exponenciaciones sin
+# importar s. Se usa Cipolla cuando s^2 supera este factor por log2(p)
+# (ajustado con benchmarks/bench_raices.py).
+FACTOR_CIPOLLA = 24
+
+
+# ---------------------------
+# Raíces cuadradas módulo un primo p
+# ---------------------------
+class RaizCuadradaFp:
+    """Raíces cuadradas módulo un primo p con las constantes calculadas una sola vez:
+       p - 1 = q·2^s, un no residuo z y las potencias c^(2^k) de c = z^q.
+       method: "p3mod4" (r = n^((p+1)/4)), "atkin" (p ≡ 5 mod 8), "tonelli" o
+       "cipolla"; por defecto se elige el más barato para p."""
+
+    METODOS = ("p3mod4", "atkin", "tonelli", "cipolla")
+
+    def __init__(self, p, method=None):
+        self.p = p
+        q, s = p - 1, 0
+        while q % 2 == 0:
+            q //= 2
+            s += 1
+        self.q, self.s = q, s
+        self.euler = (p - 1) // 2
+        z = 2
+        while p > 2 and pow(z, self.euler, p) != p - 1:
+            z += 1
+        self.z = z
+        # c^(2^k) para k = 0..s: en el paso de Tonelli-Shanks b = c^(2^(s-i-1))
+        c = pow(z, q, p)
+        self.c_pows = [c]
+        for _ in range(s):
+            self.c_pows.append(self.c_pows[-1] ** 2 % p)
+        if method is None:
+            method = self._best_method()
+        if method not in self.METODOS:
+            raise ValueError(f"Método desconocido: {method!r} (usa uno de {self.METODOS}).")
+        if method == "p3mod4" and p % 4 != 3 or method == "atkin" and p % 8 != 5:
+            raise ValueError(f"El método {method!r} no aplica a p = {p}.")
+        self.method = method
+        self._root = getattr(self, "_sqrt_" + method)
+
+    def __repr__(self):
+        return f"RaizCuadradaFp(p={self.p}, s={self.s}, method={self.method!r})"
+
+    def _best_method(self):
+        if self.p % 4 == 3:
+            return "p3mod4"
+        if self.p % 8 == 5:
+            return "atkin"
+        if self.s * self.s > FACTOR_CIPOLLA * self.p.bit_length():
+            return "cipolla"
+        return "tonelli"
+
+    def is_residue(self, n):
+        """True si n es un cuadrado módulo p (incluye 0)."""
+        n %= self.p
+        return n == 0 or pow(n, self.euler, self.p) == 1
+
+    def sqrt(self, n):
+        """Una raíz r con r^2 ≡ n (mod p), o None si n no es cuadrado."""
+        n %= self.p
+        if n == 0 or self.p == 2:
+            return n
+        return self._root(n)
+
+    def sqrt_many(self, values):
+        """Raíces de varios valores con las mismas constantes (None si no hay raíz)."""
+        p, root = self.p, self._root
+        if p == 2:
+            return [v % 2 for v in values]
+        out = []
+        for v in values:
+            v %= p
+            out.append(root(v) if v else 0)
+        return out
+
+    # ---------------------------
+    # Métodos (n ya reducido y no nulo)
+    # ---------------------------
+    def _sqrt_p3mod4(self, n):
+        r = pow(n, (self.p + 1) // 4, self.p)
+        return r if r * r % self.p == n else None
+
+    def _sqrt_atkin(self, n):
+        # Atkin: t = (2n)^((p-5)/8), i = 2n t^2 (i^2 = -1), r = n t (i - 1)
+        p = self.p
+        t = pow(2 * n, (p - 5) // 8, p)
+        i = 2 * n * t * t % p
+        r = n * t * (i - 1) % p
+        return r if r * r % p == n else None
+
+    def _sqrt_tonelli(self, n):
+        # x = n^((q-1)/2) da r = n^((q+1)/2) y t = n^q con una sola exponenciación
+        p, c_pows = self.p, self.c_pows
+        x = pow(n, (self.q - 1) // 2, p)
+        r = n * x % p
+        t = r * x % p
+        m = self.s
+        while t != 1:
+            # menor i con t^(2^i) = 1; si llega a m, n no es residuo
+            i, t2 = 0, t
+            while t2 != 1:
+                t2 = t2 * t2 % p
+                i += 1
+                if i == m:
+                    return None
+            # c actual = c^(2^(s-m)), así que b = c^(2^(s-i-1)) sale de la tabla
+            b = c_pows[self.s - i - 1]
+            r = r * b % p
+            t = t * c_pows[self.s - i] % p
+            m = i
+        return r
+
+    def _sqrt_cipolla(self, n):
+        # (a + ω)^((p+1)/2) en F_p[ω]/(ω^2 - w), con w = a^2 - n no residuo
+        p = self.p
+        if pow(n, self.euler, p) != 1:
+            return None
+        a = 1
+        while pow((a * a - n) % p, self.euler, p) != p - 1:
+            a += 1
+        w = (a * a - n) % p
+        x0, x1 = 1, 0
+        for bit in bin((p + 1) // 2)[2:]:
+            x0, x1 = (x0 * x0 + x1 * x1 % p * w) % p, 2 * x0 * x1 % p
+            if bit == "1":
+                x0, x1 = (x0 * a + x1 * w) % p, (x0 + x1 * a) % p
+        return x0
+
+
+@lru_cache(maxsize=64)
+def sqrt_context(p):
+    """RaizCuadradaFp(p) con el método por defecto, reutilizado entre llamadas."""
+    return RaizCuadradaFp(p)
+
+def tonelli_shanks(n, p):
+    """Resuelve x^2 ≡ n (mod p). Devuelve None si no tiene solución,
+       o una raíz r tal que r^2 % p == n%p.
+       p debe ser primo. Las constantes de p se calculan una vez (sqrt_context)."""
+    return sqrt_context(p).sqrt(n)
@@ -0,0 +1,88 @@
+# base_fija.py
+# Multiplicación escalar con base fija k·G usando una tabla de ventana fija.
+# La tabla guarda d·2^(w·i)·G (d = 1 .. 2^w - 1) para cada ventana i, así que
+# k·G es sólo una suma mixta por ventana de w bits, sin duplicaciones.
+#
+# Las tablas se guardan en un caché a nivel de módulo: Streamlit vuelve a
+# ejecutar el script en cada interacción, pero los módulos importados (y por
+# tanto este caché) se conservan entre ejecuciones.
+import sys
+from functools import lru_cache
+
+from curva_eliptica import CurvaEliptica, JACOBIAN_INFINITY
+
+VENTANA_BASE_FIJA = 4
+
+
+class TablaBaseFija:
+    """Tabla de ventana fija para k·G sobre la curva E.
+       bits: tamaño máximo de k (por defecto el de p + 1, que acota |E(F_p)|)."""
+
+    def __init__(self, E, G, w=VENTANA_BASE_FIJA, bits=None):
+        if G is None or not E.is_on_curve(G):
+            raise ValueError("G debe ser un punto afín de la curva.")
+        self.E, self.G, self.w = E, G, w
+        self.bits = bits or (E.p + 1).bit_length()
+        self.n_windows = -(-self.bits // w)
+        rows = []
+        base = E.to_jacobian(G)
+        for _ in range(self.n_windows):
+            row = [base]
+            for _ in range((1 << w) - 2):
+                row.append(E.jacobian_add(row[-1], base))
+            rows.append(row)
+            # siguiente ventana: 2^w · base
+            base = E.jacobian_add(row[-1], base)
+        # una sola inversión para toda la tabla
+        flat = E.batch_to_affine([J for row in rows for J in row])
+        width = (1 << w) - 1
+        self.rows = [[None] + flat[i * width:(i + 1) * width] for i in range(self.n_windows)]
+
+    def mul_jacobian(self, k):
+        E = self.E
+        if k < 0:
+            X, Y, Z = self.mul_jacobian(-k)
+            return X, (-Y) % E.p, Z
+        if k >> (self.w * self.n_windows):
+            # k fuera del rango de la tabla: ruta genérica
+            return E.mul_jacobian(k, self.G)
+        mask = (1 << self.w) - 1
+        R = JACOBIAN_INFINITY
+        for row in self.rows:
+            R = E.jacobian_add_affine(R, row[k & mask])
+            k >>= self.w
+            if not k:
+                break
+        return R
+
+    def mul(self, k):
+        """k·G usando la tabla."""
+        return self.E.to_affine(self.mul_jacobian(k))
+
+    def memory_bytes(self):
+        """Memoria aproximada de la tabla (listas, tuplas y enteros)."""
+        total = sys.getsizeof(self.rows)
+        for row in self.rows:
+            total += sys.getsizeof(row)
+            for P in row:
+                if P is not None:
+                    total += sys.getsizeof(P) + sys.getsizeof(P[0]) + sys.getsizeof(P[1])
+        return total
+
+    def stats(self):
+        return dict(window=self.w, windows=self.n_windows,
+                    points=self.n_windows * ((1 << self.w) - 1),
+                    bytes=self.memory_bytes())
+
+
+@lru_cache(maxsize=16)
+def _cached_table(a, b, p, G, w):
+    return TablaBaseFija(CurvaEliptica(a, b, p), G, w)
+
+def fixed_base_table(a, b, p, G, w=VENTANA_BASE_FIJA):
+    """Tabla de base fija para (a, b, p, G, w), reutilizada entre llamadas."""
+    return _cached_table(a % p, b % p, p, tuple(G), w)
+
+def fixed_base_cache_info():
+    """Aciertos/fallos del caché de tablas (functools.lru_cache)."""
+    return _cached_table.cache_info()
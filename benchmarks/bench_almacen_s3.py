@@ -0,0 +1,91 @@
+# bench_almacen_s3.py
+# almacen_s3.AlmacenS3 contra un S3 local (servidor de moto por HTTP,
+# pip install "moto[server]", o cualquier endpoint compatible como MinIO con --endpoint):
+#  - costo de crear el cliente de boto3 (lo que ya no se paga al importar la página);
+#  - N escrituras/lecturas una por una contra put_many/get_many;
+#  - subida de un par de claves PEM en serie contra en paralelo.
+# El servidor local responde en microsegundos; --latencia-ms agrega a cada petición
+# una espera que simula la ida y vuelta a S3 real (0 para medir sin ella).
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_almacen_s3
+#     python -m benchmarks.bench_almacen_s3 --objetos 500 --kib 4 --latencia-ms 0
+#     python -m benchmarks.bench_almacen_s3 --endpoint http://localhost:9000
+import argparse
+import logging
+import os
+import time
+
+import boto3
+
+from almacen_s3 import AlmacenS3
+
+BUCKET = "bench-almacen"
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Operaciones en lote sobre S3")
+    parser.add_argument("--objetos", type=int, default=200)
+    parser.add_argument("--kib", type=int, default=2, help="tamaño de cada objeto (un PEM ~2 KiB)")
+    parser.add_argument("--endpoint", default=None, help="endpoint S3 existente (por defecto, moto)")
+    parser.add_argument("--latencia-ms", type=float, default=20, help="ida y vuelta simulada por petición")
+    args = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    def add_latency(client):
+        if args.latencia_ms:
+            client.meta.events.register("before-send.s3", lambda **kw: time.sleep(args.latencia_ms / 1000))
+        return client
+
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        from moto.server import ThreadedMotoServer
+        server = ThreadedMotoServer(port=0, verbose=False)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint = f"http://{host}:{port}"
+    kwargs = dict(endpoint_url=endpoint, region_name="us-east-1",
+                  aws_access_key_id="prueba", aws_secret_access_key="prueba")
+    try:
+        t_client = timed(lambda: boto3.client("s3", **kwargs))
+        storage = AlmacenS3(BUCKET, **kwargs)
+        add_latency(storage.client)
+        plain = add_latency(boto3.client("s3", **kwargs))
+        plain.create_bucket(Bucket=BUCKET)
+
+        items = [(f"obj/{i}", os.urandom(args.kib << 10)) for i in range(args.objetos)]
+        keys = [k for k, _ in items]
+        rows = [
+            ("put uno por uno", lambda: [plain.put_object(Bucket=BUCKET, Key=k, Body=b) for k, b in items]),
+            ("put_many", lambda: storage.put_many(items)),
+            ("get uno por uno", lambda: [plain.get_object(Bucket=BUCKET, Key=k)["Body"].read() for k in keys]),
+            ("get_many", lambda: storage.get_many(keys)),
+        ]
+        pair = items[:2]
+        rows += [
+            ("par de claves, serie", lambda: [storage.put(k, b) for k, b in pair]),
+            ("par de claves, paralelo", lambda: storage.put_many(pair)),
+        ]
+        storage.put_many(items[:4])  # conexiones y grupo de hilos ya abiertos
+
+        print(f"endpoint {endpoint}; latencia simulada {args.latencia_ms:g} ms; "
+              f"crear el cliente: {1000 * t_client:.1f} ms")
+        print(f"{'operación':>24} {'objetos':>8} {'tiempo (ms)':>12} {'ms/objeto':>10}")
+        for label, fn in rows:
+            n = 2 if label.startswith("par") else args.objetos
+            t = timed(fn)
+            print(f"{label:>24} {n:>8} {1000 * t:>12.1f} {1000 * t / n:>10.2f}")
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
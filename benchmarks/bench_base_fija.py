@@ -0,0 +1,49 @@
+# bench_base_fija.py
+# k·G con tabla de base fija (base_fija) contra la ruta genérica wNAF de
+# curva_eliptica, para varios tamaños de ventana: precómputo, memoria y k·G/s.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_base_fija
+#     python -m benchmarks.bench_base_fija --curva secp256k1 --ventanas 2 4 6 8
+import argparse
+import random
+import time
+
+from base_fija import TablaBaseFija
+from curva_eliptica import CurvaEliptica
+from curvas_estandar import CURVAS_ESTANDAR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="k·G: tabla de base fija vs wNAF genérico")
+    parser.add_argument("--curva", choices=list(CURVAS_ESTANDAR), default="P-256")
+    parser.add_argument("--reps", type=int, default=200)
+    parser.add_argument("--ventanas", type=int, nargs="+", default=[2, 4, 6, 8])
+    args = parser.parse_args()
+
+    c = CURVAS_ESTANDAR[args.curva]
+    E = CurvaEliptica(c["a"], c["b"], c["p"])
+    G = (c["gx"], c["gy"])
+    rng = random.Random(0)
+    ks = [rng.randrange(1, c["n"]) for _ in range(args.reps)]
+
+    t0 = time.perf_counter()
+    expected = [E.mul(k, G) for k in ks]
+    t_generic = time.perf_counter() - t0
+    print(f"{args.curva}: wNAF genérico {args.reps / t_generic:.1f} k·G/s")
+    print(f"{'w':>3} {'puntos':>7} {'KiB':>8} {'precómputo (s)':>15} {'k·G/s':>9} {'speedup':>8}")
+    for w in args.ventanas:
+        t0 = time.perf_counter()
+        table = TablaBaseFija(E, G, w)
+        t_pre = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        got = [table.mul(k) for k in ks]
+        t_fixed = time.perf_counter() - t0
+        assert got == expected
+        st = table.stats()
+        print(f"{w:>3} {st['points']:>7} {st['bytes'] / 1024:>8.1f} {t_pre:>15.3f} "
+              f"{args.reps / t_fixed:>9.1f} {t_generic / t_fixed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
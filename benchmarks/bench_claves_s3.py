@@ -0,0 +1,87 @@
+# bench_claves_s3.py
+# Consultas a S3 y tiempo por operación al pedir claves PEM con y sin
+# claves_s3.CacheClaves, contra un S3 local simulado con moto (pip install "moto[s3]").
+# Simula N firmas/verificaciones repartidas entre U usuarios y una rotación de clave
+# a la mitad (invalidate) para comprobar que después se usa la clave nueva.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_claves_s3
+#     python -m benchmarks.bench_claves_s3 --operaciones 2000 --usuarios 20 --ttl 0
+import argparse
+import random
+import time
+
+import boto3
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from moto import mock_aws
+
+from claves_s3 import CacheClaves
+
+BUCKET = "bench-claves"
+
+
+def put_key(s3, username):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    s3.put_object(Bucket=BUCKET, Key=f"keys/private_key_{username}.pem",
+                  Body=key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                                         serialization.NoEncryption()))
+    s3.put_object(Bucket=BUCKET, Key=f"keys/public_key_{username}.pem",
+                  Body=key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                     serialization.PublicFormat.SubjectPublicKeyInfo))
+    return key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas a S3 ahorradas por el caché de claves")
+    parser.add_argument("--operaciones", type=int, default=1000)
+    parser.add_argument("--usuarios", type=int, default=10)
+    parser.add_argument("--ttl", type=float, default=300, help="0: revalida por ETag en cada uso")
+    args = parser.parse_args()
+
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET)
+        calls = {"n": 0}
+        s3.meta.events.register("before-call.s3.GetObject", lambda **kw: calls.__setitem__("n", calls["n"] + 1))
+        users = [f"usuario{i}" for i in range(args.usuarios)]
+        for u in users:
+            put_key(s3, u)
+        rng = random.Random(1)
+        ops = [(rng.choice(users), rng.random() < 0.5) for _ in range(args.operaciones)]
+
+        # sin caché: get_object + interpretar el PEM en cada operación
+        calls["n"] = 0
+        t0 = time.perf_counter()
+        for u, private in ops:
+            kind = "private" if private else "public"
+            pem = s3.get_object(Bucket=BUCKET, Key=f"keys/{kind}_key_{u}.pem")["Body"].read()
+            (serialization.load_pem_private_key(pem, password=None) if private
+             else serialization.load_pem_public_key(pem))
+        t_plain, calls_plain = time.perf_counter() - t0, calls["n"]
+
+        calls["n"] = 0
+        cache = CacheClaves(lambda: s3, BUCKET, ttl=args.ttl)
+        rotated = users[0]
+        t0 = time.perf_counter()
+        for i, (u, private) in enumerate(ops):
+            if i == len(ops) // 2:
+                new_key = put_key(s3, rotated)
+                cache.invalidate(f"keys/private_key_{rotated}.pem")
+                cache.invalidate(f"keys/public_key_{rotated}.pem")
+            kind = "private" if private else "public"
+            cache.get(f"keys/{kind}_key_{u}.pem", private=private)
+        t_cache, calls_cache = time.perf_counter() - t0, calls["n"]
+        after = cache.get_public_key(f"keys/public_key_{rotated}.pem")
+        assert after.public_numbers() == new_key.public_key().public_numbers()
+
+    n = args.operaciones
+    print(f"{n} operaciones, {args.usuarios} usuarios, TTL {args.ttl} s")
+    print(f"{'modo':>10} {'GetObject':>10} {'ms/op':>8}")
+    print(f"{'sin caché':>10} {calls_plain:>10} {1000 * t_plain / n:>8.3f}")
+    print(f"{'con caché':>10} {calls_cache:>10} {1000 * t_cache / n:>8.3f}")
+    print("estadísticas:", cache.stats())
+
+
+if __name__ == "__main__":
+    main()
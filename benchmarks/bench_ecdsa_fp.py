@@ -0,0 +1,111 @@
+# bench_ecdsa_fp.py
+# ecdsa_fp (ECDSA sobre curva_eliptica) contra el ECDSA nativo de cryptography.
+# Primero comprueba que ambos coinciden en P-256:
+#  - el vector de RFC 6979 (A.2.5, mensaje "sample") da el mismo nonce y la misma r;
+#  - para --claves claves aleatorias: misma clave pública d·G, la firma determinista
+#    de ecdsa_fp es idéntica a la de cryptography (deterministic_signing=True), cada
+#    uno verifica las firmas del otro y ambos rechazan un digest alterado.
+# Después mide firmas/s y verificaciones/s, y la verificación con el truco de Shamir
+# contra u1·G (tabla de base fija) + u2·Q por separado.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_ecdsa_fp
+#     python -m benchmarks.bench_ecdsa_fp --curva secp256k1 --repeticiones 200 --claves 50
+import argparse
+import hashlib
+import random
+import time
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, utils
+
+from ecdsa_fp import DominioECDSA, bits2int, public_key, rfc6979_nonces, sign_digest, verify_digest
+
+CURVAS_NATIVAS = {"P-256": ec.SECP256R1, "secp256k1": ec.SECP256K1}
+
+# RFC 6979, A.2.5: P-256, SHA-256, mensaje "sample"
+RFC6979_X = 0xC9AFA9D845BA75166B5C215767B1D6934E50C3DB36E89B127B8A622B120F6721
+RFC6979_K = 0xA6E3C57DD01ABE90086538398355DD4C3B17AA873382B0F24D6129493D8AAD60
+RFC6979_R = 0xEFD48B2AACB6A8FD1140DD9CD45E81D69D2C877B56AAF991C34D0EA84EAF3716
+
+PREHASHED = utils.Prehashed(hashes.SHA256())
+
+
+def cross_check(dom, curve, n_keys, rng):
+    digest = hashlib.sha256(b"sample").digest()
+    if curve is ec.SECP256R1:
+        assert next(rfc6979_nonces(RFC6979_X, digest, dom.n)) == RFC6979_K
+        assert sign_digest(dom, RFC6979_X, digest)[0] == RFC6979_R
+    deterministic = ec.ECDSA(PREHASHED, deterministic_signing=True)
+    for i in range(n_keys):
+        d = rng.randrange(1, dom.n)
+        digest = hashlib.sha256(i.to_bytes(4, "big")).digest()
+        other = hashlib.sha256(b"otro" + digest).digest()
+        native = ec.derive_private_key(d, curve())
+        numbers = native.public_key().public_numbers()
+        Q = public_key(dom, d)
+        assert Q == (numbers.x, numbers.y)
+        signature = sign_digest(dom, d, digest)
+        assert utils.decode_dss_signature(native.sign(digest, deterministic)) == signature
+        native.public_key().verify(utils.encode_dss_signature(*signature), digest, ec.ECDSA(PREHASHED))
+        randomized = utils.decode_dss_signature(native.sign(digest, ec.ECDSA(PREHASHED)))
+        assert verify_digest(dom, Q, digest, randomized)
+        assert not verify_digest(dom, Q, other, signature)
+        assert not verify_digest(dom, Q, other, randomized)
+
+def per_second(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECDSA propio (ecdsa_fp) contra cryptography")
+    parser.add_argument("--curva", choices=list(CURVAS_NATIVAS), default="P-256")
+    parser.add_argument("--repeticiones", type=int, default=100)
+    parser.add_argument("--claves", type=int, default=20, help="claves aleatorias de la comprobación cruzada")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    dom = DominioECDSA.standard(args.curva)
+    curve = CURVAS_NATIVAS[args.curva]
+    t0 = time.perf_counter()
+    cross_check(dom, curve, args.claves, rng)
+    print(f"{args.curva}: comprobación cruzada con cryptography correcta "
+          f"({args.claves} claves, {time.perf_counter() - t0:.1f} s)")
+
+    d = rng.randrange(1, dom.n)
+    Q = public_key(dom, d)
+    digest = hashlib.sha256(b"bench").digest()
+    signature = sign_digest(dom, d, digest)
+    native = ec.derive_private_key(d, curve())
+    native_public = native.public_key()
+    der = native.sign(digest, ec.ECDSA(PREHASHED))
+
+    def verify_separate():
+        # u1·G con la tabla de base fija y u2·Q aparte: dos cadenas en lugar de una
+        n, E = dom.n, dom.E
+        r, s = signature
+        w = pow(s, -1, n)
+        e = bits2int(digest, dom.qlen)
+        R = E.add(dom.table.mul(e * w % n), E.mul(r * w % n, Q))
+        return R[0] % n == r
+
+    n = args.repeticiones
+    rows = [
+        ("firma", "ecdsa_fp", per_second(lambda: sign_digest(dom, d, digest), n)),
+        ("firma", "cryptography", per_second(lambda: native.sign(digest, ec.ECDSA(PREHASHED)), 10 * n)),
+        ("verificación", "ecdsa_fp (Shamir)", per_second(lambda: verify_digest(dom, Q, digest, signature), n)),
+        ("verificación", "ecdsa_fp (separada)", per_second(verify_separate, n)),
+        ("verificación", "cryptography",
+         per_second(lambda: native_public.verify(der, digest, ec.ECDSA(PREHASHED)), 10 * n)),
+    ]
+    native_rate = {op: rate for op, impl, rate in rows if impl == "cryptography"}
+    print(f"{'operación':>13} {'implementación':>20} {'ops/s':>9} {'ms/op':>8} {'vs nativo':>10}")
+    for op, impl, rate in rows:
+        print(f"{op:>13} {impl:>20} {rate:>9.0f} {1000 / rate:>8.3f} {native_rate[op] / rate:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
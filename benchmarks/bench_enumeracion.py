@@ -0,0 +1,64 @@
+# bench_enumeracion.py
+# Compara la enumeración original (bucle de Python + tonelli_shanks por cada x)
+# con el motor vectorizado de enumeracion_fp para p entre 10^3 y 10^7.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_enumeracion
+#     python -m benchmarks.bench_enumeracion --python-max 10000000
+import argparse
+import time
+
+from aritmetica_fp import tonelli_shanks
+from enumeracion_fp import enumerate_points_fp
+
+# Primos cercanos a cada potencia de 10 (mezcla de p % 4 == 1 y p % 4 == 3)
+PRIMES = [1009, 10007, 100003, 1000003, 10000019]
+
+
+def points_on_curve_fp_python(a, b, p):
+    # Implementación original de Curvas_en_Fp.points_on_curve_fp
+    pts = []
+    for x in range(p):
+        rhs = (pow(x, 3, p) + (a % p) * x + (b % p)) % p
+        y0 = tonelli_shanks(rhs, p)
+        if y0 is None:
+            continue
+        y1 = y0 % p
+        y2 = (-y0) % p
+        pts.append((x, y1))
+        if y2 != y1:
+            pts.append((x, y2))
+    return sorted(pts)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumeración de E(F_p): Python vs NumPy")
+    parser.add_argument("-a", type=int, default=-1)
+    parser.add_argument("-b", type=int, default=1)
+    parser.add_argument("--python-max", type=int, default=1_000_003,
+                        help="p máximo para la ruta de Python (es O(p) con pow por punto)")
+    parser.add_argument("--umbral-tabla", type=int, default=None,
+                        help="umbral de la tabla de raíces (por defecto el del módulo)")
+    args = parser.parse_args()
+
+    kwargs = {} if args.umbral_tabla is None else {"umbral_tabla": args.umbral_tabla}
+    print(f"{'p':>10} {'|E|':>10} {'python (s)':>12} {'numpy (s)':>11} {'speedup':>8}")
+    for p in PRIMES:
+        (xs, ys), t_np = timed(lambda: enumerate_points_fp(args.a, args.b, p, **kwargs))
+        n = len(xs) + 1
+        if p <= args.python_max:
+            pts, t_py = timed(points_on_curve_fp_python, args.a, args.b, p)
+            assert len(pts) + 1 == n
+            print(f"{p:>10} {n:>10} {t_py:>12.3f} {t_np:>11.3f} {t_py / t_np:>7.1f}x")
+        else:
+            print(f"{p:>10} {n:>10} {'-':>12} {t_np:>11.3f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# bench_escalar.py
+# Multiplicación escalar k·P: doble-y-suma afín (una inversión por operación)
+# contra wNAF en coordenadas jacobianas (una inversión al final) de curva_eliptica.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_escalar
+#     python -m benchmarks.bench_escalar --reps 50 --ventanas 3 4 5 6
+import argparse
+import random
+import time
+
+from curva_eliptica import CurvaEliptica
+from curvas_estandar import CURVAS_ESTANDAR
+
+# Curva adicional de 64 bits (p = 2^64 - 59) para ver el efecto del tamaño de p
+CURVAS = dict(CURVAS_ESTANDAR)
+CURVAS["p64"] = dict(p=(1 << 64) - 59, a=-3, b=7)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="k·P: afín ingenuo vs wNAF jacobiano")
+    parser.add_argument("--reps", type=int, default=20)
+    parser.add_argument("--ventanas", type=int, nargs="+", default=[4, 5])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'curva':>10} {'método':>10} {'k·P/s':>10} {'speedup':>8}")
+    for name, c in CURVAS.items():
+        E = CurvaEliptica(c["a"], c["b"], c["p"])
+        cases = [(rng.randrange(1, E.p), E.random_point(rng)) for _ in range(args.reps)]
+
+        t0 = time.perf_counter()
+        expected = [E.mul_naive(k, P) for k, P in cases]
+        t_naive = time.perf_counter() - t0
+        print(f"{name:>10} {'afín':>10} {args.reps / t_naive:>10.1f} {'1.0x':>8}")
+
+        for w in args.ventanas:
+            t0 = time.perf_counter()
+            got = [E.mul(k, P, w) for k, P in cases]
+            t_w = time.perf_counter() - t0
+            assert got == expected
+            print(f"{name:>10} {f'wNAF w={w}':>10} {args.reps / t_w:>10.1f} {t_naive / t_w:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
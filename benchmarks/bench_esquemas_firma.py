@@ -0,0 +1,54 @@
+# bench_esquemas_firma.py
+# Comparación de los esquemas de firma de firma.ESQUEMAS: latencia de generar la
+# clave, de firmar y de verificar un digest SHA-256, y tamaño de la firma y del PEM
+# de la clave pública. El digest se calcula una vez (como en la página), así que los
+# tiempos son sólo los de la operación de clave pública.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_esquemas_firma
+#     python -m benchmarks.bench_esquemas_firma --repeticiones 2000 --claves 5
+import argparse
+import hashlib
+import os
+import time
+
+from firma import ESQUEMAS, generate_private_key, public_pem, sign_digest, verify_digest
+
+
+def timed_ms(fn, n):
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append(1000 * (time.perf_counter() - t0))
+    return sorted(out)
+
+def p50(ms):
+    return ms[len(ms) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia y tamaño por esquema de firma")
+    parser.add_argument("--repeticiones", type=int, default=500, help="firmas y verificaciones por esquema")
+    parser.add_argument("--claves", type=int, default=10, help="claves generadas por esquema")
+    args = parser.parse_args()
+
+    digest = hashlib.sha256(os.urandom(1 << 16)).digest()
+    print(f"{args.claves} claves y {args.repeticiones} firmas/verificaciones por esquema (medianas)")
+    print(f"{'esquema':>12} {'clave (ms)':>11} {'firma (ms)':>11} {'verif. (ms)':>12} "
+          f"{'firmas/s':>9} {'verif./s':>9} {'firma (B)':>10} {'PEM púb. (B)':>13}")
+    for esquema in ESQUEMAS:
+        t_key = timed_ms(lambda: generate_private_key(esquema), args.claves)
+        key = generate_private_key(esquema)
+        public_key = key.public_key()
+        signature = sign_digest(key, digest)
+        assert verify_digest(public_key, digest, signature)
+        t_sign = timed_ms(lambda: sign_digest(key, digest), args.repeticiones)
+        t_verify = timed_ms(lambda: verify_digest(public_key, digest, signature), args.repeticiones)
+        print(f"{esquema:>12} {p50(t_key):>11.3f} {p50(t_sign):>11.3f} {p50(t_verify):>12.3f} "
+              f"{1000 / p50(t_sign):>9.0f} {1000 / p50(t_verify):>9.0f} "
+              f"{len(signature):>10} {len(public_pem(public_key)):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_firma_lote.py
+# Firma por lotes (firma_lote.sign_batch) contra el flujo anterior de la página:
+# un archivo por clic, cargando la clave PEM en cada firma.
+# Reporta archivos/s y MB/s con 1, 2 y 4 procesos.
+# Después verifica el mismo lote (firma_lote.verify_batch) con 1, 2, 4 y 8 hilos
+# contra la verificación uno por uno (clave pública cargada en cada archivo).
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_firma_lote
+#     python -m benchmarks.bench_firma_lote --archivos 500 --kib 64 --procesos 1 2 4 8
+import argparse
+import io
+import os
+import time
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from firma_lote import sign_batch, verify_batch
+from paralelo_fp import get_pool
+
+
+def sign_one_by_one(private_key_pem, items):
+    for _, data in items:
+        key = serialization.load_pem_private_key(private_key_pem, password=None)
+        key.sign(data, padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+                 hashes.SHA256())
+
+
+def verify_one_by_one(public_key_pem, items, signatures):
+    for (_, data), signature in zip(items, signatures):
+        key = serialization.load_pem_public_key(public_key_pem)
+        key.verify(signature, data, padding.PSS(mgf=padding.MGF1(hashes.SHA256()),
+                                                salt_length=padding.PSS.MAX_LENGTH), hashes.SHA256())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Firma de muchos archivos en varios procesos")
+    parser.add_argument("--archivos", type=int, default=200)
+    parser.add_argument("--kib", type=int, default=256, help="tamaño de cada archivo")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--hilos", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                            serialization.NoEncryption())
+    items = [(f"archivo_{i}.bin", os.urandom(args.kib << 10)) for i in range(args.archivos)]
+    mb = args.archivos * (args.kib << 10) / 1e6
+
+    print(f"{args.archivos} archivos de {args.kib} KiB")
+    print(f"{'modo':>22} {'tiempo (s)':>11} {'archivos/s':>11} {'MB/s':>8}")
+    t0 = time.perf_counter()
+    sign_one_by_one(pem, items)
+    t = time.perf_counter() - t0
+    print(f"{'uno por uno':>22} {t:>11.2f} {args.archivos / t:>11.1f} {mb / t:>8.1f}")
+    get_pool()  # el arranque de los procesos no entra en la medición
+    for workers in args.procesos:
+        r = sign_batch(pem, items, workers=workers)
+        print(f"{f'lote, {workers} procesos':>22} {r['segundos']:>11.2f} {r['archivos_s']:>11.1f} {r['mb_s']:>8.1f}")
+
+    public_pem = key.public_key().public_bytes(serialization.Encoding.PEM,
+                                               serialization.PublicFormat.SubjectPublicKeyInfo)
+    signatures = [key.sign(data, padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+                           hashes.SHA256()) for _, data in items]
+    print()
+    print(f"{'verificación':>22} {'tiempo (s)':>11} {'archivos/s':>11} {'p95 (ms)':>9}")
+    t0 = time.perf_counter()
+    verify_one_by_one(public_pem, items, signatures)
+    t = time.perf_counter() - t0
+    print(f"{'uno por uno':>22} {t:>11.2f} {args.archivos / t:>11.1f} {'':>9}")
+    archive = sign_batch(pem, items)["zip"]
+    for workers in args.hilos:
+        r = verify_batch(io.BytesIO(archive), items, lambda signer: key.public_key(), workers=workers)
+        assert all(row["valida"] for row in r["resultados"])
+        print(f"{f'lote, {workers} hilos':>22} {r['segundos']:>11.2f} {args.archivos / r['segundos']:>11.1f} "
+              f"{r['p95_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_graficas.py
+# Tamaño del JSON enviado al navegador y tiempo de servidor (armar la figura y
+# serializarla) para cada modo 2D de graficas_fp (Scatter, Scattergl, histograma)
+# y para el toro con y sin diezmado, con |E(F_p)| entre 10^3 y 10^6 puntos.
+# El tiempo de dibujo en el navegador no se mide aquí: crece con el JSON enviado.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_graficas
+#     python -m benchmarks.bench_graficas --primos 10007 1000003
+import argparse
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from enumeracion_fp import enumerate_points_fp
+from graficas_fp import MAX_PUNTOS_TORO, downsample_indices, points_trace_2d
+
+PRIMES = [1009, 10007, 100003, 1000003]
+
+
+def measure(build):
+    t0 = time.perf_counter()
+    fig = build()
+    payload = fig.to_json()
+    return len(payload), time.perf_counter() - t0
+
+
+def torus_figure(xs, ys, p):
+    u, v = 2*np.pi * xs / p, 2*np.pi * ys / p
+    X = (2.2 + 0.7 * np.cos(v)) * np.cos(u)
+    Y = (2.2 + 0.7 * np.cos(v)) * np.sin(u)
+    Z = 0.7 * np.sin(v)
+    return go.Figure(go.Scatter3d(x=X, y=Y, z=Z, mode="markers", marker=dict(size=4)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tamaño/tiempo de las gráficas por modo")
+    parser.add_argument("-a", type=int, default=-1)
+    parser.add_argument("-b", type=int, default=1)
+    parser.add_argument("--primos", type=int, nargs="+", default=PRIMES)
+    args = parser.parse_args()
+
+    print(f"{'p':>8} {'puntos':>8} {'gráfica':>18} {'KiB':>10} {'servidor (s)':>13}")
+    for p in args.primos:
+        xs, ys = enumerate_points_fp(args.a, args.b, p)
+        n = len(xs)
+        rows = [(f"2D {mode}", lambda mode=mode: go.Figure(points_trace_2d(xs, ys, p, mode, name="E")))
+                for mode in ("svg", "webgl", "histograma")]
+        idx = downsample_indices(n, MAX_PUNTOS_TORO)
+        rows.append(("toro completo", lambda: torus_figure(xs, ys, p)))
+        rows.append((f"toro ≤{MAX_PUNTOS_TORO}", lambda: torus_figure(xs[idx], ys[idx], p)))
+        for label, build in rows:
+            size, t = measure(build)
+            print(f"{p:>8} {n:>8} {label:>18} {size / 1024:>10.1f} {t:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
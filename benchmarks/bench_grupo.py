@@ -0,0 +1,58 @@
+# bench_grupo.py
+# Estructura de E(F_p) y orden de todos los puntos (grupo_fp) para p hasta ~10^6,
+# contra el orden por sumas repetidas P, 2P, 3P, ... en una muestra de puntos.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_grupo
+#     python -m benchmarks.bench_grupo -a 2 -b 3 --muestra 50
+import argparse
+import time
+
+from conteo_fp import count_points_fp
+from curva_eliptica import CurvaEliptica
+from factorizacion import factorize
+from grupo_fp import group_structure, point_orders_fp
+
+PRIMES = [1009, 10007, 100003, 1000003]
+
+
+def order_by_addition(E, P):
+    # Orden de P sumando P hasta llegar al punto al infinito (O(ord P) sumas)
+    k, R = 1, P
+    while R is not None:
+        R = E.add(R, P)
+        k += 1
+    return k
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estructura de E(F_p) y órdenes de todos los puntos")
+    parser.add_argument("-a", type=int, default=-1)
+    parser.add_argument("-b", type=int, default=1)
+    parser.add_argument("--muestra", type=int, default=20,
+                        help="puntos a los que se calcula el orden por sumas repetidas")
+    args = parser.parse_args()
+
+    print(f"{'p':>8} {'|E|':>8} {'estructura':>18} {'grupo (s)':>10} {'órdenes (s)':>12} "
+          f"{'sumas/punto (s)':>16}")
+    for p in PRIMES:
+        E = CurvaEliptica(args.a, args.b, p)
+        n = count_points_fp(args.a, args.b, p)
+        t0 = time.perf_counter()
+        group = group_structure(E, n, factorize(n))
+        t_group = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        xs, ys, orders = point_orders_fp(args.a, args.b, p, group)
+        t_orders = time.perf_counter() - t0
+        assert len(xs) + 1 == n
+        sample = range(0, len(xs), max(1, len(xs) // args.muestra))
+        t0 = time.perf_counter()
+        for i in sample:
+            assert order_by_addition(E, (int(xs[i]), int(ys[i]))) == orders[i]
+        t_add = (time.perf_counter() - t0) / len(sample)
+        shape = f"Z/{group['n1']}" + (f" × Z/{group['n2']}" if group["n2"] > 1 else "")
+        print(f"{p:>8} {n:>8} {shape:>18} {t_group:>10.3f} {t_orders:>12.3f} {t_add:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_multiescalar.py
+# Rendimiento por punto de Σ k_i·P_i (multiescalar.multi_scalar_mul) al crecer
+# el lote de 2 a 10^5 puntos, contra sumar multiplicaciones escalares separadas.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_multiescalar
+#     python -m benchmarks.bench_multiescalar --curva P-256 --tamanos 2 16 128 1024
+import argparse
+import random
+import time
+
+from curva_eliptica import CurvaEliptica
+from curvas_estandar import CURVAS_ESTANDAR
+from multiescalar import UMBRAL_PIPPENGER, multi_scalar_mul, pippenger_window
+
+TAMANOS = [2, 8, 32, 128, 512, 2048, 8192, 32768, 100000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Σ k_i·P_i: Straus/Pippenger vs multiplicaciones separadas")
+    parser.add_argument("--curva", choices=list(CURVAS_ESTANDAR), default="secp256k1")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS)
+    parser.add_argument("--muestra-separada", type=int, default=64,
+                        help="puntos usados para estimar el costo por punto de la ruta separada")
+    args = parser.parse_args()
+
+    c = CURVAS_ESTANDAR[args.curva]
+    E = CurvaEliptica(c["a"], c["b"], c["p"])
+    rng = random.Random(0)
+    n_max = max(args.tamanos)
+    scalars = [rng.randrange(1, c["n"]) for _ in range(n_max)]
+    points = [E.random_point(rng) for _ in range(n_max)]
+
+    # Costo por punto de k·P separado (independiente del tamaño del lote)
+    m = args.muestra_separada
+    t0 = time.perf_counter()
+    expected = None
+    for k, P in zip(scalars[:m], points[:m]):
+        expected = E.add(expected, E.mul(k, P))
+    per_point_sep = (time.perf_counter() - t0) / m
+    assert multi_scalar_mul(E, scalars[:m], points[:m]) == expected
+
+    print(f"{args.curva}: k·P separado {per_point_sep * 1e3:.3f} ms/punto")
+    print(f"{'n':>7} {'método':>16} {'ms/punto':>9} {'puntos/s':>9} {'speedup':>8}")
+    for n in args.tamanos:
+        t0 = time.perf_counter()
+        multi_scalar_mul(E, scalars[:n], points[:n])
+        per_point = (time.perf_counter() - t0) / n
+        method = "Straus" if n < UMBRAL_PIPPENGER else f"Pippenger c={pippenger_window(n)}"
+        print(f"{n:>7} {method:>16} {per_point * 1e3:>9.3f} {1 / per_point:>9.0f} "
+              f"{per_point_sep / per_point:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_paralelo.py
+# Escalamiento de paralelo_fp: conteo y enumeración de E(F_p) con 1, 2, 4 y 8
+# procesos para p cercano a 10^8 (speedup respecto a un proceso). El grupo
+# compartido tiene os.cpu_count() procesos: pedir más no agrega paralelismo.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_paralelo
+#     python -m benchmarks.bench_paralelo --p 100000007 --procesos 1 2 4 8 --sin-enumerar
+import argparse
+import time
+
+import numpy as np
+
+from paralelo_fp import count_points_parallel, enumerate_points_parallel, get_pool
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumeración/conteo de E(F_p) en varios procesos")
+    parser.add_argument("-a", type=int, default=-1)
+    parser.add_argument("-b", type=int, default=1)
+    parser.add_argument("--p", type=int, default=100_000_007, help="primo (p ≡ 3 mod 4 por defecto)")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--sin-enumerar", action="store_true",
+                        help="sólo conteo (la enumeración de p ~ 10^8 ocupa ~1.6 GB)")
+    args = parser.parse_args()
+
+    get_pool()  # el arranque de los procesos no entra en la medición
+    tasks = [("conteo", count_points_parallel)]
+    if not args.sin_enumerar:
+        tasks.append(("enumeración", enumerate_points_parallel))
+    print(f"p = {args.p}")
+    print(f"{'tarea':>12} {'procesos':>9} {'tiempo (s)':>11} {'speedup':>8}")
+    for label, fn in tasks:
+        base = ref = None
+        for workers in args.procesos:
+            out, t = timed(fn, args.a, args.b, args.p, workers)
+            n = out if label == "conteo" else len(out[0]) + 1
+            if ref is None:
+                base, ref = t, (n, out)
+            else:
+                assert n == ref[0]
+                if label == "enumeración":
+                    assert np.array_equal(out[0], ref[1][0]) and np.array_equal(out[1], ref[1][1])
+            print(f"{label:>12} {workers:>9} {t:>11.2f} {base / t:>7.2f}x")
+            del out
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_primalidad.py
+# Compara el is_probable_prime original de las apps (Miller-Rabin con 7 testigos
+# aleatorios) con primalidad.is_probable_prime (criba + testigos deterministas /
+# Baillie-PSW) sobre enteros aleatorios de 64 y 256 bits, y sobre primos.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_primalidad
+#     python -m benchmarks.bench_primalidad --n 10000 --bits 64 128 256 512
+import argparse
+import random
+import time
+
+from primalidad import is_probable_prime, next_prime
+
+
+def is_probable_prime_original(n, k=7):
+    # Implementación original de Curvas_en_Fp.is_probable_prime
+    if n < 2:
+        return False
+    small_primes = [2,3,5,7,11,13,17,19,23,29]
+    for p in small_primes:
+        if n % p == 0:
+            return n == p
+    s = 0
+    d = n - 1
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(k):
+        a = random.randrange(2, n-1)
+        x = pow(a, d, n)
+        if x == 1 or x == n-1:
+            continue
+        composite = True
+        for _ in range(s-1):
+            x = (x*x) % n
+            if x == n-1:
+                composite = False
+                break
+        if composite:
+            return False
+    return True
+
+
+def timed(fn, values):
+    t0 = time.perf_counter()
+    out = [fn(n) for n in values]
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primalidad: Miller-Rabin aleatorio vs criba + BPSW")
+    parser.add_argument("--n", type=int, default=100_000, help="enteros aleatorios por tamaño")
+    parser.add_argument("--primos", type=int, default=1000, help="primos por tamaño (peor caso)")
+    parser.add_argument("--bits", type=int, nargs="+", default=[64, 256])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # la versión nueva se mide sin caché: cada entrada es distinta de todos modos
+    new = is_probable_prime.__wrapped__
+    print(f"{'bits':>5} {'entrada':>10} {'cantidad':>9} {'original (s)':>13} {'nuevo (s)':>10} {'speedup':>8}")
+    for bits in args.bits:
+        randoms = [rng.getrandbits(bits) | (1 << (bits - 1)) for _ in range(args.n)]
+        primes = [next_prime(rng.getrandbits(bits) | (1 << (bits - 1))) for _ in range(args.primos)]
+        for label, values in (("aleatorio", randoms), ("primo", primes)):
+            got_old, t_old = timed(is_probable_prime_original, values)
+            got_new, t_new = timed(new, values)
+            assert got_old == got_new
+            print(f"{bits:>5} {label:>10} {len(values):>9} {t_old:>13.3f} {t_new:>10.3f} "
+                  f"{t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
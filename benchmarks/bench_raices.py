@@ -0,0 +1,100 @@
+# bench_raices.py
+# Raíces cuadradas mod p en el peor caso de Tonelli-Shanks: p ≡ 1 (mod 2^s) con s
+# grande. Compara la función original (recalcula q, s, z en cada llamada) con
+# RaizCuadradaFp (constantes precalculadas) en sus métodos Tonelli-Shanks y
+# Cipolla; la columna "auto" es el método que elige RaizCuadradaFp por defecto.
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_raices
+#     python -m benchmarks.bench_raices --bits 64 256 --s 4 16 32 48 --n 2000
+import argparse
+import random
+import time
+
+from aritmetica_fp import RaizCuadradaFp
+from primalidad import is_probable_prime
+
+
+def tonelli_shanks_original(n, p):
+    # Implementación original de aritmetica_fp.tonelli_shanks
+    n %= p
+    if n == 0:
+        return 0
+    if pow(n, (p-1)//2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(n, (p+1)//4, p)
+    s = 0
+    q = p-1
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p-1)//2, p) != p-1:
+        z += 1
+    m = s
+    c = pow(z, q, p)
+    t = pow(n, q, p)
+    r = pow(n, (q+1)//2, p)
+    while True:
+        if t == 1:
+            return r
+        i = 1
+        t2i = (t * t) % p
+        while i < m:
+            if t2i == 1:
+                break
+            t2i = (t2i * t2i) % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m = i
+        c = (b * b) % p
+        t = (t * c) % p
+        r = (r * b) % p
+
+
+def prime_with_2adic(bits, s, rng):
+    """Primo p de ~bits bits con p - 1 = q·2^s exactamente (q impar)."""
+    while True:
+        q = rng.getrandbits(bits - s) | 1 | (1 << (bits - s - 1))
+        p = (q << s) + 1
+        if is_probable_prime(p):
+            return p
+
+
+def timed(fn, values):
+    t0 = time.perf_counter()
+    out = fn(values)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sqrt mod p: original vs Tonelli-Shanks/Cipolla precalculados")
+    parser.add_argument("--bits", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--s", type=int, nargs="+", default=[4, 8, 16, 24, 32, 48, 64, 96])
+    parser.add_argument("--n", type=int, default=2000, help="raíces por primo")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'bits':>5} {'s':>4} {'original µs':>12} {'tonelli µs':>11} {'cipolla µs':>11} "
+          f"{'auto':>8} {'speedup auto':>13}")
+    for bits in args.bits:
+        for s in args.s:
+            if s >= bits - 2:
+                continue
+            p = prime_with_2adic(bits, s, rng)
+            # sólo residuos: es el caso en que Tonelli-Shanks hace el bucle completo
+            values = [rng.randrange(1, p) ** 2 % p for _ in range(args.n)]
+            expected, t_orig = timed(lambda vs: [tonelli_shanks_original(v, p) for v in vs], values)
+            times = {}
+            for method in ("tonelli", "cipolla"):
+                roots, times[method] = timed(RaizCuadradaFp(p, method).sqrt_many, values)
+                assert all(r * r % p == v for r, v in zip(roots, values))
+            auto = RaizCuadradaFp(p).method
+            us = lambda t: 1e6 * t / len(values)
+            print(f"{bits:>5} {s:>4} {us(t_orig):>12.1f} {us(times['tonelli']):>11.1f} "
+                  f"{us(times['cipolla']):>11.1f} {auto:>8} {t_orig / times[auto]:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
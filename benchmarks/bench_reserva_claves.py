@@ -0,0 +1,51 @@
+# bench_reserva_claves.py
+# Latencia de obtener un par RSA-2048 al crear una cuenta: generándolo en el momento
+# (flujo anterior) contra tomarlo de reserva_claves.ReservaClaves.
+# Las altas llegan cada --intervalo-ms; con ráfagas más rápidas que la generación la
+# reserva se vacía y las altas vuelven a pagar la generación (se cuentan como fallos).
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_reserva_claves
+#     python -m benchmarks.bench_reserva_claves --altas 50 --intervalo-ms 50 --minimo 4 --maximo 16
+import argparse
+import time
+
+from reserva_claves import MAXIMO_RESERVA, MINIMO_RESERVA, ReservaClaves, generate_rsa_key
+
+
+def latencies(take, n, interval):
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        take()
+        out.append(1000 * (time.perf_counter() - t0))
+        time.sleep(interval)
+    return sorted(out)
+
+def summary(ms):
+    return ms[len(ms) // 2], ms[int(0.95 * (len(ms) - 1))], ms[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reserva de claves RSA generadas de antemano")
+    parser.add_argument("--altas", type=int, default=30)
+    parser.add_argument("--intervalo-ms", type=float, default=300)
+    parser.add_argument("--minimo", type=int, default=MINIMO_RESERVA)
+    parser.add_argument("--maximo", type=int, default=MAXIMO_RESERVA)
+    args = parser.parse_args()
+    interval = args.intervalo_ms / 1000
+
+    print(f"{args.altas} altas cada {args.intervalo_ms:g} ms; reserva {args.minimo}-{args.maximo}")
+    print(f"{'modo':>12} {'p50 (ms)':>9} {'p95 (ms)':>9} {'máx (ms)':>9}")
+    print(f"{'en el momento':>12} " + " ".join(f"{v:>9.2f}" for v in summary(latencies(generate_rsa_key, args.altas, interval))))
+
+    pool = ReservaClaves(low=args.minimo, high=args.maximo)
+    pool.start()
+    while pool.stats()["depth"] < args.maximo:   # la reserva arranca llena
+        time.sleep(0.05)
+    print(f"{'reserva':>12} " + " ".join(f"{v:>9.2f}" for v in summary(latencies(pool.take, args.altas, interval))))
+    print("métricas:", {k: round(v, 1) if isinstance(v, float) else v for k, v in pool.stats().items()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# bench_schoof.py
+# Comprobación cruzada de schoof.count_points_schoof contra count_points_legendre
+# (conteo directo) en primos pequeños, incluidas las curvas y^2 = x^3 + a x (b = 0),
+# cuyos grupos suelen ser Z/n1 × Z/n2 con n2 grande: ahí dos candidatos del BSGS
+# final pueden diferir en un múltiplo del exponente del grupo y hace falta la
+# torsión cuadrática para decidir. --bsgs-max 1 obliga a procesar primos l hasta
+# dejar un solo candidato (sin BSGS).
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_schoof
+#     python -m benchmarks.bench_schoof --primos 300 --bsgs-max 1
+import argparse
+import random
+import time
+
+from conteo_fp import count_points_legendre
+from curva_eliptica import discriminant_mod_p
+from primalidad import next_prime
+from schoof import SCHOOF_BSGS_MAX, count_points_schoof
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Schoof contra conteo directo en primos pequeños")
+    parser.add_argument("--primos", type=int, default=150, help="cantidad de primos desde 5")
+    parser.add_argument("--curvas", type=int, default=6, help="curvas aleatorias por primo (además de b = 0)")
+    parser.add_argument("--bsgs-max", type=int, default=SCHOOF_BSGS_MAX)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    checked = 0
+    t_schoof = 0.0
+    p = 5
+    for _ in range(args.primos):
+        curves = [(a, 0) for a in (1, 2, 3, -1, rng.randrange(p))]
+        curves += [(rng.randrange(p), rng.randrange(p)) for _ in range(args.curvas)]
+        for a, b in curves:
+            if discriminant_mod_p(a, b, p) == 0:
+                continue
+            t0 = time.perf_counter()
+            n_schoof = count_points_schoof(a, b, p, bsgs_max=args.bsgs_max)
+            t_schoof += time.perf_counter() - t0
+            n_direct = count_points_legendre(a, b, p)
+            assert n_schoof == n_direct, f"y^2 = x^3 + {a}x + {b} mod {p}: Schoof {n_schoof}, directo {n_direct}"
+            checked += 1
+        last = p
+        p = next_prime(p)
+    print(f"{checked} curvas con p en [5, {last}] coinciden; Schoof {1000 * t_schoof / checked:.2f} ms/curva")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_usuarios_s3.py
+# Latencia de inicio de sesión y de alta de usuario con el flujo anterior
+# (descargar users.csv con pandas, filtrar con una máscara y reescribirlo en cada
+# alta) contra usuarios_s3.AlmacenUsuarios, con 10^3 a 10^5 usuarios en un S3
+# local simulado con moto (pip install "moto[s3]").
+#
+# Uso (desde la raíz del repositorio):
+#     python -m benchmarks.bench_usuarios_s3
+#     python -m benchmarks.bench_usuarios_s3 --usuarios 1000 100000 --repeticiones 50
+import argparse
+import hashlib
+import io
+import statistics
+import time
+
+import boto3
+import pandas as pd
+from moto import mock_aws
+
+from usuarios_s3 import COLUMNAS_USUARIOS, AlmacenUsuarios
+
+BUCKET = "bench-usuarios"
+BASE_KEY = "credentials/users.csv"
+
+
+def row(i):
+    return [f"usuario{i}", hashlib.sha256(str(i).encode()).hexdigest(),
+            f"keys/private_key_usuario{i}.pem", f"keys/public_key_usuario{i}.pem"]
+
+def old_login(s3, username, password_hash):
+    users = pd.read_csv(io.BytesIO(s3.get_object(Bucket=BUCKET, Key=BASE_KEY)['Body'].read()))
+    return not users[(users['username'] == username) & (users['password_hash'] == password_hash)].empty
+
+def old_create(s3, new_row):
+    users = pd.read_csv(io.BytesIO(s3.get_object(Bucket=BUCKET, Key=BASE_KEY)['Body'].read()))
+    if new_row[0] in users['username'].values:
+        return False
+    users = pd.concat([users, pd.DataFrame([new_row], columns=COLUMNAS_USUARIOS)], ignore_index=True)
+    buffer = io.StringIO()
+    users.to_csv(buffer, index=False)
+    s3.put_object(Bucket=BUCKET, Key=BASE_KEY, Body=buffer.getvalue())
+    return True
+
+def median_ms(fn, args_list):
+    times = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    return 1000 * statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inicio de sesión/alta con y sin índice de usuarios")
+    parser.add_argument("--usuarios", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'usuarios':>9} {'modo':>22} {'login (ms)':>11} {'alta (ms)':>10}")
+    for n in args.usuarios:
+        with mock_aws():
+            s3 = boto3.client("s3", region_name="us-east-1")
+            s3.create_bucket(Bucket=BUCKET)
+            s3.put_object(Bucket=BUCKET, Key=BASE_KEY,
+                          Body=pd.DataFrame([row(i) for i in range(n)], columns=COLUMNAS_USUARIOS).to_csv(index=False))
+            reps = args.repeticiones
+            logins = [(s3, f"usuario{i}", row(i)[1]) for i in range(0, n, max(1, n // reps))][:reps]
+            login = median_ms(old_login, logins)
+            create = median_ms(old_create, [(s3, row(n + i)) for i in range(reps)])
+            print(f"{n:>9} {'CSV completo (pandas)':>22} {login:>11.2f} {create:>10.2f}")
+
+            for label, ttl in (("índice, TTL 30 s", 30), ("índice, revalida siempre", 0)):
+                store = AlmacenUsuarios(lambda: s3, BUCKET, BASE_KEY, ttl=ttl)
+                t0 = time.perf_counter()
+                store.refresh()
+                cold = 1000 * (time.perf_counter() - t0)
+                login = median_ms(lambda u, h: store.get(u)['password_hash'] == h, [a[1:] for a in logins])
+                offset = n + reps + (0 if ttl else reps)
+                create = median_ms(lambda r: store.add(*r), [(row(offset + i),) for i in range(reps)])
+                print(f"{n:>9} {label:>22} {login:>11.2f} {create:>10.2f}   (carga inicial {cold:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
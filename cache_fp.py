@@ -0,0 +1,149 @@
+# cache_fp.py
+# Caché LRU con presupuesto de memoria para los cálculos de las apps de curvas.
+# Streamlit vuelve a ejecutar el script completo en cada interacción (marcar una
+# casilla, mover un slider), pero los módulos importados se conservan entre
+# ejecuciones; este caché vive en el módulo, así que un cambio de widget que no
+# toca (a, b, p) ya no repite los cálculos O(p).
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+# Presupuesto por defecto del caché de curvas, en bytes
+PRESUPUESTO_CACHE = 256 << 20
+
+# Elementos de una lista o tupla que se miden para estimar su tamaño
+MUESTRA_TAMANO = 64
+
+
+def size_of(value):
+    """Memoria aproximada de un resultado (arreglos NumPy, tuplas, listas, dicts)."""
+    if isinstance(value, np.ndarray):
+        # getsizeof ya incluye los datos sólo si el arreglo es dueño de ellos
+        return sys.getsizeof(value) + (0 if value.flags.owndata else value.nbytes)
+    if isinstance(value, (tuple, list)):
+        # listas largas (p. ej. de tuplas (x, y)): se extrapola de una muestra
+        sample = value[:MUESTRA_TAMANO]
+        items = sum(size_of(v) for v in sample)
+        return sys.getsizeof(value) + (items * len(value) // len(sample) if sample else 0)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(size_of(k) + size_of(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+def _freeze(value):
+    # Los arreglos guardados se comparten entre ejecuciones: sólo lectura
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    return value
+
+
+class CacheLRU:
+    """Diccionario LRU acotado por memoria (bytes estimados con size_of).
+       Un resultado más grande que todo el presupuesto se devuelve sin guardarse."""
+
+    def __init__(self, max_bytes=PRESUPUESTO_CACHE):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()   # clave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(self, key, compute):
+        """Valor guardado para key, o compute() (que se guarda si cabe)."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+        # se calcula fuera del candado: otra sesión puede usar el caché mientras tanto
+        value = _freeze(compute())
+        size = size_of(value)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._data:
+                self._data[key] = (value, size)
+                self.bytes += size
+                self._evict()
+        return value
+
+    def _evict(self):
+        while self.bytes > self.max_bytes:
+            _, (_, size) = self._data.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def set_budget(self, max_bytes):
+        """Cambia el presupuesto y expulsa lo menos usado si ya no cabe."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                    entries=len(self._data), bytes=self.bytes, max_bytes=self.max_bytes)
+
+
+# Caché compartido por las apps (un solo presupuesto para todos los cálculos)
+CACHE_CURVAS = CacheLRU()
+
+
+def curve_key(a, b, p):
+    """Clave canónica de la curva: (a mod p, b mod p, p)."""
+    return a % p, b % p, p
+
+def _key_prefix(fn):
+    """(módulo, archivo, nombre) de fn: las páginas de Streamlit se ejecutan todas como
+       __main__, así que el módulo no basta para distinguir dos funciones homónimas."""
+    code = getattr(fn, "__code__", None)
+    return fn.__module__, code.co_filename if code else None, fn.__qualname__
+
+def _arguments_key(sig, args, kwargs, ignore):
+    """Argumentos de la llamada con los valores por defecto aplicados, en orden de la
+       firma y sin los de ignore: f(a, b, p, 10) y f(a, b, p, max_points=10) comparten entrada."""
+    bound = sig.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple((name, value) for name, value in bound.arguments.items() if name not in ignore)
+
+def memoize(fn=None, cache=CACHE_CURVAS, ignore=()):
+    """Decorador: guarda fn(*args, **kwargs) en el caché con clave (módulo, archivo,
+       nombre, argumentos). ignore nombra los argumentos que no cambian el resultado
+       (p. ej. progress o workers) y se dejan fuera de la clave."""
+    if fn is None:
+        return lambda f: memoize(f, cache, ignore)
+    prefix, sig = _key_prefix(fn), inspect.signature(fn)
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (*prefix, *_arguments_key(sig, args, kwargs, ignore))
+        return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+    return wrapper
+
+def memoize_curve(fn=None, cache=CACHE_CURVAS, ignore=()):
+    """Como memoize para fn(a, b, p, ...), con (a, b, p) reducidos por curve_key:
+       (a, b, p) y (a + p, b, p) comparten entrada."""
+    if fn is None:
+        return lambda f: memoize_curve(f, cache, ignore)
+    prefix, sig = _key_prefix(fn), inspect.signature(fn)
+    curve_args = tuple(sig.parameters)[:3]
+    @wraps(fn)
+    def wrapper(a, b, p, *args, **kwargs):
+        rest = _arguments_key(sig, (a, b, p, *args), kwargs, (*curve_args, *ignore))
+        key = (*prefix, *curve_key(a, b, p), *rest)
+        return cache.get_or_compute(key, lambda: fn(a % p, b % p, p, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,106 @@
+# claves_s3.py
+# Caché en el proceso de las claves PEM guardadas en S3, ya cargadas como objetos.
+# Sin caché, cada firma/verificación hace un get_object (ida y vuelta a S3) y vuelve
+# a interpretar el PEM/ASN.1. Aquí cada ruta guarda (ETag, clave cargada, hora):
+#  - dentro del TTL la clave se usa directamente (ninguna llamada a S3);
+#  - pasado el TTL se revalida con un GET condicional (IfNoneMatch=ETag): si S3
+#    responde 304 la clave sigue siendo la misma y no se descarga ni se interpreta;
+#  - si el ETag cambió (clave rotada) se descarga y se interpreta la nueva.
+# invalidate(ruta) se llama al escribir una clave nueva (rotación o cuenta nueva).
+# Igual que cache_fp, vive en el módulo y se conserva entre ejecuciones de Streamlit.
+import threading
+import time
+from collections import OrderedDict
+
+from botocore.exceptions import ClientError
+from cryptography.hazmat.primitives import serialization
+
+# Segundos durante los que una clave se usa sin consultar a S3
+TTL_CLAVES = 300
+
+# Claves guardadas como máximo (LRU)
+MAX_CLAVES = 256
+
+
+def _load_pem(pem, private):
+    if private:
+        return serialization.load_pem_private_key(pem, password=None)
+    return serialization.load_pem_public_key(pem)
+
+
+class CacheClaves:
+    """Claves de S3 cargadas, por (ruta, privada), con TTL, revalidación por ETag y LRU.
+       get_client() devuelve el cliente de S3 (se pide sólo cuando hay que consultar)."""
+
+    def __init__(self, get_client, bucket, ttl=TTL_CLAVES, max_keys=MAX_CLAVES, clock=time.monotonic):
+        self.get_client = get_client
+        self.bucket = bucket
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.clock = clock
+        self._data = OrderedDict()   # (ruta, privada) -> (etag, clave, hora)
+        self._lock = threading.Lock()
+        self.hits = self.revalidations = self.loads = self.evictions = 0
+
+    def _fetch(self, path, private, etag=None):
+        # get_object (condicional si hay etag); None si S3 responde 304
+        kwargs = dict(Bucket=self.bucket, Key=path)
+        if etag:
+            kwargs["IfNoneMatch"] = etag
+        try:
+            obj = self.get_client().get_object(**kwargs)
+        except ClientError as e:
+            if etag and e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                return None
+            raise
+        return obj["ETag"], _load_pem(obj["Body"].read(), private)
+
+    def get(self, path, private=False):
+        """Clave (objeto de cryptography) guardada en path."""
+        key = (path, private)
+        now = self.clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and now - entry[2] < self.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        # la consulta a S3 va fuera del candado
+        fetched = self._fetch(path, private, entry[0] if entry else None)
+        with self._lock:
+            if fetched is None:
+                self.revalidations += 1
+                etag, value = entry[0], entry[1]
+            else:
+                self.loads += 1
+                etag, value = fetched
+            self._data[key] = (etag, value, now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get_private_key(self, path):
+        return self.get(path, private=True)
+
+    def get_public_key(self, path):
+        return self.get(path, private=False)
+
+    def invalidate(self, path):
+        """Olvida la clave de path (pública y privada); la siguiente lectura la descarga."""
+        with self._lock:
+            self._data.pop((path, True), None)
+            self._data.pop((path, False), None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """hits: sin llamada a S3; revalidations: GET condicional con 304 (sin descargar
+           ni interpretar); loads: descarga e interpretación del PEM."""
+        return dict(hits=self.hits, revalidations=self.revalidations, loads=self.loads,
+                    evictions=self.evictions, entries=len(self._data),
+                    round_trips=self.revalidations + self.loads,
+                    round_trips_saved=self.hits)
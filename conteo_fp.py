@@ -0,0 +1,161 @@
+# conteo_fp.py
+# Conteo de |E(F_p)| sin construir la lista de puntos.
+#  - p pequeño/mediano: |E| = p + 1 + Σ_x χ(x^3 + a x + b), sumando símbolos
+#    de Legendre χ por bloques vectorizados (NumPy).
+#  - p grande: paso de bebé / paso de gigante (BSGS) en el intervalo de Hasse,
+#    alternando puntos de E y de su torsión cuadrática (método de Mestre).
+#  - p de tamaño criptográfico: algoritmo de Schoof (schoof.py), salvo curvas
+#    estándar cuyo orden publicado se comprueba directamente.
+import random
+from math import isqrt, lcm
+
+import numpy as np
+
+from curva_eliptica import CurvaEliptica, affine_add
+from curvas_estandar import CURVAS_ESTANDAR, find_standard_curve
+from enumeracion_fp import UMBRAL_TABLA, P_MAX_INT64, rhs_mod_p, _pow_vec
+from grupo_fp import point_order
+
+# Por encima de este p se usa BSGS/Mestre en lugar de sumar p símbolos de Legendre.
+UMBRAL_BSGS = 1 << 20
+
+# Por encima de este p BSGS (O(p^(1/4)) operaciones) deja de ser práctico: Schoof.
+UMBRAL_SCHOOF = 1 << 64
+
+# Tamaño de bloque para la suma de símbolos de Legendre
+BLOQUE_LEGENDRE = 1 << 20
+
+
+# ---------------------------
+# Suma de símbolos de Legendre por bloques
+# ---------------------------
+def legendre_table(p):
+    """Tabla chi[r] = símbolo de Legendre (r/p) como int8 (p bytes)."""
+    chi = np.full(p, -1, dtype=np.int8)
+    ys = np.arange(p // 2 + 1, dtype=np.int64)
+    chi[ys * ys % p] = 1
+    chi[0] = 0
+    return chi
+
+def legendre_sum(a, b, p, x0=0, x1=None, bloque=BLOQUE_LEGENDRE, chi=None):
+    """Σ χ(x^3+ax+b) para x0 <= x < x1 (por defecto x1 = p), en bloques de x.
+       chi = legendre_table(p) es opcional; sin ella se usa el criterio de Euler."""
+    x1 = p if x1 is None else x1
+    total = 0
+    for lo in range(x0, x1, bloque):
+        xs = np.arange(lo, min(lo + bloque, x1), dtype=np.int64)
+        r = rhs_mod_p(xs, a, b, p)
+        if chi is not None:
+            total += int(chi[r].sum(dtype=np.int64))
+        else:
+            # Criterio de Euler: r^((p-1)/2) ∈ {0, 1, p-1}
+            e = _pow_vec(r, (p-1)//2, p)
+            total += int(np.count_nonzero(e == 1)) - int(np.count_nonzero(e == p-1))
+    return total
+
+def count_points_legendre(a, b, p, bloque=BLOQUE_LEGENDRE, umbral_tabla=UMBRAL_TABLA):
+    """|E(F_p)| (incluye infinito) sumando χ(x^3+ax+b) en bloques de x."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    chi = legendre_table(p) if p < umbral_tabla else None
+    return p + 1 + legendre_sum(a, b, p, bloque=bloque, chi=chi)
+
+
+# ---------------------------
+# BSGS / Mestre
+# ---------------------------
+def hasse_interval(p):
+    """Intervalo [p+1-2√p, p+1+2√p] en enteros."""
+    w = isqrt(4 * p)
+    return p + 1 - w, p + 1 + w
+
+def _order_in_interval(E, P, lo, hi):
+    # Orden exacto de P, sabiendo que algún m en [lo, hi] anula a P.
+    a, p = E.a, E.p
+    s = isqrt(hi - lo) + 1
+    baby = {}
+    R = None
+    for i in range(s):
+        baby.setdefault(R, i)
+        R = affine_add(R, P, a, p)
+    step = E.mul(s, P)
+    Q = E.mul(lo, P)
+    m = None
+    for k in range(s + 1):
+        neg = None if Q is None else (Q[0], (-Q[1]) % p)
+        if neg in baby:
+            m = lo + k * s + baby[neg]
+            break
+        Q = affine_add(Q, step, a, p)
+    if m is None:
+        raise ArithmeticError("BSGS no encontró un múltiplo en el intervalo de Hasse (¿curva singular?).")
+    # m es múltiplo del orden: quitar factores primos mientras se anule
+    return point_order(E, P, m)
+
+def count_points_bsgs(a, b, p, seed=0, max_points=64):
+    """|E(F_p)| para p grande con BSGS en el intervalo de Hasse (Mestre)."""
+    a, b = a % p, b % p
+    rng = random.Random(seed)
+    lo, hi = hasse_interval(p)
+    # Torsión cuadrática E': y^2 = x^3 + a d^2 x + b d^3 con d no residuo;
+    # |E'| = 2p + 2 - |E| y su intervalo de Hasse es el mismo.
+    d = 2
+    while pow(d, (p-1)//2, p) != p-1:
+        d += 1
+    twists = [CurvaEliptica(a, b, p), CurvaEliptica(a * d * d, b * d * d * d, p)]
+    orders = [1, 1]
+    for it in range(max_points):
+        side = it % 2
+        E = twists[side]
+        P = E.random_point(rng)
+        orders[side] = lcm(orders[side], _order_in_interval(E, P, lo, hi))
+        LE, LT = orders
+        # candidatos N con LE | N y LT | 2p+2-N dentro de [lo, hi]
+        if LE >= LT:
+            cands = range(-(-lo // LE) * LE, hi + 1, LE)
+            if len(cands) > 1024:
+                continue
+            cands = [N for N in cands if (2*p + 2 - N) % LT == 0]
+        else:
+            cands = range(-(-lo // LT) * LT, hi + 1, LT)
+            if len(cands) > 1024:
+                continue
+            cands = [2*p + 2 - M for M in cands if (2*p + 2 - M) % LE == 0]
+        if len(cands) == 1:
+            return cands[0]
+    raise ArithmeticError(f"No se pudo aislar |E(F_p)| tras {max_points} puntos.")
+
+
+# ---------------------------
+# API de conteo
+# ---------------------------
+def standard_curve_order(a, b, p):
+    """|E(F_p)| = n·h de una curva estándar, comprobado con N·P = O para un punto
+       aleatorio P; None si (a, b, p) no es una curva conocida."""
+    name = find_standard_curve(a, b, p)
+    if name is None:
+        return None
+    c = CURVAS_ESTANDAR[name]
+    n_points = c["n"] * c["h"]
+    E = CurvaEliptica(a, b, p)
+    if hasse_check(n_points, p) and E.mul(n_points, E.random_point(random.Random(0))) is None:
+        return n_points
+    return None
+
+def count_points_fp(a, b, p, progress=None):
+    """|E(F_p)| (incluye el punto al infinito) eligiendo el método según p.
+       progress(l, M) se pasa a Schoof para informar el avance."""
+    if p <= UMBRAL_BSGS:
+        return count_points_legendre(a, b, p)
+    if p <= UMBRAL_SCHOOF:
+        return count_points_bsgs(a, b, p)
+    n_points = standard_curve_order(a, b, p)
+    if n_points is not None:
+        return n_points
+    from schoof import count_points_schoof  # schoof importa este módulo
+    return count_points_schoof(a, b, p, progress=progress)
+
+def hasse_check(n_points, p):
+    """True si n_points cumple la cota de Hasse |p + 1 - N| ≤ 2√p."""
+    t = p + 1 - n_points
+    return t * t <= 4 * p
@@ -0,0 +1,239 @@
+# curva_eliptica.py
+# Aritmética de puntos en E: y^2 = x^3 + a x + b sobre F_p.
+# Los puntos afines son tuplas (x, y) y None es el punto al infinito.
+# La multiplicación escalar trabaja en coordenadas jacobianas
+# (x = X/Z^2, y = Y/Z^3), así que el bucle interno no hace inversiones modulares.
+import random
+
+from aritmetica_fp import tonelli_shanks
+
+# Punto al infinito en coordenadas jacobianas
+JACOBIAN_INFINITY = (1, 1, 0)
+
+
+def discriminant_mod_p(a, b, p):
+    # Δ = -16(4a^3 + 27 b^2)
+    val = (-16 * (4 * pow(a, 3, p) + 27 * pow(b, 2, p))) % p
+    return val
+
+
+# ---------------------------
+# Aritmética afín (una inversión por operación)
+# ---------------------------
+def affine_add(P, Q, a, p):
+    if P is None:
+        return Q
+    if Q is None:
+        return P
+    x1, y1 = P
+    x2, y2 = Q
+    if x1 == x2:
+        if (y1 + y2) % p == 0:
+            return None
+        lam = (3 * x1 * x1 + a) * pow(2 * y1, -1, p) % p
+    else:
+        lam = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    x3 = (lam * lam - x1 - x2) % p
+    return x3, (lam * (x1 - x3) - y1) % p
+
+def affine_mul(k, P, a, p):
+    """k·P con doble-y-suma afín (referencia simple, k >= 0)."""
+    R = None
+    while k:
+        if k & 1:
+            R = affine_add(R, P, a, p)
+        P = affine_add(P, P, a, p)
+        k >>= 1
+    return R
+
+def wnaf(k, w):
+    """Forma no adyacente de ventana w de k >= 0, dígitos del menos al más significativo.
+       Los dígitos no nulos son impares con |d| < 2^(w-1)."""
+    digits = []
+    while k > 0:
+        if k & 1:
+            d = k & ((1 << w) - 1)
+            if d >= 1 << (w - 1):
+                d -= 1 << w
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
+class CurvaEliptica:
+    """Curva y^2 = x^3 + a x + b sobre F_p (p primo, curva no singular)."""
+
+    def __init__(self, a, b, p):
+        if discriminant_mod_p(a, b, p) == 0:
+            raise ValueError("La curva es singular modulo p (discriminante ≡ 0).")
+        self.a, self.b, self.p = a % p, b % p, p
+
+    def __repr__(self):
+        return f"CurvaEliptica(a={self.a}, b={self.b}, p={self.p})"
+
+    # ---------------------------
+    # Puntos afines
+    # ---------------------------
+    def is_on_curve(self, P):
+        if P is None:
+            return True
+        x, y = P
+        return (y * y - (x * x * x + self.a * x + self.b)) % self.p == 0
+
+    def lift_x(self, x):
+        """Punto (x, y) con la menor raíz y, o None si x no está en la curva."""
+        p = self.p
+        x %= p
+        y = tonelli_shanks((x * x * x + self.a * x + self.b) % p, p)
+        if y is None:
+            return None
+        return x, min(y, p - y)
+
+    def random_point(self, rng=random):
+        while True:
+            P = self.lift_x(rng.randrange(self.p))
+            if P is not None:
+                return P if rng.randrange(2) else self.neg(P)
+
+    def neg(self, P):
+        return None if P is None else (P[0], (-P[1]) % self.p)
+
+    def add(self, P, Q):
+        return affine_add(P, Q, self.a, self.p)
+
+    def double(self, P):
+        return affine_add(P, P, self.a, self.p)
+
+    def mul_naive(self, k, P):
+        """k·P con doble-y-suma afín; sirve de referencia para mul."""
+        if k < 0:
+            k, P = -k, self.neg(P)
+        return affine_mul(k, P, self.a, self.p)
+
+    # ---------------------------
+    # Coordenadas jacobianas
+    # ---------------------------
+    def to_jacobian(self, P):
+        return JACOBIAN_INFINITY if P is None else (P[0], P[1], 1)
+
+    def to_affine(self, J):
+        X, Y, Z = J
+        if Z == 0:
+            return None
+        p = self.p
+        zi = pow(Z, -1, p)
+        zi2 = zi * zi % p
+        return X * zi2 % p, Y * zi2 * zi % p
+
+    def batch_to_affine(self, Js):
+        """Convierte varios puntos jacobianos con una sola inversión (truco de Montgomery)."""
+        p = self.p
+        prefix = [1]
+        for _, _, Z in Js:
+            prefix.append(prefix[-1] * (Z if Z else 1) % p)
+        inv = pow(prefix[-1], -1, p)
+        out = [None] * len(Js)
+        for i in range(len(Js) - 1, -1, -1):
+            X, Y, Z = Js[i]
+            if Z == 0:
+                continue
+            zi = inv * prefix[i] % p
+            inv = inv * Z % p
+            zi2 = zi * zi % p
+            out[i] = (X * zi2 % p, Y * zi2 * zi % p)
+        return out
+
+    def jacobian_double(self, J):
+        X, Y, Z = J
+        if Z == 0 or Y == 0:
+            return JACOBIAN_INFINITY
+        p = self.p
+        YY = Y * Y % p
+        S = 4 * X * YY % p
+        ZZ = Z * Z % p
+        M = (3 * X * X + self.a * ZZ * ZZ) % p
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YY * YY) % p
+        return X3, Y3, 2 * Y * Z % p
+
+    def jacobian_add(self, J1, J2):
+        X1, Y1, Z1 = J1
+        X2, Y2, Z2 = J2
+        if Z1 == 0:
+            return J2
+        if Z2 == 0:
+            return J1
+        p = self.p
+        Z1Z1 = Z1 * Z1 % p
+        Z2Z2 = Z2 * Z2 % p
+        U1 = X1 * Z2Z2 % p
+        U2 = X2 * Z1Z1 % p
+        S1 = Y1 * Z2 * Z2Z2 % p
+        S2 = Y2 * Z1 * Z1Z1 % p
+        H = (U2 - U1) % p
+        r = (S2 - S1) % p
+        if H == 0:
+            return self.jacobian_double(J1) if r == 0 else JACOBIAN_INFINITY
+        HH = H * H % p
+        HHH = H * HH % p
+        V = U1 * HH % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - S1 * HHH) % p
+        return X3, Y3, Z1 * Z2 * H % p
+
+    def jacobian_add_affine(self, J, Q):
+        """Suma mixta J + Q con Q afín (Z2 = 1): ahorra varias multiplicaciones."""
+        if Q is None:
+            return J
+        X1, Y1, Z1 = J
+        if Z1 == 0:
+            return Q[0], Q[1], 1
+        p = self.p
+        Z1Z1 = Z1 * Z1 % p
+        U2 = Q[0] * Z1Z1 % p
+        S2 = Q[1] * Z1 * Z1Z1 % p
+        H = (U2 - X1) % p
+        r = (S2 - Y1) % p
+        if H == 0:
+            return self.jacobian_double(J) if r == 0 else JACOBIAN_INFINITY
+        HH = H * H % p
+        HHH = H * HH % p
+        V = X1 * HH % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - Y1 * HHH) % p
+        return X3, Y3, Z1 * H % p
+
+    # ---------------------------
+    # Multiplicación escalar
+    # ---------------------------
+    def odd_multiples(self, P, w):
+        """[P, 3P, 5P, ..., (2^(w-1) - 1)P] en afín, con una sola inversión."""
+        J = self.to_jacobian(P)
+        J2 = self.jacobian_double(J)
+        table = [J]
+        for _ in range((1 << (w - 2)) - 1):
+            table.append(self.jacobian_add(table[-1], J2))
+        return self.batch_to_affine(table)
+
+    def mul_jacobian(self, k, P, w=4):
+        """k·P en coordenadas jacobianas con wNAF de ventana w (sin convertir a afín)."""
+        if k < 0:
+            k, P = -k, self.neg(P)
+        if k == 0 or P is None:
+            return JACOBIAN_INFINITY
+        table = self.odd_multiples(P, w)
+        R = JACOBIAN_INFINITY
+        for d in reversed(wnaf(k, w)):
+            R = self.jacobian_double(R)
+            if d > 0:
+                R = self.jacobian_add_affine(R, table[d >> 1])
+            elif d < 0:
+                R = self.jacobian_add_affine(R, self.neg(table[(-d) >> 1]))
+        return R
+
+    def mul(self, k, P, w=4):
+        """k·P (wNAF en jacobianas y una inversión final)."""
+        return self.to_affine(self.mul_jacobian(k, P, w))
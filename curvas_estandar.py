@@ -0,0 +1,32 @@
+# curvas_estandar.py
+# Parámetros de curvas estándar y^2 = x^3 + a x + b sobre F_p (SEC 2 / FIPS 186-4).
+# n es el orden del generador G y h el cofactor, así que |E(F_p)| = n * h.
+
+CURVAS_ESTANDAR = {
+    "P-256": dict(
+        p=0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff,
+        a=0xffffffff00000001000000000000000000000000fffffffffffffffffffffffc,
+        b=0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b,
+        gx=0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+        gy=0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5,
+        n=0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551,
+        h=1,
+    ),
+    "secp256k1": dict(
+        p=0xfffffffffffffffffffffffffffffffffffffffffffffffffffffffefffffc2f,
+        a=0,
+        b=7,
+        gx=0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798,
+        gy=0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8,
+        n=0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141,
+        h=1,
+    ),
+}
+
+
+def find_standard_curve(a, b, p):
+    """Nombre de la curva estándar con esos (a, b, p), o None."""
+    for name, c in CURVAS_ESTANDAR.items():
+        if c["p"] == p and c["a"] == a % p and c["b"] == b % p:
+            return name
+    return None
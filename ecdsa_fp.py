@@ -0,0 +1,215 @@
+# ecdsa_fp.py
+# ECDSA (SEC 1 / FIPS 186-4) escrito sobre la aritmética de curva_eliptica, para firmar
+# con cualquier curva de Curvas_en_Fp.py (P-256, secp256k1 o una curva propia).
+# Es una implementación educativa: los enteros de Python no son de tiempo constante,
+# así que no protege contra canales laterales. Para firmas reales está firma.py.
+#  - Dominio (E, G, n, h): G de orden primo n y h = |E(F_p)| / n. Para una curva
+#    propia se cuenta |E| (conteo_fp), se factoriza y G sale de un punto aleatorio
+#    con semilla fija, así que la misma curva da siempre el mismo G.
+#  - Nonces deterministas de RFC 6979 (HMAC-SHA256): misma clave y mismo digest dan
+#    la misma firma, y no depende de un generador aleatorio al firmar.
+#  - k·G usa la tabla de base fija (base_fija) del dominio.
+#  - Verificar calcula u1·G + u2·Q con el truco de Shamir: una sola cadena de
+#    duplicaciones para los dos escalares (multiescalar.straus_precomputed, wNAF). Los
+#    múltiplos impares de G se calculan una vez por dominio con una ventana ancha y
+#    los de Q en cada verificación con una ventana corta. x(R) se compara con r sin
+#    pasar a afín cuando n ≈ p (r·Z^2 ≡ X, sin inversión).
+# Las firmas son pares (r, s); signature_to_bytes da r || s con longitud fija.
+import hashlib
+import hmac
+import random
+import secrets
+
+from base_fija import fixed_base_table
+from conteo_fp import count_points_fp
+from curva_eliptica import CurvaEliptica
+from curvas_estandar import CURVAS_ESTANDAR, find_standard_curve
+from factorizacion import factorize
+from firma import BLOQUE_HASH, hash_stream
+from multiescalar import straus_precomputed
+from primalidad import is_probable_prime
+
+# Función hash de los digests y del HMAC de RFC 6979
+HASH_ECDSA = "sha256"
+
+# Ventanas wNAF de la verificación: G tiene tabla fija (2^(w-2) puntos); la de Q se
+# arma en cada verificación, así que conviene más corta
+VENTANA_SHAMIR_G = 8
+VENTANA_SHAMIR_Q = 5
+
+# Semilla con la que se elige G en una curva propia
+SEMILLA_GENERADOR = 0
+# Intentos al buscar G o un nonce con r, s ≠ 0 (con n de cientos de bits basta el primero)
+MAX_INTENTOS = 64
+
+
+# ---------------------------
+# Conversión de enteros (RFC 6979, sección 2.3)
+# ---------------------------
+def bits2int(data, qlen):
+    """Entero con los qlen bits más significativos de data."""
+    x = int.from_bytes(data, "big")
+    blen = 8 * len(data)
+    return x >> (blen - qlen) if blen > qlen else x
+
+def int2octets(x, rlen):
+    return x.to_bytes(rlen, "big")
+
+def bits2octets(data, n):
+    qlen = n.bit_length()
+    return int2octets(bits2int(data, qlen) % n, (qlen + 7) // 8)
+
+
+def rfc6979_nonces(d, digest, n, hash_name=HASH_ECDSA):
+    """Candidatos k en [1, n) de RFC 6979 (sección 3.2) para la clave d y el digest.
+       El primero es el nonce; los siguientes sólo se usan si r o s salen 0."""
+    qlen = n.bit_length()
+    rlen = (qlen + 7) // 8
+    mac = lambda key, data: hmac.new(key, data, hash_name).digest()
+    hlen = hashlib.new(hash_name).digest_size
+    V, K = b"\x01" * hlen, b"\x00" * hlen
+    seed = int2octets(d, rlen) + bits2octets(digest, n)
+    K = mac(K, V + b"\x00" + seed)
+    V = mac(K, V)
+    K = mac(K, V + b"\x01" + seed)
+    V = mac(K, V)
+    while True:
+        T = b""
+        while 8 * len(T) < qlen:
+            V = mac(K, V)
+            T += V
+        k = bits2int(T, qlen)
+        if 1 <= k < n:
+            yield k
+        K = mac(K, V + b"\x00")
+        V = mac(K, V)
+
+
+# ---------------------------
+# Parámetros del dominio
+# ---------------------------
+class DominioECDSA:
+    """Curva E, generador G de orden primo n y cofactor h."""
+
+    def __init__(self, E, G, n, h=1):
+        if not is_probable_prime(n):
+            raise ValueError(f"El orden del generador debe ser primo (n = {n}).")
+        if G is None or not E.is_on_curve(G) or E.mul(n, G) is not None:
+            raise ValueError("G debe ser un punto de la curva de orden n.")
+        self.E, self.G, self.n, self.h = E, G, n, h
+        self.qlen = n.bit_length()
+        self.table = fixed_base_table(E.a, E.b, E.p, G)
+        self.g_multiples = E.odd_multiples(G, VENTANA_SHAMIR_G)
+
+    def __repr__(self):
+        return f"DominioECDSA({self.E!r}, n={self.n}, h={self.h})"
+
+    @classmethod
+    def standard(cls, name):
+        """Dominio de una curva de curvas_estandar (p. ej. "P-256")."""
+        c = CURVAS_ESTANDAR[name]
+        return cls(CurvaEliptica(c["a"], c["b"], c["p"]), (c["gx"], c["gy"]), c["n"], c["h"])
+
+    @classmethod
+    def from_curve(cls, E, n_points=None):
+        """Dominio sobre el mayor subgrupo de orden primo de E(F_p).
+           n_points = |E(F_p)| puede pasarse si ya se contó."""
+        name = find_standard_curve(E.a, E.b, E.p)
+        if name is not None:
+            return cls.standard(name)
+        n_points = n_points or count_points_fp(E.a, E.b, E.p)
+        factors = factorize(n_points)
+        n = max(factors)
+        if n < 3:
+            raise ValueError(f"|E(F_p)| = {n_points} no tiene un subgrupo de orden primo útil.")
+        # (|E| / n^e)·P cae en el n-subgrupo de Sylow; se multiplica por n hasta tener orden n
+        # (si ese subgrupo es Z/n × Z/n, (|E| / n)·P sería siempre O)
+        cofactor = n_points // n ** factors[n]
+        rng = random.Random(SEMILLA_GENERADOR)
+        for _ in range(MAX_INTENTOS):
+            G = E.mul(cofactor, E.random_point(rng))
+            if G is None:
+                continue
+            while (nG := E.mul(n, G)) is not None:
+                G = nG
+            return cls(E, G, n, n_points // n)
+        raise ArithmeticError(f"No se encontró un punto de orden {n} tras {MAX_INTENTOS} intentos.")
+
+    def validate_public_key(self, Q):
+        """True si Q es un punto de la curva distinto de O y de orden n."""
+        if Q is None or not self.E.is_on_curve(Q):
+            return False
+        return self.h == 1 or self.E.mul(self.n, Q) is None
+
+
+def ecdsa_domain(a, b, p, n_points=None):
+    """DominioECDSA de la curva (a, b, p)."""
+    return DominioECDSA.from_curve(CurvaEliptica(a, b, p), n_points)
+
+
+# ---------------------------
+# Claves y firmas
+# ---------------------------
+def generate_keypair(dom, rng=secrets.SystemRandom()):
+    """(d, Q) con d en [1, n) y Q = d·G."""
+    d = rng.randrange(1, dom.n)
+    return d, dom.table.mul(d)
+
+def public_key(dom, d):
+    return dom.table.mul(d)
+
+def sign_digest(dom, d, digest):
+    """Firma (r, s) de un digest ya calculado con el nonce de RFC 6979."""
+    n = dom.n
+    e = bits2int(digest, dom.qlen)
+    for _, k in zip(range(MAX_INTENTOS), rfc6979_nonces(d, digest, n)):
+        R = dom.table.mul(k)
+        r = R[0] % n
+        if r == 0:
+            continue
+        s = pow(k, -1, n) * (e + r * d) % n
+        if s:
+            return r, s
+    # sólo pasa con subgrupos diminutos (p. ej. todos los x de <G> múltiplos de n)
+    raise ArithmeticError(f"Ningún nonce dio r, s ≠ 0 en {MAX_INTENTOS} intentos (n = {n}).")
+
+def verify_digest(dom, Q, digest, signature):
+    """True si signature = (r, s) es una firma válida del digest con la clave pública Q."""
+    r, s = signature
+    n, E = dom.n, dom.E
+    if not (0 < r < n and 0 < s < n) or not dom.validate_public_key(Q):
+        return False
+    w = pow(s, -1, n)
+    e = bits2int(digest, dom.qlen)
+    # u1·G + u2·Q con una sola cadena de duplicaciones (truco de Shamir)
+    X, Y, Z = straus_precomputed(E, [e * w % n, r * w % n],
+                                 [dom.g_multiples, E.odd_multiples(Q, VENTANA_SHAMIR_Q)])
+    if Z == 0:
+        return False
+    p = E.p
+    if n + n <= p:
+        # pocos candidatos no alcanza: x(R) en afín
+        return E.to_affine((X, Y, Z))[0] % n == r
+    # x(R) = X / Z^2 y x(R) mod n = r  <=>  X ≡ c·Z^2 para c = r o r + n (< p)
+    ZZ = Z * Z % p
+    return any((c * ZZ - X) % p == 0 for c in (r, r + n) if c < p)
+
+
+def signature_to_bytes(dom, signature):
+    """r || s, cada uno de (bits de n) / 8 bytes."""
+    rlen = (dom.qlen + 7) // 8
+    return b"".join(int2octets(v, rlen) for v in signature)
+
+def signature_from_bytes(dom, data):
+    rlen = (dom.qlen + 7) // 8
+    if len(data) != 2 * rlen:
+        raise ValueError(f"Una firma de esta curva tiene {2 * rlen} bytes, no {len(data)}.")
+    return int.from_bytes(data[:rlen], "big"), int.from_bytes(data[rlen:], "big")
+
+def sign_stream(dom, d, f, bloque=BLOQUE_HASH):
+    """(digest, firma) del objeto tipo archivo f, leído una sola vez por bloques."""
+    digest = hash_stream(f, bloque)
+    return digest, sign_digest(dom, d, digest)
+
+def verify_stream(dom, Q, f, signature, bloque=BLOQUE_HASH):
+    return verify_digest(dom, Q, hash_stream(f, bloque), signature)
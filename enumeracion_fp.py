@@ -0,0 +1,146 @@
+# enumeracion_fp.py
+# Motor vectorizado (NumPy) para enumerar los puntos afines de
+# y^2 = x^3 + a x + b sobre F_p sin bucles de Python por cada x.
+import numpy as np
+
+from aritmetica_fp import sqrt_context
+
+# Por debajo de este p se precomputa una tabla residuo -> raíz (int32, 4p bytes).
+# Por encima se usa el criterio de Euler y la raíz vectorizada (p ≡ 3 mod 4,
+# Atkin para p ≡ 5 mod 8, Tonelli-Shanks con las constantes de sqrt_context).
+UMBRAL_TABLA = 1 << 24
+
+# Valores de x por bloque en la enumeración por flujo (iter_points_fp)
+BLOQUE_ENUMERACION = 1 << 18
+
+# El motor trabaja en int64: con p < 2^31 los productos (p-1)^2 caben sin desbordar.
+P_MAX_INT64 = 1 << 31
+
+
+# ---------------------------
+# Aritmética modular sobre arreglos int64
+# ---------------------------
+def rhs_mod_p(xs, a, b, p):
+    """x^3 + a x + b (mod p) evaluado por Horner sobre un arreglo int64."""
+    a, b = a % p, b % p
+    return (((xs * xs + a) % p) * xs + b) % p
+
+def _pow_vec(base, e, p):
+    # Exponenciación binaria elemento a elemento (exponente común)
+    result = np.ones_like(base)
+    base = base % p
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+def _tonelli_shanks_vec(n, ctx):
+    # Tonelli-Shanks aplicado a un arreglo de residuos cuadráticos no nulos con las
+    # constantes de ctx (RaizCuadradaFp): b = c^(2^(s-i-1)) sale de ctx.c_pows.
+    p, s = ctx.p, ctx.s
+    c_pows = np.array(ctx.c_pows, dtype=np.int64)
+    x = _pow_vec(n, (ctx.q - 1) // 2, p)
+    r = n * x % p
+    t = r * x % p
+    active = t != 1
+    while active.any():
+        ta = t[active]
+        # menor i (0<i<s) tal que t^(2^i) = 1
+        i = np.zeros_like(ta)
+        t2i = ta * ta % p
+        for k in range(1, s):
+            hit = (i == 0) & (t2i == 1)
+            i[hit] = k
+            t2i = t2i * t2i % p
+        r[active] = r[active] * c_pows[s - i - 1] % p
+        t[active] = ta * c_pows[s - i] % p
+        active = t != 1
+    return r
+
+def _atkin_vec(n, p):
+    # p ≡ 5 (mod 8): t = (2n)^((p-5)/8), i = 2n t^2, r = n t (i - 1)
+    n2 = 2 * n % p
+    t = _pow_vec(n2, (p - 5) // 8, p)
+    i = n2 * (t * t % p) % p
+    return n * t % p * ((i - 1) % p) % p
+
+def square_root_table(p):
+    """Tabla raiz[r] = menor raíz cuadrada de r mod p, o -1 si r no es residuo."""
+    table = np.full(p, -1, dtype=np.int32)
+    ys = np.arange(p // 2 + 1, dtype=np.int64)
+    table[ys * ys % p] = ys
+    return table
+
+def sqrt_mod_p(values, p, umbral_tabla=UMBRAL_TABLA):
+    """Menor raíz cuadrada de cada valor (ya reducido mod p), o -1 si no existe."""
+    if p < umbral_tabla:
+        return square_root_table(p)[values].astype(np.int64)
+    roots = np.full(values.shape, -1, dtype=np.int64)
+    roots[values == 0] = 0
+    nz = values != 0
+    # Criterio de Euler: v^((p-1)/2) == 1 sólo para residuos
+    res = np.zeros_like(nz)
+    res[nz] = _pow_vec(values[nz], (p-1)//2, p) == 1
+    n = values[res]
+    if p % 4 == 3:
+        y = _pow_vec(n, (p+1)//4, p)
+    elif p % 8 == 5:
+        y = _atkin_vec(n, p)
+    else:
+        y = _tonelli_shanks_vec(n, sqrt_context(p))
+    roots[res] = np.minimum(y, p - y)
+    return roots
+
+
+# ---------------------------
+# Enumeración de E(F_p)
+# ---------------------------
+def _points_in_range(a, b, p, x0, x1, table, umbral_tabla):
+    # Puntos con x0 <= x < x1, ya ordenados por (x, y): x crece y por cada x
+    # se emite primero la raíz menor.
+    xs = np.arange(x0, x1, dtype=np.int64)
+    r = rhs_mod_p(xs, a, b, p)
+    y_lo = table[r].astype(np.int64) if table is not None else sqrt_mod_p(r, p, umbral_tabla)
+    keep = y_lo >= 0
+    xs, y_lo = xs[keep], y_lo[keep]
+    # cada x con rhs != 0 aporta (x, y) y (x, p-y); con rhs == 0 sólo (x, 0)
+    pair = np.stack([xs, xs], axis=1)
+    ys = np.stack([y_lo, p - y_lo], axis=1)
+    mask = np.stack([np.ones(len(xs), dtype=bool), y_lo != 0], axis=1)
+    return pair[mask], ys[mask]
+
+def enumerate_points_fp(a, b, p, umbral_tabla=UMBRAL_TABLA):
+    """Puntos afines de y^2 = x^3 + a x + b sobre F_p como dos arreglos int64 (xs, ys),
+       ordenados por (x, y) igual que points_on_curve_fp. No incluye el punto al infinito."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    table = square_root_table(p) if p < umbral_tabla else None
+    return _points_in_range(a, b, p, 0, p, table, umbral_tabla)
+
+def iter_points_fp(a, b, p, bloque=BLOQUE_ENUMERACION, umbral_tabla=UMBRAL_TABLA):
+    """Genera los mismos puntos que enumerate_points_fp en bloques (xs, ys) de
+       bloque valores de x (a lo más 2·bloque puntos), en orden (x, y).
+       La memoria no crece con p salvo la tabla de raíces (4p bytes, p < umbral_tabla)."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    table = square_root_table(p) if p < umbral_tabla else None
+    for x0 in range(0, p, bloque):
+        yield _points_in_range(a, b, p, x0, min(x0 + bloque, p), table, umbral_tabla)
+
+def write_points_csv(a, b, p, f, bloque=BLOQUE_ENUMERACION):
+    """Escribe los puntos afines como CSV "x,y" en el archivo de texto f, bloque
+       por bloque desde iter_points_fp. Devuelve el número de puntos escritos."""
+    f.write("x,y\n")
+    total = 0
+    for xs, ys in iter_points_fp(a, b, p, bloque):
+        if len(xs):
+            f.write("\n".join(f"{x},{y}" for x, y in zip(xs.tolist(), ys.tolist())))
+            f.write("\n")
+        total += len(xs)
+    return total
+
+def points_as_tuples(xs, ys):
+    """Convierte los arreglos (xs, ys) a la lista de tuplas que usan las apps."""
+    return list(zip(xs.tolist(), ys.tolist()))
@@ -0,0 +1,55 @@
+# factorizacion.py
+# Factorización de enteros para órdenes de grupo (|E(F_p)|, órdenes de puntos).
+# División por primos pequeños y Pollard-rho (variante de Brent) para el resto;
+# la primalidad de cada cofactor la decide primalidad.is_probable_prime.
+from math import gcd
+
+from primalidad import is_probable_prime
+
+SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+def _pollard_brent(n):
+    # Devuelve un factor no trivial de n (n compuesto e impar)
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        f = lambda v: (v * v + c) % n
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = f(y)
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = f(y)
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = f(ys)
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+def factorize(n):
+    """Factorización de n >= 1 como diccionario {primo: exponente}."""
+    factors = {}
+    for q in SMALL_PRIMES:
+        while n % q == 0:
+            factors[q] = factors.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _pollard_brent(m)
+        stack.extend([d, m // d])
+    return dict(sorted(factors.items()))
@@ -0,0 +1,130 @@
+# firma.py
+# Firma y verificación de archivos por flujo con SHA-256.
+# El archivo se lee en bloques de tamaño fijo dentro de un solo búfer (memoryview),
+# así que la memoria usada no crece con el tamaño del archivo. El digest se calcula
+# una vez y se firma con utils.Prehashed: el mismo digest sirve para mostrar el hash
+# y para la firma, sin volver a leer el archivo.
+#
+# Esquemas (ESQUEMAS), elegidos por el tipo de la clave:
+#  - "rsa-pss": RSA-2048 con PSS, como las firmas anteriores (siguen verificando);
+#  - "ecdsa-p256": ECDSA sobre P-256, firma DER de ~71 bytes;
+#  - "ed25519": Ed25519 no admite un digest precalculado (Ed25519ph no está en
+#    cryptography), así que se firma el digest SHA-256 de 32 bytes como mensaje.
+#    La firma cubre el archivo igual que las otras y se sigue leyendo una sola vez.
+import hashlib
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa, utils
+
+# Tamaño del bloque de lectura (1 MiB)
+BLOQUE_HASH = 1 << 20
+
+# Mismos parámetros PSS que las firmas anteriores: las firmas viejas siguen verificando
+PSS = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+PREHASHED = utils.Prehashed(hashes.SHA256())
+ECDSA = ec.ECDSA(PREHASHED)
+
+# Esquemas de firma disponibles; las cuentas sin esquema guardado son RSA-PSS
+ESQUEMAS = ("rsa-pss", "ecdsa-p256", "ed25519")
+ESQUEMA_RSA = "rsa-pss"
+
+NOMBRES_ESQUEMAS = {
+    "rsa-pss": "RSA-PSS 2048 (SHA-256)",
+    "ecdsa-p256": "ECDSA P-256 (SHA-256)",
+    "ed25519": "Ed25519 (sobre SHA-256)",
+}
+
+
+def hash_stream(f, bloque=BLOQUE_HASH):
+    """Digest SHA-256 (bytes) del objeto tipo archivo f, leído desde el inicio
+       en bloques de bloque bytes. f queda al inicio al terminar."""
+    h = hashlib.sha256()
+    buf = memoryview(bytearray(bloque))
+    f.seek(0)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(buf[:n])
+    f.seek(0)
+    return h.digest()
+
+def hash_file(path, bloque=BLOQUE_HASH):
+    """Digest SHA-256 del archivo en path, por bloques."""
+    with open(path, "rb") as f:
+        return hash_stream(f, bloque)
+
+# ---------------------------
+# Claves
+# ---------------------------
+def generate_private_key(esquema=ESQUEMA_RSA):
+    """Clave privada nueva del esquema dado."""
+    if esquema == "rsa-pss":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if esquema == "ecdsa-p256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if esquema == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Esquema de firma desconocido: {esquema!r}.")
+
+def scheme_of(key):
+    """Esquema de una clave (pública o privada)."""
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "rsa-pss"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if isinstance(key.curve, ec.SECP256R1):
+            return "ecdsa-p256"
+    elif isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "ed25519"
+    raise ValueError(f"Tipo de clave no soportado: {type(key).__name__}.")
+
+def private_pem(private_key):
+    """PEM sin cifrar de la clave privada: RSA en el formato tradicional de siempre,
+       las demás en PKCS8 (Ed25519 no tiene formato tradicional)."""
+    fmt = (serialization.PrivateFormat.TraditionalOpenSSL if scheme_of(private_key) == "rsa-pss"
+           else serialization.PrivateFormat.PKCS8)
+    return private_key.private_bytes(encoding=serialization.Encoding.PEM, format=fmt,
+                                     encryption_algorithm=serialization.NoEncryption())
+
+def public_pem(key):
+    """PEM (SubjectPublicKeyInfo) de la clave pública de key (pública o privada)."""
+    if hasattr(key, "public_key"):
+        key = key.public_key()
+    return key.public_bytes(encoding=serialization.Encoding.PEM,
+                            format=serialization.PublicFormat.SubjectPublicKeyInfo)
+
+# ---------------------------
+# Firma
+# ---------------------------
+def sign_digest(private_key, digest):
+    """Firma de un digest SHA-256 ya calculado, con el esquema de la clave."""
+    esquema = scheme_of(private_key)
+    if esquema == "rsa-pss":
+        return private_key.sign(digest, PSS, PREHASHED)
+    if esquema == "ecdsa-p256":
+        return private_key.sign(digest, ECDSA)
+    return private_key.sign(digest)
+
+def verify_digest(public_key, digest, signature):
+    """True si signature es una firma válida del digest SHA-256 con el esquema de la clave."""
+    esquema = scheme_of(public_key)
+    try:
+        if esquema == "rsa-pss":
+            public_key.verify(signature, digest, PSS, PREHASHED)
+        elif esquema == "ecdsa-p256":
+            public_key.verify(signature, digest, ECDSA)
+        else:
+            public_key.verify(signature, digest)
+        return True
+    except InvalidSignature:
+        return False
+
+def sign_stream(private_key, f, bloque=BLOQUE_HASH):
+    """(digest, firma) del objeto tipo archivo f, leyéndolo una sola vez."""
+    digest = hash_stream(f, bloque)
+    return digest, sign_digest(private_key, digest)
+
+def verify_stream(public_key, f, signature, bloque=BLOQUE_HASH):
+    """Verifica la firma de f sin cargarlo completo en memoria."""
+    return verify_digest(public_key, hash_stream(f, bloque), signature)
@@ -0,0 +1,248 @@
+# firma_lote.py
+# Firma y verificación de muchos archivos a la vez.
+#
+# Firma: repartida en varios procesos.
+# Cada proceso recibe la clave privada en PEM una sola vez (se guarda ya cargada en
+# el proceso) y, por cada archivo, calcula el SHA-256 por bloques y firma el digest.
+# El resultado es un ZIP con un .sig por archivo y un manifest.csv
+# (archivo, bytes, sha256, firma, firmante).
+#
+# Verificación: a partir de ese ZIP y de los archivos originales, todo en memoria.
+# La clave pública de cada firmante se carga una vez para todas sus entradas y las
+# verificaciones se reparten en hilos: hashlib y OpenSSL sueltan el GIL mientras
+# trabajan, así que no hace falta copiar los archivos a otros procesos.
+#
+# La firma usa el grupo de procesos compartido de paralelo_fp (map_bounded limita los
+# procesos de cada lote sin afectar a otras sesiones).
+import csv
+import hashlib
+import io
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+from cryptography.hazmat.primitives import serialization
+
+from firma import hash_stream, sign_digest, verify_digest
+from paralelo_fp import default_workers, map_bounded
+
+# Con menos archivos que esto se firma en el proceso actual
+UMBRAL_LOTE = 8
+
+# Archivos por envío a un proceso (reduce la comunicación con archivos pequeños)
+ARCHIVOS_POR_ENVIO = 4
+
+# Límites de lo que se descomprime y firma en un lote (un ZIP pequeño puede
+# expandirse a gigabytes): por archivo y en total
+MAX_BYTES_ARCHIVO = 200 << 20
+MAX_BYTES_LOTE = 1 << 30
+
+MANIFIESTO = "manifest.csv"
+COLUMNAS_MANIFIESTO = ["archivo", "bytes", "sha256", "firma", "firmante"]
+
+# Claves ya cargadas dentro de cada proceso, por SHA-256 del PEM
+_claves = {}
+
+
+def _open_zip(f, name):
+    """ZipFile de f; ValueError si no es un ZIP válido."""
+    try:
+        return zipfile.ZipFile(f)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"'{name}' no es un ZIP válido ({e}).") from e
+
+def _read_entry(zf, info):
+    """Bytes de la entrada info; ValueError si está cifrada o dañada."""
+    if info.flag_bits & 0x1:
+        raise ValueError(f"'{info.filename}' está cifrado dentro del ZIP; súbelo sin contraseña.")
+    try:
+        return zf.read(info)
+    except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as e:
+        raise ValueError(f"No se pudo leer '{info.filename}' del ZIP ({e}).") from e
+
+def iter_batch_inputs(files, max_file=MAX_BYTES_ARCHIVO, max_total=MAX_BYTES_LOTE):
+    """(nombre, bytes) de cada archivo subido; los .zip se expanden en sus entradas,
+       una a la vez. ValueError si una entrada pasa de max_file bytes, si el lote
+       pasa de max_total, si un nombre se repite (entre ZIPs o archivos sueltos) o si
+       un .zip está dañado o tiene entradas cifradas."""
+    total = 0
+    seen = set()
+
+    def check(name, size):
+        nonlocal total
+        if name in seen:
+            raise ValueError(f"El archivo '{name}' aparece más de una vez en el lote.")
+        if size > max_file:
+            raise ValueError(f"'{name}' ocupa {size} bytes; el máximo por archivo es {max_file}.")
+        total += size
+        if total > max_total:
+            raise ValueError(f"El lote pasa de {max_total} bytes.")
+        seen.add(name)
+
+    for f in files:
+        if f.name.lower().endswith(".zip"):
+            with _open_zip(f, f.name) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir():
+                        # el tamaño declarado se revisa antes de descomprimir; zipfile no
+                        # entrega más bytes que file_size
+                        check(info.filename, info.file_size)
+                        yield info.filename, _read_entry(zf, info)
+        else:
+            data = f.getvalue()
+            check(f.name, len(data))
+            yield f.name, data
+
+def _load_key(private_key_pem):
+    fp = hashlib.sha256(private_key_pem).digest()
+    if fp not in _claves:
+        _claves.clear()
+        _claves[fp] = serialization.load_pem_private_key(private_key_pem, password=None)
+    return _claves[fp]
+
+# Debe estar a nivel de módulo para enviarse a los procesos
+def _sign_one(args):
+    private_key_pem, name, data = args
+    digest = hash_stream(io.BytesIO(data))
+    return name, len(data), digest, sign_digest(_load_key(private_key_pem), digest)
+
+def _unique(items):
+    seen = set()
+    for name, data in items:
+        if name in seen:
+            raise ValueError(f"El archivo '{name}' aparece más de una vez en el lote.")
+        seen.add(name)
+        yield name, data
+
+def _chunks(items, size):
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+def _sign_chunk(args):
+    private_key_pem, chunk = args
+    return [_sign_one((private_key_pem, name, data)) for name, data in chunk]
+
+def _archive(results, signer):
+    # ZIP con los .sig y el manifiesto
+    zip_buffer = io.BytesIO()
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(COLUMNAS_MANIFIESTO)
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, size, digest, signature in results:
+            zf.writestr(f"{name}.sig", signature)
+            writer.writerow([name, size, digest.hex(), f"{name}.sig", signer])
+        zf.writestr(MANIFIESTO, manifest.getvalue())
+    return zip_buffer.getvalue()
+
+
+def sign_batch(private_key_pem, items, workers=None, signer=""):
+    """Firma cada (nombre, bytes) de items con la clave privada PEM.
+       items se consume a medida que se firma (sólo unos pocos archivos en memoria a
+       la vez); ValueError si un nombre se repite.
+       Devuelve dict(zip, archivos, bytes, segundos, archivos_s, mb_s) donde zip
+       son los bytes del ZIP con los .sig y el manifiesto."""
+    items = _unique(items)
+    workers = workers or default_workers()
+    t0 = time.perf_counter()
+    head = list(islice(items, UMBRAL_LOTE))
+    items = chain(head, items)
+    if workers == 1 or len(head) < UMBRAL_LOTE:
+        results = [_sign_one((private_key_pem, name, data)) for name, data in items]
+    else:
+        jobs = ((private_key_pem, chunk) for chunk in _chunks(items, ARCHIVOS_POR_ENVIO))
+        results = [res for part in map_bounded(_sign_chunk, jobs, workers) for res in part]
+    archive = _archive(results, signer)
+    seconds = time.perf_counter() - t0
+    total = sum(size for _, size, _, _ in results)
+    return dict(zip=archive, archivos=len(results), bytes=total, segundos=seconds,
+                archivos_s=len(results) / seconds if seconds else 0.0,
+                mb_s=total / 1e6 / seconds if seconds else 0.0)
+
+
+def _check_entries(infos, names, max_file=MAX_BYTES_ARCHIVO, max_total=MAX_BYTES_LOTE):
+    # Tamaños declarados de las entradas que se van a leer del ZIP, antes de descomprimir
+    total = 0
+    for name in names:
+        size = infos[name].file_size
+        if size > max_file:
+            raise ValueError(f"'{name}' ocupa {size} bytes; el máximo por archivo es {max_file}.")
+        total += size
+    if total > max_total:
+        raise ValueError(f"El ZIP de firmas pasa de {max_total} bytes.")
+
+def read_manifest(zf):
+    """Filas (dict) de manifest.csv dentro del ZipFile zf. ValueError si falta el
+       manifiesto o no tiene las columnas archivo y firma."""
+    try:
+        info = zf.getinfo(MANIFIESTO)
+    except KeyError:
+        raise ValueError(f"El ZIP no trae {MANIFIESTO}; ¿es un ZIP de firmas de este lote?") from None
+    reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(_read_entry(zf, info)), encoding="utf-8"))
+    missing = {"archivo", "firma"} - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"A {MANIFIESTO} le faltan las columnas {', '.join(sorted(missing))}.")
+    return list(reader)
+
+def _verify_one(public_key, row, data, signature):
+    t0 = time.perf_counter()
+    digest = hash_stream(io.BytesIO(data))
+    if row.get("sha256") and digest.hex() != row["sha256"]:
+        valid, detail = False, "el SHA-256 no coincide con el manifiesto"
+    elif verify_digest(public_key, digest, signature):
+        valid, detail = True, "firma válida"
+    else:
+        valid, detail = False, "firma inválida"
+    return valid, detail, (time.perf_counter() - t0) * 1000
+
+def verify_batch(signatures_zip, items, load_public_key, workers=None, default_signer=""):
+    """Verifica cada entrada del manifiesto de signatures_zip (ZIP de sign_batch).
+       items: (nombre, bytes) de los archivos originales; si el ZIP también trae los
+       originales, se toman de ahí. load_public_key(firmante) se llama una vez por
+       firmante distinto y devuelve None si no tiene clave; un PEM inválido (ValueError)
+       también se informa por archivo, cualquier otro error se propaga. ValueError si
+       signatures_zip no es un ZIP de firmas válido. Devuelve dict(resultados, segundos,
+       latencia_ms, p95_ms) con un dict por archivo (archivo, firmante, valida, detalle, ms)."""
+    with _open_zip(signatures_zip, getattr(signatures_zip, "name", "ZIP de firmas")) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+        if MANIFIESTO in infos:
+            _check_entries(infos, [MANIFIESTO])
+        rows = read_manifest(zf)
+        _check_entries(infos, {name for row in rows for name in (row["firma"], row["archivo"]) if name in infos}
+                       | {MANIFIESTO})
+        signatures = {row["firma"]: _read_entry(zf, infos[row["firma"]]) for row in rows if row["firma"] in infos}
+        originals = {row["archivo"]: _read_entry(zf, infos[row["archivo"]]) for row in rows if row["archivo"] in infos}
+    originals.update(items)
+
+    t0 = time.perf_counter()
+    keys = {}
+    for signer in {row.get("firmante") or default_signer for row in rows}:
+        try:
+            keys[signer] = load_public_key(signer)
+        except ValueError:
+            keys[signer] = None
+
+    def check(row):
+        signer = row.get("firmante") or default_signer
+        out = dict(archivo=row["archivo"], firmante=signer, valida=False, ms=0.0)
+        if row["archivo"] not in originals:
+            out["detalle"] = "falta el archivo original"
+        elif row["firma"] not in signatures:
+            out["detalle"] = "falta el archivo de firma"
+        elif keys[signer] is None:
+            out["detalle"] = "no se encontró la clave pública del firmante"
+        else:
+            out["valida"], out["detalle"], out["ms"] = _verify_one(
+                keys[signer], row, originals[row["archivo"]], signatures[row["firma"]])
+        return out
+
+    with ThreadPoolExecutor(workers or default_workers()) as pool:
+        results = list(pool.map(check, rows))
+    seconds = time.perf_counter() - t0
+    latencies = sorted(r["ms"] for r in results if r["ms"])
+    return dict(resultados=results, segundos=seconds,
+                latencia_ms=sum(latencies) / len(latencies) if latencies else 0.0,
+                p95_ms=latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0)
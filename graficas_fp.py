@@ -0,0 +1,64 @@
+# graficas_fp.py
+# Trazas de Plotly para conjuntos grandes de puntos de E(F_p).
+# Plotly manda cada punto al navegador como JSON; con decenas de miles de puntos
+# la página se congela. Según el número de puntos n el gráfico 2D usa:
+#  - "svg":        go.Scatter (n <= umbral_webgl, interactivo y nítido)
+#  - "webgl":      go.Scattergl (hasta umbral_histograma, dibujado en la GPU)
+#  - "histograma": go.Heatmap con los puntos agrupados en celdas en el servidor
+#                  (el tamaño enviado depende de las celdas, no de n)
+# El toro (Scatter3d) se diezma a lo más max_puntos marcadores.
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+MODOS_2D = ("auto", "svg", "webgl", "histograma")
+
+UMBRAL_WEBGL = 5_000
+UMBRAL_HISTOGRAMA = 200_000
+
+# Celdas por eje del histograma 2D
+CELDAS_HISTOGRAMA = 256
+
+# Marcadores máximos en el toro
+MAX_PUNTOS_TORO = 20_000
+
+
+def choose_mode(n, umbral_webgl=UMBRAL_WEBGL, umbral_histograma=UMBRAL_HISTOGRAMA):
+    """Modo 2D para n puntos: "svg", "webgl" o "histograma"."""
+    if n <= umbral_webgl:
+        return "svg"
+    if n <= umbral_histograma:
+        return "webgl"
+    return "histograma"
+
+def downsample_indices(n, max_points):
+    """Índices de a lo más max_points puntos repartidos uniformemente en range(n).
+       Los puntos vienen ordenados por x, así que la muestra cubre todo el rango."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).astype(np.int64))
+
+def points_trace_2d(xs, ys, p, mode, name, marker=None, celdas=CELDAS_HISTOGRAMA):
+    """Traza 2D de los puntos (xs, ys) de F_p x F_p en el modo indicado."""
+    marker = marker or dict(size=6)
+    if mode == "svg":
+        return go.Scatter(x=xs, y=ys, mode="markers", marker=marker, name=name)
+    if mode == "webgl":
+        return go.Scattergl(x=xs, y=ys, mode="markers", marker=dict(marker, size=min(marker.get("size", 6), 3)),
+                            name=name)
+    if mode == "histograma":
+        celdas = min(celdas, p)
+        H, ex, ey = np.histogram2d(xs, ys, bins=celdas, range=[[0, p], [0, p]])
+        # conteos enteros del tipo más chico: Plotly los manda como binario compacto
+        z = H.T.astype(np.uint16 if H.max() < 1 << 16 else np.uint32)
+        return go.Heatmap(x=(ex[:-1] + ex[1:]) / 2, y=(ey[:-1] + ey[1:]) / 2, z=z,
+                          colorscale="Reds", colorbar=dict(title="puntos"), name=name,
+                          hovertemplate="x≈%{x:.0f}, y≈%{y:.0f}: %{z} puntos<extra></extra>")
+    raise ValueError(f"Modo desconocido: {mode!r} (usa uno de {MODOS_2D[1:]}).")
+
+def payload_stats(fig):
+    """Tamaño del JSON que se envía al navegador y tiempo en serializarlo."""
+    t0 = time.perf_counter()
+    payload = fig.to_json()
+    return dict(bytes=len(payload), seconds=time.perf_counter() - t0)
@@ -0,0 +1,229 @@
+# grupo_fp.py
+# Estructura del grupo E(F_p) ≅ Z/n1 × Z/n2 (n2 | n1 y n2 | p - 1).
+#  - Orden de un punto: se factoriza |E| una sola vez y se quitan primos de |E|
+#    mientras (m/q)·P = O (multiplicación por cofactores, sin sumas repetidas).
+#  - n1 es el exponente del grupo: se combinan puntos aleatorios hasta tener uno
+#    de orden n1. El segundo generador se arma en cada subgrupo de Sylow con un
+#    logaritmo discreto (BSGS) que lo separa de <P1>.
+#  - Orden de todos los puntos (p pequeño): se recorre i·P1 + j·P2 en bloque con
+#    NumPy y ord(i·P1 + j·P2) = lcm(n1/gcd(i, n1), n2/gcd(j, n2)).
+import random
+from math import isqrt, lcm
+
+import numpy as np
+
+from curva_eliptica import CurvaEliptica
+from enumeracion_fp import P_MAX_INT64, _pow_vec
+from factorizacion import factorize
+
+# Por debajo de este p se precomputa la tabla de inversos (int64, 8p bytes)
+UMBRAL_INVERSOS = 1 << 24
+
+
+# ---------------------------
+# Orden de un punto y logaritmo discreto
+# ---------------------------
+def point_order(E, P, n, factors=None):
+    """Orden de P sabiendo que n·P = O. factors = factorize(n) puede pasarse
+       para reutilizarla entre muchos puntos."""
+    factors = factors or factorize(n)
+    m = n
+    for q, e in factors.items():
+        for _ in range(e):
+            if E.mul(m // q, P) is not None:
+                break
+            m //= q
+    return m
+
+def discrete_log(E, Q, P, m):
+    """k en [0, m) con k·P = Q (BSGS, m múltiplo del orden de P), o None."""
+    s = isqrt(max(m - 1, 0)) + 1
+    baby = {}
+    R = None
+    for j in range(s):
+        baby.setdefault(R, j)
+        R = E.add(R, P)
+    step = E.neg(E.mul(s, P))
+    R = Q
+    for i in range(s):
+        if R in baby:
+            return (i * s + baby[R]) % m
+        R = E.add(R, step)
+    return None
+
+def _valuation(n, q):
+    v = 0
+    while n % q == 0:
+        n //= q
+        v += 1
+    return v
+
+def _lcm_point(E, P, m, Q, o, factors):
+    # Punto de orden lcm(m, o) a partir de P (orden m) y Q (orden o):
+    # por cada primo se toma la componente de mayor potencia.
+    if m % o == 0:
+        return P, m
+    R = None
+    for q in factors:
+        vm, vo = _valuation(m, q), _valuation(o, q)
+        if vm >= vo and vm:
+            R = E.add(R, E.mul(m // q**vm, P))
+        elif vo > vm:
+            R = E.add(R, E.mul(o // q**vo, Q))
+    return R, lcm(m, o)
+
+def _second_generator(E, n, P1, n1, n2, factors, rng, attempts=32):
+    # P2 de orden n2 con <P1> ∩ <P2> = {O}, armado primo a primo: en el
+    # subgrupo de Sylow Z/q^f × Z/q^g se busca R con q^g·R = O fuera de <P1q>.
+    P2 = None
+    for q in factors:
+        g = _valuation(n2, q)
+        if not g:
+            continue
+        f = _valuation(n1, q)
+        P1q = E.mul(n1 // q**f, P1)
+        base = E.mul(q**g, P1q)          # genera q^g·Sylow, de orden q^(f-g)
+        low = E.mul(q**(f - 1), P1q)     # único subgrupo de orden q de <P1q>
+        for _ in range(attempts):
+            Qq = E.mul(n // q**(f + g), E.random_point(rng))
+            k = discrete_log(E, E.mul(q**g, Qq), base, q**(f - g))
+            if k is None:
+                return None  # n1 no era el exponente del grupo
+            R = E.add(Qq, E.neg(E.mul(k, P1q)))
+            T = E.mul(q**(g - 1), R)
+            if T is not None and discrete_log(E, T, low, q) is None:
+                P2 = E.add(P2, R)
+                break
+        else:
+            return None
+    return P2
+
+def group_structure(E, n, factors=None, rng=None, max_points=64):
+    """Estructura de E(F_p) sabiendo que |E(F_p)| = n.
+       Devuelve dict(n, factors, n1, n2, P1, P2) con E(F_p) = <P1> ⊕ <P2>,
+       ord(P1) = n1, ord(P2) = n2 y n2 | n1 (P2 = None si el grupo es cíclico)."""
+    factors = factors or factorize(n)
+    rng = rng or random.Random(0)
+    info = dict(n=n, factors=factors, n1=1, n2=1, P1=None, P2=None)
+    if n == 1:
+        return info
+    P1, n1 = None, 1
+    for _ in range(max_points):
+        Q = E.random_point(rng)
+        P1, n1 = _lcm_point(E, P1, n1, Q, point_order(E, Q, n, factors), factors)
+        n2 = n // n1
+        if n2 == 1:
+            return dict(info, n1=n1, P1=P1)
+        if n1 % n2 or (E.p - 1) % n2:
+            continue
+        P2 = _second_generator(E, n, P1, n1, n2, factors, rng)
+        if P2 is not None:
+            return dict(info, n1=n1, n2=n2, P1=P1, P2=P2)
+    raise ArithmeticError(f"No se pudo determinar la estructura de E(F_p) tras {max_points} puntos.")
+
+
+# ---------------------------
+# Orden de todos los puntos (NumPy)
+# ---------------------------
+def inverse_table(p):
+    """Tabla inv[r] = r^(-1) mod p (inv[0] = 0) a partir de las potencias de
+       una raíz primitiva g: inv[g^k] = g^(p-1-k)."""
+    primes = factorize(p - 1)
+    g = 2
+    while any(pow(g, (p - 1) // q, p) == 1 for q in primes):
+        g += 1
+    s = isqrt(p - 1) + 1
+    small = np.empty(s, dtype=np.int64)
+    big = np.empty(-(-(p - 1) // s), dtype=np.int64)
+    small[0] = big[0] = 1
+    for i in range(1, s):
+        small[i] = small[i - 1] * g % p
+    gs = small[-1] * g % p
+    for j in range(1, len(big)):
+        big[j] = big[j - 1] * gs % p
+    powers = (big[:, None] * small[None, :] % p).ravel()[:p - 1]
+    inv = np.zeros(p, dtype=np.int64)
+    inv[powers] = powers[-np.arange(p - 1) % (p - 1)]
+    return inv
+
+def _add_vec(x1, y1, inf1, x2, y2, inf2, a, p, inv):
+    # Suma afín elemento a elemento; inf marca el punto al infinito.
+    # El segundo sumando puede ser un solo punto (escalares).
+    inf2 = np.asarray(inf2, dtype=bool)
+    same_x = (x1 == x2) & ~inf1 & ~inf2
+    dbl = same_x & (y1 == y2) & (y1 != 0)
+    ordinary = ~inf1 & ~inf2 & (~same_x | dbl)
+    num = np.where(dbl, (3 * (x1 * x1 % p) + a) % p, (y2 - y1) % p)
+    den = np.where(dbl, 2 * y1 % p, (x2 - x1) % p)
+    den = np.where(ordinary, den, 1)
+    den_inv = inv[den] if inv is not None else _pow_vec(den, p - 2, p)
+    lam = num * den_inv % p
+    x3 = (lam * lam - x1 - x2) % p
+    y3 = (lam * (x1 - x3) - y1) % p
+    x3 = np.where(inf1, x2, np.where(inf2, x1, x3))
+    y3 = np.where(inf1, y2, np.where(inf2, y1, y3))
+    inf3 = np.where(inf1, inf2, np.where(inf2, inf1, ~ordinary))
+    return x3, y3, inf3
+
+def _as_arrays(points):
+    xs = np.array([0 if P is None else P[0] for P in points], dtype=np.int64)
+    ys = np.array([0 if P is None else P[1] for P in points], dtype=np.int64)
+    return xs, ys, np.array([P is None for P in points])
+
+def _multiples_vec(E, P, m, inv):
+    # k·P para k = 0..m-1: s múltiplos consecutivos en Python y luego filas
+    # desplazadas por s·P en bloque. s ≈ √(64 m) equilibra ambas partes.
+    s = min(m, isqrt(64 * m) + 1)
+    baby = [None]
+    for _ in range(s - 1):
+        baby.append(E.add(baby[-1], P))
+    S = E.add(baby[-1], P)
+    x, y, inf = _as_arrays(baby)
+    rows = [(x, y, inf)]
+    for _ in range(1, -(-m // s)):
+        x, y, inf = _add_vec(x, y, inf, S[0], S[1], False, E.a, E.p, inv)
+        rows.append((x, y, inf))
+    return tuple(np.concatenate(col)[:m] for col in zip(*rows))
+
+def point_orders_fp(a, b, p, structure=None):
+    """Orden de cada punto afín de E(F_p) como arreglos (xs, ys, orders),
+       ordenados por (x, y) igual que enumerate_points_fp."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    E = CurvaEliptica(a, b, p)
+    if structure is None:
+        from conteo_fp import count_points_fp  # conteo_fp importa este módulo
+        structure = group_structure(E, count_points_fp(a, b, p))
+    n1, n2 = structure["n1"], structure["n2"]
+    if structure["P1"] is None:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+    inv = inverse_table(p) if p < UMBRAL_INVERSOS else None
+    x1, y1, inf1 = _multiples_vec(E, structure["P1"], n1, inv)
+    i = np.arange(n1, dtype=np.int64)
+    ord1 = n1 // np.gcd(i, n1)
+    xs, ys, infs, orders = [], [], [], []
+    Q = None
+    for j in range(n2):
+        if Q is None:
+            x, y, inf = x1, y1, inf1
+        else:
+            x, y, inf = _add_vec(x1, y1, inf1, Q[0], Q[1], False, E.a, p, inv)
+        xs.append(x)
+        ys.append(y)
+        infs.append(inf)
+        orders.append(np.lcm(ord1, n2 // np.gcd(j, n2)))
+        Q = E.add(Q, structure["P2"])
+    xs, ys, infs, orders = (np.concatenate(v) for v in (xs, ys, infs, orders))
+    keep = ~infs
+    xs, ys, orders = xs[keep], ys[keep], orders[keep]
+    idx = np.argsort(xs * p + ys, kind="stable")
+    return xs[idx], ys[idx], orders[idx]
+
+def order_distribution(orders):
+    """{d: número de puntos de orden d}, incluyendo el punto al infinito (orden 1)."""
+    ds, counts = np.unique(orders, return_counts=True)
+    dist = {1: 1}
+    for d, c in zip(ds.tolist(), counts.tolist()):
+        dist[d] = dist.get(d, 0) + c
+    return dist
@@ -0,0 +1,100 @@
+# multiescalar.py
+# Multiplicación multi-escalar Σ k_i·P_i sobre una CurvaEliptica.
+#  - Straus (wNAF intercalado): una sola cadena de duplicaciones compartida por
+#    todos los puntos; conviene para lotes pequeños.
+#  - Pippenger (cubetas): por cada ventana de c bits se acumula cada punto en la
+#    cubeta de su dígito y se combinan las cubetas con sumas corridas; el costo
+#    por punto baja a ~bits/c sumas, así que conviene para lotes grandes.
+from curva_eliptica import JACOBIAN_INFINITY, wnaf
+
+# A partir de este tamaño de lote se usa Pippenger en lugar de Straus
+UMBRAL_PIPPENGER = 128
+
+VENTANA_STRAUS = 4
+
+
+def _normalize(E, scalars, points):
+    # Escalares negativos -> punto negado; se descartan términos nulos
+    pairs = []
+    for k, P in zip(scalars, points):
+        if k < 0:
+            k, P = -k, E.neg(P)
+        if k and P is not None:
+            pairs.append((k, P))
+    return pairs
+
+def pippenger_window(n):
+    """Ancho de ventana c para n puntos (≈ log2 n - 3, al menos 2; ajustado
+       con benchmarks/bench_multiescalar.py)."""
+    return max(2, n.bit_length() - 4)
+
+def straus(E, scalars, points, w=VENTANA_STRAUS):
+    """Σ k_i·P_i con wNAF intercalado (punto jacobiano)."""
+    pairs = _normalize(E, scalars, points)
+    if not pairs:
+        return JACOBIAN_INFINITY
+    # múltiplos impares de todos los puntos con una sola inversión
+    half = 1 << (w - 2)
+    flat = []
+    for _, P in pairs:
+        J = E.to_jacobian(P)
+        J2 = E.jacobian_double(J)
+        flat.append(J)
+        for _ in range(half - 1):
+            flat.append(E.jacobian_add(flat[-1], J2))
+    flat = E.batch_to_affine(flat)
+    tables = [flat[i * half:(i + 1) * half] for i in range(len(pairs))]
+    return straus_precomputed(E, [k for k, _ in pairs], tables)
+
+def straus_precomputed(E, scalars, tables):
+    """Σ k_i·P_i (k_i >= 0) con wNAF intercalado y múltiplos impares ya calculados:
+       tables[i] = [P_i, 3P_i, ..., (2^(w_i-1) - 1)P_i] en afín (E.odd_multiples).
+       Cada punto puede usar su propia ventana w_i; la tabla de un punto fijo (p. ej.
+       el generador) se calcula una sola vez con una ventana más ancha."""
+    widths = [len(table).bit_length() + 1 for table in tables]
+    digits = [wnaf(k, w) for k, w in zip(scalars, widths)]
+    if not any(digits):
+        return JACOBIAN_INFINITY
+    R = JACOBIAN_INFINITY
+    for j in range(max(len(d) for d in digits) - 1, -1, -1):
+        R = E.jacobian_double(R)
+        for d, table in zip(digits, tables):
+            if j < len(d) and d[j]:
+                Q = table[abs(d[j]) >> 1]
+                R = E.jacobian_add_affine(R, Q if d[j] > 0 else E.neg(Q))
+    return R
+
+def pippenger(E, scalars, points, c=None):
+    """Σ k_i·P_i con el método de cubetas de Pippenger (punto jacobiano)."""
+    pairs = _normalize(E, scalars, points)
+    if not pairs:
+        return JACOBIAN_INFINITY
+    c = c or pippenger_window(len(pairs))
+    mask = (1 << c) - 1
+    n_windows = -(-max(k.bit_length() for k, _ in pairs) // c)
+    R = JACOBIAN_INFINITY
+    for j in range(n_windows - 1, -1, -1):
+        for _ in range(c):
+            R = E.jacobian_double(R)
+        shift = j * c
+        buckets = [JACOBIAN_INFINITY] * mask
+        for k, P in pairs:
+            d = (k >> shift) & mask
+            if d:
+                buckets[d - 1] = E.jacobian_add_affine(buckets[d - 1], P)
+        # Σ d·B_d = suma de las sumas corridas desde la cubeta más alta
+        running = total = JACOBIAN_INFINITY
+        for B in reversed(buckets):
+            running = E.jacobian_add(running, B)
+            total = E.jacobian_add(total, running)
+        R = E.jacobian_add(R, total)
+    return R
+
+def multi_scalar_mul(E, scalars, points):
+    """Σ k_i·P_i en afín; elige Straus o Pippenger según el tamaño del lote."""
+    scalars, points = list(scalars), list(points)
+    if len(scalars) != len(points):
+        raise ValueError("Se necesita un escalar por punto.")
+    if len(points) < UMBRAL_PIPPENGER:
+        return E.to_affine(straus(E, scalars, points))
+    return E.to_affine(pippenger(E, scalars, points))
@@ -0,0 +1,138 @@
+# paralelo_fp.py
+# Enumeración y conteo de E(F_p) repartidos en varios procesos.
+# range(p) se divide en fragmentos contiguos de x; cada proceso enumera (o cuenta)
+# su fragmento con el motor NumPy y los resultados se unen en orden de x, así que
+# la salida es idéntica a la de enumerate_points_fp / count_points_legendre.
+#
+# El grupo de procesos vive en el módulo y lo comparten todas las sesiones (y
+# firma_lote): tiene default_workers() procesos y sólo se vuelve a crear si se rompe
+# (un proceso que muere, p. ej. por falta de memoria, deja inservible todo el grupo).
+# Cada llamada limita su propia concurrencia con map_bounded (a lo más workers
+# fragmentos en vuelo), así que pedir otro número de procesos no cancela el trabajo
+# de otra sesión.
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from conteo_fp import count_points_legendre, legendre_sum
+from enumeracion_fp import P_MAX_INT64, _points_in_range, enumerate_points_fp
+
+# Por debajo de este p el costo de repartir el trabajo supera lo que se gana
+UMBRAL_PARALELO = 1 << 20
+
+# Fragmentos por proceso: más de uno reparte mejor la carga entre procesos
+FRAGMENTOS_POR_PROCESO = 4
+
+# Los procesos no se crean con fork: el servidor de Streamlit tiene hilos (p. ej. la
+# reserva de claves generando dentro de OpenSSL) y un fork en ese momento puede dejar
+# al hijo bloqueado en un candado que ya nadie soltará
+METODO_INICIO = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Veces que una llamada de map_bounded reemplaza un grupo roto antes de rendirse
+# (si el propio trabajo mata al proceso, reintentar sin fin no sirve)
+REINICIOS_GRUPO = 1
+
+_pool = None
+_pool_lock = threading.Lock()
+_FIN = object()
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def get_pool():
+    """ProcessPoolExecutor compartido de default_workers() procesos (se crea la primera
+       vez y después de que discard_pool descarte uno roto)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(default_workers(),
+                                        mp_context=multiprocessing.get_context(METODO_INICIO))
+        return _pool
+
+def discard_pool(broken):
+    """Olvida el grupo broken (si otra llamada no lo reemplazó ya) y lo cierra sin esperar."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def map_bounded(fn, jobs, workers):
+    """fn(job) para cada job en el grupo compartido, en orden, con a lo más workers
+       trabajos en vuelo a la vez (tope: el tamaño del grupo). jobs se consume a
+       medida que terminan los anteriores, así que puede ser un generador. Si el grupo
+       se rompe, se reemplaza y los trabajos en vuelo se reenvían (fn debe poder
+       repetirse); a la REINICIOS_GRUPO + 1-ésima rotura se propaga BrokenProcessPool."""
+    pool = get_pool()
+    workers = max(1, min(workers, default_workers()))
+    jobs = iter(jobs)
+    pending = deque()   # [job, future]; future None si falta enviarlo
+    restarts = 0
+    while True:
+        try:
+            while len(pending) < workers and (job := next(jobs, _FIN)) is not _FIN:
+                pending.append([job, None])
+            if not pending:
+                return
+            for item in pending:
+                if item[1] is None:
+                    item[1] = pool.submit(fn, item[0])
+            result = pending[0][1].result()
+        except BrokenProcessPool:
+            if restarts >= REINICIOS_GRUPO:
+                raise
+            restarts += 1
+            discard_pool(pool)
+            pool = get_pool()
+            for item in pending:
+                item[1] = None
+            continue
+        pending.popleft()
+        yield result
+
+def shards(p, n):
+    """n intervalos [x0, x1) contiguos que cubren range(p)."""
+    bounds = [p * i // n for i in range(n + 1)]
+    return [(x0, x1) for x0, x1 in zip(bounds, bounds[1:]) if x1 > x0]
+
+# Las funciones de los procesos deben estar a nivel de módulo (se serializan por nombre).
+# Dentro de un fragmento no se construye la tabla de raíces/Legendre: costaría O(p)
+# en cada proceso; se usa el criterio de Euler.
+def _enumerate_shard(args):
+    a, b, p, x0, x1 = args
+    return _points_in_range(a, b, p, x0, x1, None, 0)
+
+def _count_shard(args):
+    a, b, p, x0, x1 = args
+    return legendre_sum(a, b, p, x0, x1)
+
+def _run(fn, a, b, p, workers):
+    jobs = [(a, b, p, x0, x1) for x0, x1 in shards(p, workers * FRAGMENTOS_POR_PROCESO)]
+    # map_bounded devuelve los resultados en el orden de los fragmentos
+    return list(map_bounded(fn, jobs, workers))
+
+
+def enumerate_points_parallel(a, b, p, workers=None):
+    """Como enumerate_points_fp, repartiendo range(p) entre workers procesos."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    workers = workers or default_workers()
+    if workers == 1 or p < UMBRAL_PARALELO:
+        return enumerate_points_fp(a, b, p)
+    parts = _run(_enumerate_shard, a, b, p, workers)
+    return np.concatenate([xs for xs, _ in parts]), np.concatenate([ys for _, ys in parts])
+
+def count_points_parallel(a, b, p, workers=None):
+    """Como count_points_legendre, sumando los símbolos de Legendre en workers procesos."""
+    if p >= P_MAX_INT64:
+        raise ValueError(f"p = {p} excede el motor int64 (p < 2^31).")
+    workers = workers or default_workers()
+    if workers == 1 or p < UMBRAL_PARALELO:
+        return count_points_legendre(a, b, p)
+    return p + 1 + sum(_run(_count_shard, a, b, p, workers))
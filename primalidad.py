@@ -0,0 +1,145 @@
+# primalidad.py
+# Prueba de primalidad determinista compartida por las apps y los módulos de conteo.
+#  1. n < LIMITE_CRIBA: consulta directa en una criba de Eratóstenes.
+#  2. División de prueba: un solo gcd contra el producto de los primos < PRIMOS_DIVISION.
+#  3. n < 3.3·10^24: Miller-Rabin con un conjunto determinista de testigos según
+#     el tamaño de n (no hay pseudoprimos fuertes para todas esas bases bajo la cota).
+#  4. n mayor: Baillie-PSW (Miller-Rabin base 2 + prueba fuerte de Lucas con
+#     parámetros de Selfridge); no se conoce ningún contraejemplo.
+# El resultado no depende de testigos aleatorios, así que se puede guardar en caché.
+from functools import lru_cache
+from math import gcd, isqrt, prod
+
+LIMITE_CRIBA = 1 << 16
+
+# Primos que se prueban por división (vía gcd) antes de Miller-Rabin
+PRIMOS_DIVISION = 1000
+
+# Testigos deterministas de Miller-Rabin: (cota, bases) con bases válidas para
+# todo n < cota. Se usa el primer conjunto cuya cota supera a n.
+MR_BASES = [
+    (3_215_031_751, [2, 3, 5, 7]),
+    (3_474_749_660_383, [2, 3, 5, 7, 11, 13]),
+    (1 << 64, [2, 325, 9375, 28178, 450775, 9780504, 1795265022]),
+    (3_317_044_064_679_887_385_961_981, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]),
+]
+
+
+def sieve(limit):
+    """Criba de Eratóstenes: bytearray con criba[n] = 1 si n es primo (n < limit)."""
+    is_p = bytearray([1]) * limit
+    is_p[:2] = b"\x00\x00"
+    for q in range(2, isqrt(limit - 1) + 1):
+        if is_p[q]:
+            is_p[q*q::q] = bytes(len(range(q*q, limit, q)))
+    return is_p
+
+_CRIBA = sieve(LIMITE_CRIBA)
+SMALL_PRIMES = [q for q in range(PRIMOS_DIVISION) if _CRIBA[q]]
+_PRIMORIAL = prod(SMALL_PRIMES)
+# 2·3·...·23 cabe en una palabra: n % _PRIMORIAL_23 descarta ~80 % de los impares
+# compuestos sin el gcd con el primorial grande
+_PRIMORIAL_23 = prod(SMALL_PRIMES[:9])
+
+
+# ---------------------------
+# Miller-Rabin y Lucas fuerte
+# ---------------------------
+def miller_rabin(n, bases):
+    """True si n (impar > 2) es primo probable fuerte para todas las bases."""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def jacobi(a, n):
+    """Símbolo de Jacobi (a/n) para n impar positivo."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def strong_lucas(n):
+    """Prueba fuerte de Lucas con P = 1, Q = (1 - D)/4 y D el primero de
+       5, -7, 9, -11, ... con (D/n) = -1 (método A de Selfridge). n impar > 2."""
+    r = isqrt(n)
+    if r * r == n:
+        return False  # con n cuadrado perfecto nunca aparece (D/n) = -1
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    Q = (1 - D) // 4
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # U_k, V_k, Q^k de izquierda a derecha sobre los bits de d (P = 1)
+    U, V, Qk = 1, 1, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (U + V) % n, (D * U + V) % n
+            U = (U + n if U % 2 else U) // 2
+            V = (V + n if V % 2 else V) // 2
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+# ---------------------------
+# API
+# ---------------------------
+@lru_cache(maxsize=4096)
+def is_probable_prime(n):
+    """True si n es primo: exacto para n < 3.3·10^24, Baillie-PSW por encima."""
+    if n < LIMITE_CRIBA:
+        return n >= 0 and bool(_CRIBA[n])
+    if gcd(n % _PRIMORIAL_23, _PRIMORIAL_23) != 1 or gcd(n, _PRIMORIAL) != 1:
+        return False
+    if n < PRIMOS_DIVISION * PRIMOS_DIVISION:
+        return True
+    for limit, bases in MR_BASES:
+        if n < limit:
+            return miller_rabin(n, bases)
+    return miller_rabin(n, [2]) and strong_lucas(n)
+
+def next_prime(n):
+    """Menor primo > n."""
+    n += 1
+    while not is_probable_prime(n):
+        n += 1
+    return n
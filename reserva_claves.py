@@ -0,0 +1,106 @@
+# reserva_claves.py
+# Reserva de pares de claves RSA generados de antemano.
+# rsa.generate_private_key(2048) tarda cientos de milisegundos (y a veces mucho más:
+# la búsqueda de primos es aleatoria), y antes se hacía al crear cada cuenta o sesión.
+# Aquí un hilo de fondo mantiene la reserva entre dos marcas:
+#  - cuando quedan menos de low claves empieza a generar,
+#  - y se detiene al llegar a high.
+# take() entrega una clave lista al instante; si la reserva está vacía la genera en
+# ese momento (como antes) y lo cuenta como fallo. OpenSSL suelta el GIL al generar,
+# así que el hilo de fondo no frena a la página.
+import threading
+import time
+from collections import deque
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Marcas de la reserva: se rellena al bajar de MINIMO_RESERVA hasta MAXIMO_RESERVA
+MINIMO_RESERVA = 2
+MAXIMO_RESERVA = 8
+
+TAMANO_CLAVE = 2048
+
+# Tiempos de generación que se guardan para las métricas
+MUESTRAS_TIEMPO = 256
+
+
+def generate_rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=TAMANO_CLAVE)
+
+
+class ReservaClaves:
+    """Claves privadas generadas por un hilo de fondo entre las marcas low y high."""
+
+    def __init__(self, generate=generate_rsa_key, low=MINIMO_RESERVA, high=MAXIMO_RESERVA):
+        if not 0 < low <= high:
+            raise ValueError(f"Marcas inválidas: low = {low}, high = {high}.")
+        self.generate = generate
+        self.low, self.high = low, high
+        self._keys = deque()
+        self._cond = threading.Condition()
+        self._filling = False
+        self._thread = None
+        self._times = deque(maxlen=MUESTRAS_TIEMPO)
+        self.hits = self.misses = self.generated = 0
+
+    def start(self):
+        """Arranca el hilo de fondo (una sola vez)."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="reserva-claves", daemon=True)
+                self._thread.start()
+
+    def _timed_generate(self):
+        t0 = time.perf_counter()
+        key = self.generate()
+        with self._cond:
+            self._times.append(time.perf_counter() - t0)
+            self.generated += 1
+        return key
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._filling:
+                    if len(self._keys) < self.low:
+                        self._filling = True
+                    else:
+                        self._cond.wait()
+            key = self._timed_generate()   # fuera del candado
+            with self._cond:
+                self._keys.append(key)
+                if len(self._keys) >= self.high:
+                    self._filling = False
+                self._cond.notify_all()
+
+    def take(self):
+        """Clave privada lista (o generada en el momento si la reserva está vacía)."""
+        self.start()
+        with self._cond:
+            if self._keys:
+                self.hits += 1
+                key = self._keys.popleft()
+                self._cond.notify_all()
+                return key
+            self.misses += 1
+            self._cond.notify_all()
+        return self._timed_generate()
+
+    def set_watermarks(self, low, high):
+        if not 0 < low <= high:
+            raise ValueError(f"Marcas inválidas: low = {low}, high = {high}.")
+        with self._cond:
+            self.low, self.high = low, high
+            self._cond.notify_all()
+
+    def stats(self):
+        """Profundidad de la reserva, aciertos/fallos y tiempos de generación (ms)."""
+        with self._cond:
+            times = sorted(self._times)
+            depth = len(self._keys)
+        ms = [1000 * t for t in times]
+        return dict(depth=depth, low=self.low, high=self.high, hits=self.hits, misses=self.misses,
+                    generated=self.generated,
+                    gen_mean_ms=sum(ms) / len(ms) if ms else 0.0,
+                    gen_p95_ms=ms[int(0.95 * (len(ms) - 1))] if ms else 0.0,
+                    gen_max_ms=ms[-1] if ms else 0.0)
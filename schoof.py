@@ -0,0 +1,397 @@
+# schoof.py
+# Algoritmo de Schoof para |E(F_p)| con p de tamaño criptográfico.
+# Para cada primo pequeño l se obtiene t mod l (t = p + 1 - |E|, traza de
+# Frobenius) trabajando en F_p[x]/(ψ_l), donde ψ_l es el l-ésimo polinomio de
+# división; el teorema chino del residuo reconstruye t.
+#
+# Los polinomios son listas de coeficientes en [0, p) de menor a mayor grado.
+# El producto usa sustitución de Kronecker: los coeficientes se empaquetan en un
+# solo entero grande y se multiplica una vez (con gmpy2 si está instalado).
+import random
+from math import isqrt
+
+try:
+    import gmpy2
+except ImportError:  # opcional: sólo acelera los productos de enteros grandes
+    gmpy2 = None
+
+from conteo_fp import count_points_legendre, hasse_interval
+from curva_eliptica import CurvaEliptica, affine_add
+from primalidad import next_prime
+
+# Cuando quedan a lo más estos candidatos para |E| se termina con BSGS
+# (paso de bebé / paso de gigante) en lugar de procesar primos l más grandes.
+SCHOOF_BSGS_MAX = 1 << 24
+
+# Puntos aleatorios como máximo en el BSGS final; se deja de sumar puntos si la
+# intersección de candidatos no se achica en RONDAS_SIN_AVANCE rondas seguidas
+MAX_RONDAS_BSGS = 32
+RONDAS_SIN_AVANCE = 3
+
+# Para p > 229 (Mestre) E o su torsión tienen un punto con un solo múltiplo del orden
+# en el intervalo de Hasse; hasta ese p la ambigüedad se resuelve contando directo
+P_MAX_MESTRE_AMBIGUO = 229
+
+
+# ---------------------------
+# Polinomios sobre F_p
+# ---------------------------
+def _trim(f):
+    while f and f[-1] == 0:
+        f.pop()
+    return f
+
+def _padd(f, g, p):
+    if len(f) < len(g):
+        f, g = g, f
+    r = f[:]
+    for i, c in enumerate(g):
+        r[i] = (r[i] + c) % p
+    return _trim(r)
+
+def _psub(f, g, p):
+    n = max(len(f), len(g))
+    f = f + [0] * (n - len(f))
+    g = g + [0] * (n - len(g))
+    return _trim([(u - v) % p for u, v in zip(f, g)])
+
+def _pscale(f, c, p):
+    c %= p
+    return _trim([u * c % p for u in f]) if c else []
+
+def _pmul(f, g, p):
+    if not f or not g:
+        return []
+    if min(len(f), len(g)) < 8:
+        r = [0] * (len(f) + len(g) - 1)
+        for i, u in enumerate(f):
+            if u:
+                for j, v in enumerate(g):
+                    r[i + j] += u * v
+        return _trim([c % p for c in r])
+    # Kronecker: cada coeficiente del producto cabe en nbytes sin acarreo
+    nbytes = (2 * p.bit_length() + min(len(f), len(g)).bit_length() + 7) // 8
+    F = int.from_bytes(b"".join(c.to_bytes(nbytes, "little") for c in f), "little")
+    G = F if g is f else int.from_bytes(b"".join(c.to_bytes(nbytes, "little") for c in g), "little")
+    if gmpy2 is not None:
+        H = int(gmpy2.mpz(F) * gmpy2.mpz(G))
+    else:
+        H = F * G
+    size = (len(f) + len(g) - 1) * nbytes
+    raw = H.to_bytes(size, "little")
+    return _trim([int.from_bytes(raw[i:i + nbytes], "little") % p for i in range(0, size, nbytes)])
+
+def _pmod(f, g, p):
+    # Residuo de la división larga f mod g (g no nulo)
+    dg = len(g) - 1
+    if len(f) <= dg:
+        return f[:]
+    f = f[:]
+    inv = pow(g[-1], -1, p)
+    for i in range(len(f) - 1 - dg, -1, -1):
+        c = f[i + dg] * inv % p
+        if c:
+            f[i:i + dg + 1] = [(u - c * v) % p for u, v in zip(f[i:i + dg + 1], g)]
+    return _trim(f[:dg])
+
+def _pgcd(f, g, p):
+    """Máximo común divisor mónico (algoritmo de Euclides)."""
+    while g:
+        f, g = g, _pmod(f, g, p)
+    return _pscale(f, pow(f[-1], -1, p), p)
+
+def _series_inverse(A, n, p):
+    # Inverso de A (A[0] = 1) módulo x^n por iteración de Newton
+    B, k = [1], 1
+    while k < n:
+        k = min(2 * k, n)
+        T = [(-c) % p for c in _pmul(A[:k], B, p)[:k]]
+        T[0] = (T[0] + 2) % p
+        B = _pmul(B, T, p)[:k]
+    return B
+
+
+class _Anillo:
+    """F_p[x]/(g) con g mónico; g = None es F_p[x] sin reducir.
+       La reducción es tipo Barrett con el inverso en serie de rev(g)."""
+
+    def __init__(self, g, p):
+        self.g, self.p = g, p
+        if g is not None:
+            self.d = len(g) - 1
+            self.inv = _series_inverse(g[::-1], self.d, p)
+
+    def reduce(self, h):
+        if self.g is None or len(h) <= self.d:
+            return h
+        d, p = self.d, self.p
+        m = len(h) - 1 - d
+        qrev = _pmul(h[::-1][:m + 1], self.inv[:m + 1], p)[:m + 1]
+        q = _trim((qrev + [0] * (m + 1 - len(qrev)))[::-1])
+        qg = _pmul(q, self.g, p)
+        qg += [0] * (d - len(qg))
+        return _trim([(u - v) % p for u, v in zip(h[:d], qg[:d])])
+
+    def mul(self, f, h):
+        return self.reduce(_pmul(f, h, self.p))
+
+    def pow(self, f, e, k=4):
+        # ventana fija de k bits: f^0..f^(2^k - 1) precalculadas
+        table = [[1], f]
+        for _ in range((1 << k) - 2):
+            table.append(self.mul(table[-1], f))
+        r = [1]
+        for shift in range((e.bit_length() - 1) // k * k, -1, -k):
+            for _ in range(k):
+                r = self.mul(r, r)
+            digit = (e >> shift) & ((1 << k) - 1)
+            if digit:
+                r = self.mul(r, table[digit])
+        return r
+
+    def pow_x(self, e):
+        # x^e: multiplicar por x es sólo un corrimiento
+        r = [1]
+        for bit in bin(e)[2:]:
+            r = self.mul(r, r)
+            if bit == "1":
+                r = self.reduce([0] + r)
+        return r
+
+    def compose(self, h, X):
+        """h(X) mod g por el método de Brent-Kung: sqrt(deg h) productos en el
+           anillo; las combinaciones lineales se hacen sobre enteros empaquetados."""
+        if not h:
+            return []
+        p, d = self.p, self.d
+        m = isqrt(len(h)) + 1
+        powers = [[1], X]
+        for _ in range(m - 1):
+            powers.append(self.mul(powers[-1], X))
+        Xm = powers.pop()
+        nbytes = (2 * p.bit_length() + m.bit_length() + 7) // 8
+        packed = [int.from_bytes(b"".join(c.to_bytes(nbytes, "little") for c in P), "little")
+                  for P in powers]
+        acc = []
+        for k in range((len(h) - 1) // m, -1, -1):
+            total = sum(c * P for c, P in zip(h[k * m:(k + 1) * m], packed))
+            raw = total.to_bytes(d * nbytes, "little")
+            chunk = _trim([int.from_bytes(raw[i:i + nbytes], "little") % p
+                           for i in range(0, d * nbytes, nbytes)])
+            acc = _padd(self.mul(acc, Xm), chunk, p)
+        return acc
+
+
+# ---------------------------
+# Polinomios de división
+# ---------------------------
+class _SucesionDivision:
+    """ψ_n evaluado en un punto (X, Y) del anillo, con F = Y^2 = X^3 + aX + b.
+       Se guarda B_n con ψ_n = B_n (n impar) o ψ_n = Y·B_n (n par)."""
+
+    def __init__(self, R, a, b, X, F):
+        p, mul = R.p, R.mul
+        X2 = mul(X, X)
+        X3 = mul(X2, X)
+        X4 = mul(X2, X2)
+        X6 = mul(X3, X3)
+        self.R, self.F2 = R, mul(F, F)
+        self.inv2 = pow(2, -1, p)
+        B3 = [(-a * a) % p]
+        for c, t in ((12 * b, X), (6 * a, X2), (3, X4)):
+            B3 = _padd(B3, _pscale(t, c, p), p)
+        B4 = [(-8 * b * b - a * a * a) % p]
+        for c, t in ((-4 * a * b, X), (-5 * a * a, X2), (20 * b, X3), (5 * a, X4), (1, X6)):
+            B4 = _padd(B4, _pscale(t, c, p), p)
+        self.B = {0: [], 1: [1], 2: [2 % p], 3: B3, 4: _pscale(B4, 4, p)}
+
+    def __call__(self, n):
+        if n in self.B:
+            return self.B[n]
+        mul, p = self.R.mul, self.R.p
+        m = n // 2
+        if n % 2:
+            # ψ_{2m+1} = ψ_{m+2} ψ_m^3 - ψ_{m-1} ψ_{m+1}^3
+            t1 = mul(self(m + 2), mul(self(m), mul(self(m), self(m))))
+            t2 = mul(self(m - 1), mul(self(m + 1), mul(self(m + 1), self(m + 1))))
+            if m % 2 == 0:
+                t1 = mul(t1, self.F2)
+            else:
+                t2 = mul(t2, self.F2)
+            r = _psub(t1, t2, p)
+        else:
+            # ψ_{2m} = ψ_m (ψ_{m+2} ψ_{m-1}^2 - ψ_{m-2} ψ_{m+1}^2) / (2Y)
+            t = _psub(mul(self(m + 2), mul(self(m - 1), self(m - 1))),
+                      mul(self(m - 2), mul(self(m + 1), self(m + 1))), p)
+            r = _pscale(mul(self(m), t), self.inv2, p)
+        self.B[n] = r
+        return r
+
+def _multiple_coords(S, n, X, F):
+    # [n]Q = (xn/xd, Y_Q · yn/yd) a partir de la sucesión de división de Q
+    R = S.R
+    mul, p = R.mul, R.p
+    Bn2 = mul(S(n), S(n))
+    prod = mul(S(n - 1), S(n + 1))
+    if n % 2:
+        xd = Bn2
+        xn = _psub(mul(X, Bn2), mul(F, prod), p)
+        yd = _pscale(mul(Bn2, Bn2), 2, p)
+    else:
+        xd = mul(F, Bn2)
+        xn = _psub(mul(X, xd), prod, p)
+        yd = _pscale(mul(S.F2, mul(Bn2, Bn2)), 2, p)
+    return xn, xd, S(2 * n), yd
+
+def division_polynomial(a, b, p, l):
+    """ψ_l como polinomio en F_p[x] (l impar), de grado (l^2 - 1)/2."""
+    S = _SucesionDivision(_Anillo(None, p), a % p, b % p, [0, 1], _trim([b % p, a % p, 0, 1]))
+    return S(l)
+
+
+# ---------------------------
+# t mod l
+# ---------------------------
+def _trace_mod_2(a, b, p):
+    # t ≡ 0 (mod 2) sii x^3 + ax + b tiene raíz en F_p (punto de orden 2)
+    f = [b, a, 0, 1]
+    Xp = _Anillo(f, p).pow_x(p)
+    return 0 if len(_pgcd(f, _psub(Xp, [0, 1], p), p)) > 1 else 1
+
+def _trace_mod_l(a, b, p, l):
+    psi = division_polynomial(a, b, p, l)
+    g = _pscale(psi, pow(psi[-1], -1, p), p)
+    R = _Anillo(g, p)
+    mul = R.mul
+    x = [0, 1]
+    f = R.reduce([b, a, 0, 1])
+    # φ(x, y) = (X, y·W) y φ^2(x, y) = (X2, y·Y2)
+    X = R.pow_x(p)
+    W = R.pow(f, (p - 1) // 2)
+    # Frobenius: h(x)^p = h(x^p), así que X^p y W^p son composiciones con X
+    X2 = R.compose(X, X)
+    Y2 = mul(W, R.compose(W, X))
+
+    q = p % l
+    qq = q if q <= l // 2 else l - q
+    SP = _SucesionDivision(R, a, b, x, f)
+    xq_n, xq_d, yq_n, yq_d = _multiple_coords(SP, qq, x, f)
+    if qq != q:
+        yq_n = _pscale(yq_n, -1, p)
+
+    h = _psub(mul(X2, xq_d), xq_n, p)
+    if len(_pgcd(g, h, p)) == 1:
+        # φ^2 P ≠ ±q P: S = φ^2 P + qP con λ = y·Ln/Ld, sin inversiones
+        Ln = mul(_psub(mul(Y2, yq_d), yq_n, p), xq_d)
+        Ld = mul(h, yq_d)
+        Ln2, Ld2 = mul(Ln, Ln), mul(Ld, Ld)
+        x_d = mul(xq_d, Ld2)
+        x_n = _psub(mul(_psub(mul(f, Ln2), mul(X2, Ld2), p), xq_d), mul(xq_n, Ld2), p)
+        y_d = mul(x_d, Ld)
+        y_n = _psub(mul(Ln, _psub(mul(X2, x_d), x_n, p)), mul(mul(Y2, x_d), Ld), p)
+        # buscar τ con S = τ·φ(P) comparando en fracciones cruzadas
+        F_phi = _padd(_padd(mul(X, mul(X, X)), _pscale(X, a, p), p), [b] if b else [], p)
+        SF = _SucesionDivision(R, a, b, X, F_phi)
+        for tau in range(1, (l - 1) // 2 + 1):
+            tx_n, tx_d, ty_n, ty_d = _multiple_coords(SF, tau, X, F_phi)
+            if _psub(mul(x_n, tx_d), mul(tx_n, x_d), p):
+                continue
+            ty_n = mul(ty_n, W)
+            same_y = not _psub(mul(y_n, ty_d), mul(ty_n, y_d), p)
+            return tau if same_y else l - tau
+        raise ArithmeticError(f"Schoof: no se encontró τ para l = {l}.")
+
+    # φ^2 P = ±qP para algún P de l-torsión
+    if pow(q, (l - 1) // 2, l) != 1:
+        return 0
+    w = next(w for w in range(1, l) if w * w % l == q)
+    xw_n, xw_d, yw_n, yw_d = _multiple_coords(SP, w, x, f)
+    gx = _pgcd(g, _psub(mul(X, xw_d), xw_n, p), p)
+    if len(gx) == 1:
+        return 0
+    gy = _pgcd(gx, _psub(mul(W, yw_d), yw_n, p), p)
+    return 2 * w % l if len(gy) > 1 else (-2 * w) % l
+
+
+# ---------------------------
+# Conteo
+# ---------------------------
+def _twist(a, b, p):
+    # Torsión cuadrática y^2 = x^3 + a d^2 x + b d^3 (d no residuo): |E'| = 2p + 2 - |E|
+    d = 2
+    while pow(d, (p - 1) // 2, p) != p - 1:
+        d += 1
+    return CurvaEliptica(a * d * d, b * d * d * d, p)
+
+def _finish_bsgs(a, b, p, n0, M, lo, hi, seed):
+    # Candidatos N = first + j·M en [lo, hi]; BSGS sobre j hasta que quede uno.
+    # Si el exponente del grupo divide la diferencia de dos candidatos ningún punto
+    # los separa (p. ej. y^2 = x^3 + 2x, p = 1009: 980 y 1050, grupo Z/70 × Z/14);
+    # entonces se termina con la torsión cuadrática, como en conteo_fp (Mestre).
+    first = lo + (n0 - lo) % M
+    J = (hi - first) // M + 1
+    if J <= 1:
+        return first
+    rng = random.Random(seed)
+    E = CurvaEliptica(a, b, p)
+    s = isqrt(J) + 1
+    cands = None
+    stalled = 0
+    for _ in range(MAX_RONDAS_BSGS):
+        P = E.random_point(rng)
+        MP = E.mul(M, P)
+        baby = {}
+        R = None
+        for i in range(s):
+            baby.setdefault(R, []).append(i)
+            R = affine_add(R, MP, a, p)
+        # Q_k = -first·P - k·s·MP; buscamos j = k·s + i con j·MP = -first·P
+        Q = E.mul(-first, P)
+        giant = E.mul(-s, MP)
+        found = set()
+        for k in range(s + 1):
+            for i in baby.get(Q, ()):
+                j = k * s + i
+                if j < J:
+                    found.add(j)
+            Q = affine_add(Q, giant, a, p)
+        new = found if cands is None else cands & found
+        stalled = stalled + 1 if cands is not None and len(new) == len(cands) else 0
+        cands = new
+        if len(cands) <= 1 or stalled >= RONDAS_SIN_AVANCE:
+            break
+    cands = sorted(first + j * M for j in cands)
+    if len(cands) > 1:
+        # N' = 2p + 2 - N debe anular a todos los puntos de la torsión
+        twist = _twist(a, b, p)
+        for _ in range(MAX_RONDAS_BSGS):
+            P = twist.random_point(rng)
+            cands = [N for N in cands if twist.mul(2 * p + 2 - N, P) is None]
+            if len(cands) <= 1:
+                break
+    if len(cands) > 1 and p <= P_MAX_MESTRE_AMBIGUO:
+        # para p tan chico ni E ni su torsión garantizan un punto que decida: conteo directo
+        return count_points_legendre(a, b, p)
+    if len(cands) != 1:
+        raise ArithmeticError(f"No se pudo decidir |E(F_p)| entre {cands}.")
+    return cands[0]
+
+def count_points_schoof(a, b, p, bsgs_max=SCHOOF_BSGS_MAX, progress=None, seed=0):
+    """|E(F_p)| (incluye infinito) con Schoof; p primo grande y curva no singular.
+       Se procesan primos l hasta que quedan a lo más bsgs_max candidatos,
+       que se resuelven con BSGS. progress(l, M) se llama tras cada primo."""
+    a, b = a % p, b % p
+    lo, hi = hasse_interval(p)
+    t, M = _trace_mod_2(a, b, p), 2
+    if progress:
+        progress(2, M)
+    l = 3
+    while M * max(bsgs_max, 1) <= hi - lo:
+        if l != p:
+            tl = _trace_mod_l(a, b, p, l)
+            t += M * ((tl - t) * pow(M, -1, l) % l)
+            M *= l
+            if progress:
+                progress(l, M)
+        l = next_prime(l)
+    return _finish_bsgs(a, b, p, (p + 1 - t) % M, M, lo, hi, seed)
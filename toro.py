@@ -0,0 +1,68 @@
+# toro.py
+# Geometría del toro que comparten las páginas de visualización
+# (Curvas_en_Fp, Curvas_en_Fp_Pruebas y Pruebas2).
+#  - reference_mesh: superficie de referencia, calculada una vez por (R, r, resolución).
+#  - map_to_torus_modular / map_to_torus: puntos del plano al toro escribiendo en un
+#    solo búfer float32 preasignado (4 filas: X, Y, Z y una fila auxiliar), sin los
+#    arreglos temporales de u, v, cos y sin de la versión anterior.
+from functools import lru_cache
+
+import numpy as np
+
+# Radios y resolución (u, v) que usan las páginas
+R_TORO = 2.2
+r_TORO = 0.7
+RESOLUCION_TORO = (60, 30)
+
+
+@lru_cache(maxsize=8)
+def reference_mesh(R=R_TORO, r=r_TORO, nu=RESOLUCION_TORO[0], nv=RESOLUCION_TORO[1]):
+    """Superficie (XT, YT, ZT) de forma (nv, nu) en float32, de sólo lectura
+       porque se comparte entre llamadas."""
+    u = np.linspace(0, 2*np.pi, nu, dtype=np.float32)
+    v = np.linspace(0, 2*np.pi, nv, dtype=np.float32)[:, None]
+    rho = R + r * np.cos(v)
+    mesh = (rho * np.cos(u), rho * np.sin(u), np.broadcast_to(r * np.sin(v), (nv, nu)).copy())
+    for M in mesh:
+        M.flags.writeable = False
+    return mesh
+
+def torus_buffer(n):
+    """Búfer float32 de forma (4, n) para pasar como out= a las funciones de mapeo."""
+    return np.empty((4, n), dtype=np.float32)
+
+def _map_angles(u_src, u_scale, u_shift, v_src, v_scale, v_shift, R, r, out):
+    # u = (u_src - u_shift)·u_scale, v = (v_src - v_shift)·v_scale; todo en out
+    n = len(u_src)
+    if out is None:
+        out = torus_buffer(n)
+    X, Y, Z, T = out[0, :n], out[1, :n], out[2, :n], out[3, :n]
+    np.subtract(v_src, v_shift, out=Z, casting="unsafe")
+    Z *= v_scale                      # Z = v
+    np.cos(Z, out=Y)
+    Y *= r
+    Y += R                            # Y = R + r cos v
+    np.sin(Z, out=Z)
+    Z *= r                            # Z = r sin v
+    np.subtract(u_src, u_shift, out=X, casting="unsafe")
+    X *= u_scale                      # X = u
+    np.sin(X, out=T)
+    np.cos(X, out=X)
+    X *= Y                            # X = (R + r cos v) cos u
+    Y *= T                            # Y = (R + r cos v) sin u
+    return X, Y, Z
+
+def map_to_torus_modular(xs, ys, p, R=R_TORO, r=r_TORO, out=None):
+    """Puntos (x, y) de F_p x F_p al toro con u = 2πx/p, v = 2πy/p.
+       out: búfer de torus_buffer(n) reutilizable entre llamadas."""
+    if len(xs) == 0:
+        return np.array([]), np.array([]), np.array([])
+    return _map_angles(xs, 2*np.pi / p, 0, ys, 2*np.pi / p, 0, R, r, out)
+
+def map_to_torus(x_vals, y_vals, R=R_TORO, r=r_TORO, out=None):
+    """Puntos reales al toro normalizando x e y a [0, 2π] con su mínimo y su rango."""
+    if len(x_vals) == 0:
+        return np.array([]), np.array([]), np.array([])
+    xs, ys = np.asarray(x_vals), np.asarray(y_vals)
+    return _map_angles(xs, 2*np.pi / max(np.ptp(xs), 1e-9), xs.min(),
+                       ys, 2*np.pi / max(np.ptp(ys), 1e-9), ys.min(), R, r, out)
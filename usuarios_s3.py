@@ -0,0 +1,238 @@
+# usuarios_s3.py
+# Almacén de usuarios sobre S3 con índice por nombre de usuario.
+# Antes cada inicio de sesión descargaba e interpretaba credentials/users.csv completo
+# (pandas) y lo recorría con una máscara; crear una cuenta reescribía el CSV entero.
+#
+# Aquí el CSV base se carga una vez en un diccionario (username -> fila) y:
+#  - se revalida con un GET condicional (IfNoneMatch=ETag) cada TTL_USUARIOS segundos;
+#  - cada cuenta nueva es un objeto pequeño bajo PREFIJO_ALTAS (una fila de CSV); el
+#    CSV base no se reescribe;
+#  - antes, el nombre se reserva con un objeto vacío bajo PREFIJO_RESERVAS escrito con
+#    IfNoneMatch="*": dos altas simultáneas del mismo nombre no se pisan, y como la
+#    compactación nunca borra las reservas, un alta que no vio el nombre (leyó el CSV
+#    base antes de compactar y listó las altas después) tampoco lo consigue;
+#  - un nombre que no está en el índice se revalida antes de responder, así que una
+#    cuenta creada en otro proceso se ve sin esperar al TTL;
+#  - cuando hay UMBRAL_COMPACTAR altas sueltas se juntan en el CSV base (una sola
+#    reescritura por muchas altas, condicionada al ETag leído) y se borran los
+#    objetos sueltos.
+# El CSV base sólo gana la columna scheme (esquema de firma, ver firma.ESQUEMAS); los
+# CSV anteriores sin ella siguen valiendo y sus usuarios quedan como "rsa-pss".
+import csv
+import io
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+COLUMNAS_USUARIOS = ['username', 'password_hash', 'private_key_path', 'public_key_path', 'scheme']
+
+# Esquema de las cuentas creadas antes de poder elegirlo
+ESQUEMA_POR_DEFECTO = 'rsa-pss'
+
+# Prefijo de los objetos de las cuentas nuevas
+PREFIJO_ALTAS = 'credentials/usuarios/'
+
+# Prefijo de las reservas de nombre (permanentes; fuera de PREFIJO_ALTAS para que
+# no entren en el listado de altas)
+PREFIJO_RESERVAS = 'credentials/reservas/'
+
+# Segundos durante los que el índice se usa sin consultar a S3
+TTL_USUARIOS = 30
+
+# Altas sueltas a partir de las cuales se reescribe el CSV base
+UMBRAL_COMPACTAR = 500
+
+# Intentos de reescribir el CSV base cuando otro proceso lo cambió en medio
+MAX_REINTENTOS_COMPACTAR = 5
+
+
+def _error_code(e):
+    return e.response.get("Error", {}).get("Code")
+
+def _to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS_USUARIOS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def _from_csv(data):
+    rows = list(csv.DictReader(io.StringIO(data.decode("utf-8"))))
+    for row in rows:
+        if not row.get('scheme'):
+            row['scheme'] = ESQUEMA_POR_DEFECTO
+    return rows
+
+
+class AlmacenUsuarios:
+    """Usuarios de base_key (CSV) más las altas sueltas bajo prefix, indexados por nombre.
+       get_client() devuelve el cliente de S3 (se pide sólo cuando hay que consultar)."""
+
+    def __init__(self, get_client, bucket, base_key, prefix=PREFIJO_ALTAS, ttl=TTL_USUARIOS,
+                 compact_at=UMBRAL_COMPACTAR, clock=time.monotonic, reserve_prefix=PREFIJO_RESERVAS):
+        self.get_client = get_client
+        self.bucket = bucket
+        self.base_key = base_key
+        self.prefix = prefix
+        self.reserve_prefix = reserve_prefix
+        self.ttl = ttl
+        self.compact_at = compact_at
+        self.clock = clock
+        self._base = {}          # username -> fila del CSV base
+        self._base_etag = None
+        self._altas = {}         # clave S3 -> fila de un alta suelta
+        self._index = {}         # username -> fila (base + altas)
+        self._refreshed_at = None
+        self._version = 0
+        self._frame = (None, None)
+        self._lock = threading.RLock()
+
+    def _user_key(self, username):
+        return self.prefix + quote(username, safe="")
+
+    def _reserve(self, username):
+        """Crea la reserva permanente del nombre; False si ya existía."""
+        try:
+            self.get_client().put_object(Bucket=self.bucket, Key=self.reserve_prefix + quote(username, safe=""),
+                                         Body=b"", IfNoneMatch="*")
+        except ClientError as e:
+            if _error_code(e) in ("PreconditionFailed", "412", "ConditionalRequestConflict"):
+                return False
+            raise
+        return True
+
+    # ---------------------------
+    # Lectura
+    # ---------------------------
+    def refresh(self):
+        """Revalida el CSV base por ETag y carga sólo las altas sueltas que no se conocían."""
+        s3 = self.get_client()
+        with self._lock:
+            kwargs = dict(Bucket=self.bucket, Key=self.base_key)
+            if self._base_etag:
+                kwargs["IfNoneMatch"] = self._base_etag
+            try:
+                obj = s3.get_object(**kwargs)
+                self._base = {row['username']: row for row in _from_csv(obj['Body'].read())}
+                self._base_etag = obj['ETag']
+            except ClientError as e:
+                if _error_code(e) == "NoSuchKey":
+                    self._base, self._base_etag = {}, None
+                elif _error_code(e) not in ("304", "NotModified"):
+                    raise
+
+            listed = set()
+            for page in s3.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix):
+                listed.update(item["Key"] for item in page.get("Contents", []))
+            # las que ya no están se compactaron en el CSV base
+            self._altas = {k: row for k, row in self._altas.items() if k in listed}
+            for key in listed - self._altas.keys():
+                try:
+                    rows = _from_csv(s3.get_object(Bucket=self.bucket, Key=key)['Body'].read())
+                except ClientError as e:
+                    if _error_code(e) != "NoSuchKey":
+                        raise
+                    continue
+                if rows:
+                    self._altas[key] = rows[0]
+            self._rebuild()
+            self._refreshed_at = self.clock()
+
+    def _rebuild(self):
+        self._index = dict(self._base)
+        self._index.update((row['username'], row) for row in self._altas.values())
+        self._version += 1
+
+    def _maybe_refresh(self):
+        # True si se consultó a S3
+        if self._refreshed_at is None or self.clock() - self._refreshed_at >= self.ttl:
+            self.refresh()
+            return True
+        return False
+
+    def get(self, username):
+        """Fila (dict) del usuario o None. Si no está en el índice se revalida antes de
+           responder: pudo crearse (o compactarse) en otro proceso después del último refresh."""
+        with self._lock:
+            if not self._maybe_refresh() and username not in self._index:
+                self.refresh()
+            return self._index.get(username)
+
+    def __contains__(self, username):
+        return self.get(username) is not None
+
+    def dataframe(self):
+        """Todos los usuarios como DataFrame (se rearma sólo si el índice cambió)."""
+        with self._lock:
+            self._maybe_refresh()
+            version, frame = self._frame
+            if version != self._version:
+                frame = pd.DataFrame(list(self._index.values()), columns=COLUMNAS_USUARIOS)
+                self._frame = (self._version, frame)
+            return frame
+
+    # ---------------------------
+    # Escritura
+    # ---------------------------
+    def add(self, username, password_hash, private_key_path, public_key_path, scheme=ESQUEMA_POR_DEFECTO):
+        """Da de alta un usuario sin reescribir el CSV base. False si el nombre ya existe."""
+        row = dict(username=username, password_hash=password_hash,
+                   private_key_path=private_key_path, public_key_path=public_key_path, scheme=scheme)
+        with self._lock:
+            # índice al día (incluye altas compactadas por otro proceso) antes de escribir
+            self.refresh()
+            if username in self._index or not self._reserve(username):
+                return False
+            key = self._user_key(username)
+            try:
+                self.get_client().put_object(Bucket=self.bucket, Key=key, Body=_to_csv([row]),
+                                             IfNoneMatch="*")
+            except ClientError as e:
+                if _error_code(e) in ("PreconditionFailed", "412", "ConditionalRequestConflict"):
+                    return False
+                # el alta no quedó escrita: se libera el nombre
+                self.get_client().delete_object(Bucket=self.bucket, Key=self.reserve_prefix + quote(username, safe=""))
+                raise
+            self._altas[key] = row
+            self._index[username] = row
+            self._version += 1
+            if len(self._altas) >= self.compact_at:
+                self.compact()
+            return True
+
+    def compact(self):
+        """Junta las altas sueltas en el CSV base y borra sus objetos (las reservas de
+           nombre se quedan; las de altas anteriores a ellas se crean aquí). El CSV base se
+           reescribe sólo si no cambió desde el último refresh (IfMatch=ETag): si otro
+           proceso compactó en medio se vuelve a leer y se reintenta. False si no se
+           logró en MAX_REINTENTOS_COMPACTAR intentos (las altas siguen sueltas)."""
+        with self._lock:
+            s3 = self.get_client()
+            for _ in range(MAX_REINTENTOS_COMPACTAR):
+                self.refresh()
+                condition = dict(IfMatch=self._base_etag) if self._base_etag else dict(IfNoneMatch="*")
+                try:
+                    obj = s3.put_object(Bucket=self.bucket, Key=self.base_key,
+                                        Body=_to_csv(self._index.values()), **condition)
+                except ClientError as e:
+                    if _error_code(e) in ("PreconditionFailed", "412", "ConditionalRequestConflict"):
+                        continue
+                    raise
+                break
+            else:
+                return False
+            self._base, self._base_etag = dict(self._index), obj['ETag']
+            # altas escritas antes de que existieran las reservas: el nombre queda
+            # reservado antes de borrar su objeto suelto
+            for row in self._altas.values():
+                self._reserve(row['username'])
+            keys = list(self._altas)
+            for i in range(0, len(keys), 1000):
+                s3.delete_objects(Bucket=self.bucket,
+                                  Delete={"Objects": [{"Key": k} for k in keys[i:i + 1000]], "Quiet": True})
+            self._altas = {}
+            self._rebuild()
+            return True